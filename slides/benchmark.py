@@ -0,0 +1,286 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from slides.corpus_generator import CorpusConfig, CorpusGenerator
+from slides.keyvalue_parser import (
+    Keydef,
+    KeyValueParser,
+    KeyValueParserConfig,
+    KeyValueSplitParser,
+    SimpleKeyValueParser,
+)
+from slides.slidewalker import PPTSet, SlideWalker
+from slides.version import Version
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    the timing of a single benchmark
+    """
+
+    name: str
+    slides: int
+    # best time of the repetitions
+    seconds: float
+    repeat: int
+
+    @property
+    def per_slide_us(self) -> float:
+        """
+        microseconds per slide
+        """
+        return self.seconds * 1e6 / max(self.slides, 1)
+
+
+class Benchmark:
+    """
+    benchmark suite for the walker, parser and viewer hot paths
+    on synthetic corpora of different sizes
+    """
+
+    default_sizes = [10, 1000, 10000]
+
+    def __init__(
+        self,
+        corpus_dir: str = None,
+        sizes: List[int] = None,
+        repeat: int = 1,
+        verbose: bool = False,
+    ):
+        """
+        constructor
+
+        Args:
+            corpus_dir(str): the base directory of the generated corpora
+            sizes(List[int]): the corpus sizes in slides
+            repeat(int): number of repetitions per benchmark - the best time counts
+            verbose(bool): if True print the results as they are measured
+        """
+        if corpus_dir is None:
+            corpus_dir = Benchmark.default_corpus_dir()
+        if sizes is None:
+            sizes = Benchmark.default_sizes
+        self.corpus_dir = corpus_dir
+        self.sizes = sizes
+        self.repeat = repeat
+        self.verbose = verbose
+        self.results: List[BenchmarkResult] = []
+
+    @classmethod
+    def default_corpus_dir(cls) -> str:
+        """
+        get the default corpus directory
+        """
+        corpus_dir = os.path.join(
+            os.path.expanduser("~"), ".cache", "pySemanticSlides", "benchmark"
+        )
+        return corpus_dir
+
+    def measure(self, name: str, slides: int, func: Callable) -> BenchmarkResult:
+        """
+        measure the given function
+
+        Args:
+            name(str): the name of the benchmark
+            slides(int): the number of slides processed
+            func(Callable): the function to time
+
+        Returns:
+            BenchmarkResult: the best time of my repetitions
+        """
+        times = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        result = BenchmarkResult(name, slides, min(times), self.repeat)
+        self.results.append(result)
+        if self.verbose:
+            print(
+                f"{name:45} {slides:6d} slides {result.seconds*1000:10.1f} ms "
+                f"{result.per_slide_us:9.1f} µs/slide"
+            )
+        return result
+
+    def get_parsers(self) -> Dict[str, object]:
+        """
+        get the key/value parsers to benchmark by name
+        """
+        keydefs = [
+            Keydef("Name", "name"),
+            Keydef("Title", "title"),
+            Keydef("Keywords", "keywords", True),
+            Keydef("Literature", "literature", True),
+        ]
+        parsers = {}
+        for parser_class in [KeyValueSplitParser, KeyValueParser, SimpleKeyValueParser]:
+            backends = ["pyparsing"]
+            if parser_class is not SimpleKeyValueParser:
+                backends.append("scanner")
+            for backend in backends:
+                config = KeyValueParserConfig(record_delim="\n", backend=backend)
+                parser = parser_class(config=config)
+                parser.setKeydefs(keydefs)
+                name = parser_class.__name__
+                if len(backends) > 1:
+                    name = f"{name}[{backend}]"
+                parsers[name] = parser
+        return parsers
+
+    def run_size(self, slides: int) -> List[BenchmarkResult]:
+        """
+        run all benchmarks on a corpus of the given size
+
+        Args:
+            slides(int): the number of slides of the corpus
+
+        Returns:
+            List[BenchmarkResult]: the results for this size
+        """
+        # the viewer needs nicegui which is only imported when needed
+        from slides.slide_viewer import SlidesViewer
+
+        first = len(self.results)
+        corpus_dir = os.path.join(self.corpus_dir, f"slides{slides}")
+        CorpusGenerator(CorpusConfig(slides=slides)).generate(corpus_dir)
+        self.measure(
+            "SlideWalker.dumpInfo",
+            slides,
+            lambda: SlideWalker(corpus_dir).dumpInfo("lod", excludeHiddenSlides=False),
+        )
+        ppt_set = PPTSet(SlideWalker(corpus_dir))
+        self.measure("PPTSet.load", slides, ppt_set.load)
+        ppts = list(ppt_set.ppts_by_path.values())
+        all_slides = [slide for ppt in ppts for slide in ppt.getSlides()]
+        self.measure(
+            "Slide.getText", slides, lambda: [slide.getText() for slide in all_slides]
+        )
+        notes = [slide.getNotes() for slide in all_slides]
+        for name, parser in self.get_parsers().items():
+            self.measure(
+                f"{name}.getKeyValues",
+                slides,
+                lambda parser=parser: [parser.getKeyValues(note) for note in notes],
+            )
+        solution = SimpleNamespace(debug=False, ppt_set=ppt_set, logger=None)
+        viewer = SlidesViewer(solution, ppts)
+        viewer.load_lod()
+        self.measure("SlidesViewer.to_view_lod", slides, viewer.to_view_lod)
+        return self.results[first:]
+
+    def run(self) -> dict:
+        """
+        run the benchmarks for all my sizes
+
+        Returns:
+            dict: the machine readable results
+        """
+        for slides in self.sizes:
+            self.run_size(slides)
+        return self.as_dict()
+
+    def as_dict(self) -> dict:
+        """
+        get my results with information about the environment
+        """
+        report = {
+            "version": Version.version,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": [
+                {**asdict(result), "per_slide_us": result.per_slide_us}
+                for result in self.results
+            ],
+        }
+        return report
+
+    @classmethod
+    def compare(cls, old: dict, new: dict) -> List[dict]:
+        """
+        compare the results of two benchmark runs
+
+        Args:
+            old(dict): the results of the baseline run
+            new(dict): the results of the current run
+
+        Returns:
+            List[dict]: name, slides, both times and the speedup for the benchmarks of both runs
+        """
+        old_results = {(r["name"], r["slides"]): r for r in old["results"]}
+        comparison = []
+        for result in new["results"]:
+            old_result = old_results.get((result["name"], result["slides"]))
+            if old_result is None:
+                continue
+            comparison.append(
+                {
+                    "name": result["name"],
+                    "slides": result["slides"],
+                    "old_seconds": old_result["seconds"],
+                    "new_seconds": result["seconds"],
+                    "speedup": old_result["seconds"] / max(result["seconds"], 1e-9),
+                }
+            )
+        return comparison
+
+
+def main(argv=None):
+    """
+    main routine
+    """
+    parser = argparse.ArgumentParser(
+        description="benchmark the slide walker, key/value parsers and viewer on synthetic corpora"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=Benchmark.default_sizes,
+        help="corpus sizes in slides (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--corpus",
+        default=Benchmark.default_corpus_dir(),
+        help="directory of the generated corpora (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="repetitions per benchmark - the best time counts (default: %(default)s)",
+    )
+    parser.add_argument("-o", "--output", help="JSON file to write the results to")
+    parser.add_argument(
+        "--compare", help="JSON results of a previous run to compare with"
+    )
+    args = parser.parse_args(argv)
+    benchmark = Benchmark(args.corpus, args.sizes, args.repeat, verbose=True)
+    report = benchmark.run()
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    if args.compare:
+        with open(args.compare) as baseline:
+            old = json.load(baseline)
+        for row in Benchmark.compare(old, report):
+            print(f"{row['name']:45} {row['slides']:6d} slides {row['speedup']:6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
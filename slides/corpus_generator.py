@@ -0,0 +1,202 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import datetime
+import io
+import json
+import os
+import random
+import re
+import zipfile
+from dataclasses import asdict, dataclass
+from typing import List
+
+from pptx import Presentation
+from pptx.util import Inches
+
+
+@dataclass
+class CorpusConfig:
+    """
+    the configuration of a synthetic presentation corpus
+    """
+
+    slides: int = 100
+    slides_per_deck: int = 100
+    shapes_per_slide: int = 3
+    # every n-th slide is hidden - 0 for none
+    hidden_every: int = 10
+    # every n-th shape gets an icon font glyph run - 0 for none
+    icon_every: int = 2
+    # every n-th slide has no notes - 0 for notes on all slides
+    no_notes_every: int = 7
+    seed: int = 42
+
+
+class CorpusGenerator:
+    """
+    generator of deterministic synthetic powerpoint decks for benchmarking
+    """
+
+    # the file names of the generated decks
+    deck_pattern = re.compile(r"deck\d{5}\.pptx")
+    # fixed timestamp to get byte identical files
+    timestamp = datetime.datetime(2026, 1, 1)
+    words = [
+        "semantic",
+        "slides",
+        "query",
+        "graph",
+        "ontology",
+        "lecture",
+        "database",
+        "nested",
+        "index",
+        "triple",
+        "schema",
+        "wiki",
+    ]
+    # private use area glyphs as used by icon fonts
+    icons = ["\ue001", "\ue0a2", "\uf101"]
+
+    def __init__(self, config: CorpusConfig = None):
+        """
+        constructor
+
+        Args:
+            config(CorpusConfig): the corpus configuration
+        """
+        if config is None:
+            config = CorpusConfig()
+        self.config = config
+
+    def get_phrase(self, rnd: random.Random, count: int) -> str:
+        """
+        get a phrase of the given number of random words
+        """
+        phrase = " ".join(rnd.choice(self.words) for _ in range(count))
+        return phrase
+
+    def get_notes(self, rnd: random.Random, deck: int, page: int) -> str:
+        """
+        get the key/value notes of the given slide
+        """
+        keywords = ", ".join(
+            sorted(set(rnd.choice(self.words) for _ in range(rnd.randint(1, 4))))
+        )
+        literature = ", ".join(
+            f"{rnd.choice(self.words).capitalize()}{rnd.randint(1990, 2026)}"
+            for _ in range(rnd.randint(1, 3))
+        )
+        notes = (
+            f"Name: deck{deck}_slide{page}\n"
+            f"Title: {self.get_phrase(rnd, 4).capitalize()}\n"
+            f"Keywords: {keywords}\n"
+            f"Literature: {literature}"
+        )
+        return notes
+
+    def create_deck(self, path: str, deck: int, slides: int):
+        """
+        create a single deck
+
+        Args:
+            path(str): the pptx file to write
+            deck(int): the number of the deck
+            slides(int): the number of slides
+        """
+        config = self.config
+        rnd = random.Random(f"{config.seed}-{deck}")
+        prs = Presentation()
+        props = prs.core_properties
+        props.title = f"Synthetic deck {deck}"
+        props.author = "CorpusGenerator"
+        props.last_modified_by = "CorpusGenerator"
+        props.created = CorpusGenerator.timestamp
+        props.modified = CorpusGenerator.timestamp
+        props.revision = 1
+        layout = prs.slide_layouts[5]
+        shape_count = 0
+        for page in range(1, slides + 1):
+            slide = prs.slides.add_slide(layout)
+            slide.shapes.title.text = self.get_phrase(rnd, 3).title()
+            for s in range(config.shapes_per_slide):
+                top = Inches(1.5 + s * 5.0 / max(config.shapes_per_slide, 1))
+                textbox = slide.shapes.add_textbox(
+                    Inches(1), top, Inches(8), Inches(0.8)
+                )
+                paragraph = textbox.text_frame.paragraphs[0]
+                shape_count += 1
+                if config.icon_every and shape_count % config.icon_every == 0:
+                    paragraph.add_run().text = rnd.choice(self.icons)
+                paragraph.add_run().text = self.get_phrase(rnd, rnd.randint(3, 8))
+            if not config.no_notes_every or page % config.no_notes_every != 0:
+                notes = self.get_notes(rnd, deck, page)
+                slide.notes_slide.notes_text_frame.text = notes
+            if config.hidden_every and page % config.hidden_every == 0:
+                slide._element.set("show", "0")
+        self.save(prs, path)
+
+    def save(self, prs, path: str):
+        """
+        save the given presentation with fixed zip entry timestamps
+        """
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        buffer.seek(0)
+        with (
+            zipfile.ZipFile(buffer) as source,
+            zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target,
+        ):
+            for info in source.infolist():
+                entry = zipfile.ZipInfo(
+                    info.filename, date_time=CorpusGenerator.timestamp.timetuple()[:6]
+                )
+                entry.compress_type = zipfile.ZIP_DEFLATED
+                target.writestr(entry, source.read(info.filename))
+
+    def generate(self, target_dir: str) -> List[str]:
+        """
+        generate the corpus in the given directory - an existing corpus
+        with the same configuration is reused
+
+        Args:
+            target_dir(str): the directory for the decks
+
+        Returns:
+            List[str]: the paths of the decks
+        """
+        config = self.config
+        os.makedirs(target_dir, exist_ok=True)
+        decks = -(-config.slides // config.slides_per_deck)
+        paths = [
+            os.path.join(target_dir, f"deck{deck:05d}.pptx") for deck in range(decks)
+        ]
+        manifest_path = os.path.join(target_dir, "corpus.json")
+        manifest = asdict(config)
+        if os.path.isfile(manifest_path):
+            with open(manifest_path) as manifest_file:
+                if json.load(manifest_file) == manifest and all(
+                    os.path.isfile(path) for path in paths
+                ):
+                    return paths
+            # remove the surplus decks of a previous configuration - other
+            # files and folders without a manifest are never touched
+            for filename in os.listdir(target_dir):
+                path = os.path.join(target_dir, filename)
+                if (
+                    CorpusGenerator.deck_pattern.fullmatch(filename)
+                    and path not in paths
+                ):
+                    os.remove(path)
+        for deck, path in enumerate(paths):
+            slides = min(
+                config.slides_per_deck, config.slides - deck * config.slides_per_deck
+            )
+            self.create_deck(path, deck, slides)
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        return paths
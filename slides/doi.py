@@ -7,10 +7,13 @@ Created on 2023-02-12
 import json
 import urllib.request
 from dataclasses import dataclass
+from typing import Optional
 
 import bibtexparser
 from pylatexenc.latex2text import LatexNodes2Text
 
+from slides.doi_cache import DOICache
+
 
 @dataclass
 class DOI:
@@ -18,8 +21,16 @@ class DOI:
     get DOI data
     """
 
+    bibtex_headers = {"Accept": "application/x-bibtex; charset=utf-8"}
+    citeproc_headers = {
+        "Accept": "application/vnd.citationstyles.csl+json; charset=utf-8"
+    }
+
     doi: str
     debug: bool = False
+    # optional persistent cache of the raw responses
+    cache: Optional[DOICache] = None
+    base_url: str = "https://doi.org"
 
     def debug_dump(self, d: dict):
         """
@@ -41,11 +52,32 @@ class DOI:
         Returns:
             dict: the metadata according to the given headers
         """
-        url = f"https://doi.org/{self.doi}"
+        url = f"{self.base_url}/{self.doi}"
+        if self.cache is None:
+            return self.fetchUrl(url, headers)
+        text = self.cache.fetch(
+            self.doi,
+            headers.get("Accept", ""),
+            url,
+            lambda: self.fetchUrl(url, headers),
+        )
+        return text
+
+    def fetchUrl(self, url: str, headers: dict) -> str:
+        """
+        fetch the given url
+
+        Args:
+            url(str): the url to fetch
+            headers(dict): the headers to use
+
+        Returns:
+            str: the decoded response text
+        """
         req = urllib.request.Request(url, headers=headers)
-        response = urllib.request.urlopen(req)
-        encoding = response.headers.get_content_charset("utf-8")
-        content = response.read()
+        with urllib.request.urlopen(req) as response:
+            encoding = response.headers.get_content_charset("utf-8")
+            content = response.read()
         text = content.decode(encoding)
         return text
 
@@ -58,8 +90,7 @@ class DOI:
             dict: metadata
 
         """
-        headers = {"Accept": "application/x-bibtex; charset=utf-8"}
-        text = self.fetchMeta(headers)
+        text = self.fetchMeta(DOI.bibtex_headers)
         if self.debug:
             print(text)
         return text
@@ -74,8 +105,7 @@ class DOI:
         Returns:
             dict: metadata
         """
-        headers = {"Accept": "application/vnd.citationstyles.csl+json; charset=utf-8"}
-        text = self.fetchMeta(headers)
+        text = self.fetchMeta(DOI.citeproc_headers)
         json_data = json.loads(text)
         self.debug_dump(json_data)
         return json_data
@@ -88,26 +118,57 @@ class DOI:
             dict: a dict with bibliographic metadata in bibtex latex format
         """
         meta_bibtex = self.fetchBibtexMeta()
+        btex = DOI.parseBibTex(meta_bibtex)
+        if btex:
+            self.debug_dump(btex)
+        return btex
+
+    @staticmethod
+    def parseBibTex(meta_bibtex: str) -> dict:
+        """
+        get the first entry of the given bibtex text
+
+        Args:
+            meta_bibtex(str): the bibtex text
+
+        Returns:
+            dict: the entry in bibtex latex format or None if there is no entry
+        """
         bd = bibtexparser.loads(meta_bibtex)
         btex = None
         if len(bd.entries) > 0:
             btex = bd.entries[0]
-            self.debug_dump(btex)
         return btex
 
-    def fetchPlainTextBibTexDict(self) -> dict:
+    @staticmethod
+    def toPlainText(btex: dict, ln2t: LatexNodes2Text = None) -> dict:
         """
-        get a plain text BibTexDict for my doi
+        convert the latex values of the given BibTexDict to plain text in place
+
+        Args:
+            btex(dict): the BibTexDict
+            ln2t(LatexNodes2Text): the converter to use - default: a new one
 
         Returns:
-            dict: a dict with bibliographic metadata in bibtex utf-8 (no latex) format
+            dict: the BibTexDict in bibtex utf-8 (no latex) format
         """
-        btex = self.fetchBibTexDict()
         if btex:
-            ln2t = LatexNodes2Text()
+            if ln2t is None:
+                ln2t = LatexNodes2Text()
             for key in btex:
                 latex = btex[key]
                 no_latex = ln2t.latex_to_text(latex)
                 btex[key] = no_latex
+        return btex
+
+    def fetchPlainTextBibTexDict(self) -> dict:
+        """
+        get a plain text BibTexDict for my doi
+
+        Returns:
+            dict: a dict with bibliographic metadata in bibtex utf-8 (no latex) format
+        """
+        btex = DOI.toPlainText(self.fetchBibTexDict())
+        if btex:
             self.debug_dump(btex)
         return btex
@@ -0,0 +1,297 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import urllib.error
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class DOICacheStats:
+    """
+    statistics of a DOICache
+    """
+
+    hits: int = 0
+    misses: int = 0
+    # hits of cached failures e.g. unresolvable DOIs
+    negative_hits: int = 0
+    # lookups that were sent to the server
+    fetches: int = 0
+
+    def summary(self) -> str:
+        """
+        get a one line summary of these statistics
+        """
+        text = (
+            f"doi cache: {self.hits} hits ({self.negative_hits} negative), "
+            f"{self.misses} misses, {self.fetches} fetches"
+        )
+        return text
+
+
+@dataclass
+class DOIResponse:
+    """
+    a cached response for a DOI lookup
+    """
+
+    doi: str
+    accept: str
+    # the HTTP status - 200 or the status of a cached failure
+    status: int
+    content: Optional[str]
+    # the time of the fetch in seconds since the epoch
+    fetched: float
+
+
+class DOICacheMiss(LookupError):
+    """
+    a lookup that is not in the cache while being offline
+    """
+
+
+class DOICache:
+    """
+    persistent SQLite cache for the raw responses of DOI metadata lookups
+    keyed by DOI and accept header
+
+    entries expire after a time to live - failures of unresolvable DOIs
+    are cached as well with a separate time to live
+    in offline mode only the cache is used - including expired entries
+    """
+
+    schema_version = 1
+    db_name = "doi_cache.db"
+    # statuses of DOIs that will not resolve on a retry
+    negative_statuses = {400, 404, 410}
+
+    def __init__(
+        self,
+        cache_dir: str,
+        ttl: float = 30 * 86400,
+        negative_ttl: float = 86400,
+        offline: bool = False,
+    ):
+        """
+        constructor
+
+        Args:
+            cache_dir(str): the directory to keep the cache database in
+            ttl(float): time to live of successful lookups in seconds
+            negative_ttl(float): time to live of failed lookups in seconds
+            offline(bool): if True never fetch but serve from the cache only
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.offline = offline
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, DOICache.db_name)
+        self.stats = DOICacheStats()
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.create_schema()
+
+    @classmethod
+    def default_cache_dir(cls) -> str:
+        """
+        get the default cache directory
+        """
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "pySemanticSlides")
+        return cache_dir
+
+    @classmethod
+    def normalize(cls, doi: str) -> str:
+        """
+        normalize the given doi - DOIs are case insensitive
+        """
+        return doi.strip().lower()
+
+    def create_schema(self):
+        """
+        create my database schema - dropping outdated content
+        """
+        with self.lock, self.conn:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != DOICache.schema_version:
+                self.conn.execute("DROP TABLE IF EXISTS doi_response")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS doi_response (
+                doi TEXT,
+                accept TEXT,
+                status INTEGER,
+                content TEXT,
+                fetched REAL,
+                PRIMARY KEY (doi, accept)
+                )""")
+            self.conn.execute(f"PRAGMA user_version={DOICache.schema_version}")
+
+    def close(self):
+        """
+        close my database connection
+        """
+        with self.lock:
+            self.conn.close()
+
+    def is_expired(self, response: DOIResponse, now: float = None) -> bool:
+        """
+        check whether the given response is older than its time to live
+        """
+        if now is None:
+            now = time.time()
+        ttl = self.ttl if response.status == 200 else self.negative_ttl
+        return now - response.fetched > ttl
+
+    def get(self, doi: str, accept: str) -> Optional[DOIResponse]:
+        """
+        get the cached response for the given doi and accept header
+
+        Args:
+            doi(str): the DOI
+            accept(str): the accept header of the lookup
+
+        Returns:
+            DOIResponse: the response or None if there is no valid entry
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status,content,fetched FROM doi_response WHERE doi=? AND accept=?",
+                (DOICache.normalize(doi), accept),
+            ).fetchone()
+        response = None
+        if row:
+            status, content, fetched = row
+            response = DOIResponse(doi, accept, status, content, fetched)
+            if not self.offline and self.is_expired(response):
+                response = None
+        return response
+
+    def put(
+        self,
+        doi: str,
+        accept: str,
+        status: int,
+        content: Optional[str],
+        fetched: float = None,
+    ):
+        """
+        store the response for the given doi and accept header
+
+        Args:
+            doi(str): the DOI
+            accept(str): the accept header of the lookup
+            status(int): the HTTP status
+            content(str): the raw response text - None for failures
+            fetched(float): the time of the fetch - default: now
+        """
+        if fetched is None:
+            fetched = time.time()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO doi_response VALUES (?,?,?,?,?)",
+                (DOICache.normalize(doi), accept, status, content, fetched),
+            )
+
+    def fetch(self, doi: str, accept: str, url: str, fetcher: Callable[[], str]) -> str:
+        """
+        get the response for the given doi and accept header
+        from the cache or by calling the given fetcher
+
+        Args:
+            doi(str): the DOI
+            accept(str): the accept header of the lookup
+            url(str): the url of the lookup - for errors
+            fetcher(Callable): function fetching the raw response text
+
+        Returns:
+            str: the raw response text
+
+        Raises:
+            urllib.error.HTTPError: for failed lookups - cached or not
+            DOICacheMiss: if offline and the lookup is not cached
+        """
+        response = self.get(doi, accept)
+        if response is not None:
+            with self.lock:
+                self.stats.hits += 1
+                if response.status != 200:
+                    self.stats.negative_hits += 1
+            if response.status != 200:
+                raise urllib.error.HTTPError(
+                    url, response.status, "cached failure", None, None
+                )
+            return response.content
+        with self.lock:
+            self.stats.misses += 1
+            if not self.offline:
+                self.stats.fetches += 1
+        if self.offline:
+            raise DOICacheMiss(f"{doi} ({accept}) is not cached")
+        try:
+            text = fetcher()
+        except urllib.error.HTTPError as ex:
+            if ex.code in DOICache.negative_statuses:
+                self.put(doi, accept, ex.code, None)
+            raise
+        self.put(doi, accept, 200, text)
+        return text
+
+    def export_entries(self, path: str) -> int:
+        """
+        export all my entries to the given JSON lines file
+
+        Args:
+            path(str): the file to write
+
+        Returns:
+            int: the number of exported entries
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT doi,accept,status,content,fetched FROM doi_response ORDER BY doi,accept"
+            ).fetchall()
+        with open(path, "w", encoding="utf-8") as jsonl:
+            for row in rows:
+                jsonl.write(json.dumps(asdict(DOIResponse(*row))) + "\n")
+        return len(rows)
+
+    def import_entries(self, path: str) -> int:
+        """
+        import the entries of the given JSON lines file - existing
+        entries are only replaced by more recently fetched ones
+
+        Args:
+            path(str): the file written by export_entries
+
+        Returns:
+            int: the number of imported entries
+        """
+        count = 0
+        with open(path, encoding="utf-8") as jsonl, self.lock, self.conn:
+            for line in jsonl:
+                if not line.strip():
+                    continue
+                response = DOIResponse(**json.loads(line))
+                cursor = self.conn.execute(
+                    """INSERT INTO doi_response VALUES (?,?,?,?,?)
+                    ON CONFLICT(doi, accept) DO UPDATE SET
+                    status=excluded.status,content=excluded.content,fetched=excluded.fetched
+                    WHERE excluded.fetched > doi_response.fetched""",
+                    (
+                        DOICache.normalize(response.doi),
+                        response.accept,
+                        response.status,
+                        response.content,
+                        response.fetched,
+                    ),
+                )
+                count += cursor.rowcount
+        return count
@@ -0,0 +1,305 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import http.client
+import json
+import threading
+import time
+import urllib.error
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from pylatexenc.latex2text import LatexNodes2Text
+
+from slides.doi import DOI
+from slides.doi_cache import DOICache
+
+
+class RateLimiter:
+    """
+    limit the requests per second for each host
+    """
+
+    def __init__(self, rate: float):
+        """
+        constructor
+
+        Args:
+            rate(float): the maximum requests per second per host - 0 for no limit
+        """
+        self.interval = 1.0 / rate if rate else 0.0
+        self.lock = threading.Lock()
+        # host -> time of the next free slot
+        self.next_slots: Dict[str, float] = {}
+
+    def wait(self, host: str):
+        """
+        wait for the next free request slot of the given host
+        """
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slots.get(host, now))
+            self.next_slots[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+@dataclass
+class ResolverStats:
+    """
+    statistics of a DOIResolver
+    """
+
+    requests: int = 0
+    retries: int = 0
+    # responses with status 429 - too many requests
+    throttled: int = 0
+    connections: int = 0
+
+
+class DOIResolver:
+    """
+    concurrent batch resolution of DOIs over pooled keep-alive
+    connections with a per host rate limit and retries with backoff
+    """
+
+    headers_by_kind = {
+        "citeproc": DOI.citeproc_headers,
+        "bibtex": DOI.bibtex_headers,
+        "plaintext": DOI.bibtex_headers,
+    }
+    retry_statuses = {429, 500, 502, 503, 504}
+    redirect_statuses = {301, 302, 303, 307, 308}
+    max_redirects = 5
+
+    def __init__(
+        self,
+        base_url: str = "https://doi.org",
+        workers: int = 8,
+        rate: float = 10.0,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
+        cache: Optional[DOICache] = None,
+    ):
+        """
+        constructor
+
+        Args:
+            base_url(str): the url of the DOI resolver
+            workers(int): number of concurrent requests
+            rate(float): maximum requests per second per host - 0 for no limit
+            retries(int): number of retries of failed requests
+            backoff(float): delay before the first retry in seconds - doubled for each retry
+            timeout(float): timeout per request in seconds
+            cache(DOICache): optional persistent cache of the raw responses
+        """
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache = cache
+        self.rate_limiter = RateLimiter(rate)
+        self.stats = ResolverStats()
+        self.errors: Dict[str, Exception] = {}
+        self.lock = threading.Lock()
+        # the connections of each worker thread by (scheme, host)
+        self.local = threading.local()
+        self.connections: List[http.client.HTTPConnection] = []
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="doi"
+        )
+
+    def close(self):
+        """
+        shut down my workers and close all connections
+        """
+        self.executor.shutdown(wait=True)
+        with self.lock:
+            for connection in self.connections:
+                connection.close()
+            self.connections = []
+
+    def get_connection(self, scheme: str, host: str) -> http.client.HTTPConnection:
+        """
+        get the keep-alive connection of the current thread for the given host
+        """
+        connections = getattr(self.local, "connections", None)
+        if connections is None:
+            connections = self.local.connections = {}
+        connection = connections.get((scheme, host))
+        if connection is None:
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(host, timeout=self.timeout)
+            else:
+                connection = http.client.HTTPConnection(host, timeout=self.timeout)
+            connections[(scheme, host)] = connection
+            with self.lock:
+                self.connections.append(connection)
+                self.stats.connections += 1
+        return connection
+
+    def request(self, url: str, headers: dict) -> Tuple[int, dict, bytes]:
+        """
+        send a single GET request for the given url
+
+        Returns:
+            Tuple[int, dict, bytes]: the status, the headers and the body
+        """
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        self.rate_limiter.wait(parts.netloc)
+        connection = self.get_connection(parts.scheme, parts.netloc)
+        with self.lock:
+            self.stats.requests += 1
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            # the body needs to be read completely to reuse the connection
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            # e.g. a keep-alive connection closed by the server
+            connection.close()
+            raise
+        return response.status, response.headers, body
+
+    def get_delay(self, attempt: int, headers=None) -> float:
+        """
+        get the delay before the given retry - honoring a Retry-After header
+        """
+        delay = self.backoff * 2**attempt
+        retry_after = headers.get("Retry-After") if headers else None
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, float(retry_after))
+        return delay
+
+    def fetchUrl(self, url: str, headers: dict) -> str:
+        """
+        fetch the given url following redirects and retrying temporary failures
+
+        Args:
+            url(str): the url to fetch
+            headers(dict): the headers to use
+
+        Returns:
+            str: the decoded response text
+
+        Raises:
+            urllib.error.HTTPError: if the final response is not successful
+        """
+        attempt = 0
+        redirects = 0
+        while True:
+            try:
+                status, response_headers, body = self.request(url, headers)
+            except (OSError, http.client.HTTPException):
+                if attempt >= self.retries:
+                    raise
+                status, response_headers = None, None
+            if (
+                status in DOIResolver.redirect_statuses
+                and "Location" in response_headers
+            ):
+                redirects += 1
+                if redirects > DOIResolver.max_redirects:
+                    raise urllib.error.HTTPError(
+                        url, status, "too many redirects", response_headers, None
+                    )
+                url = urllib.parse.urljoin(url, response_headers["Location"])
+                continue
+            if status is None or (
+                status in DOIResolver.retry_statuses and attempt < self.retries
+            ):
+                with self.lock:
+                    self.stats.retries += 1
+                    if status == 429:
+                        self.stats.throttled += 1
+                time.sleep(self.get_delay(attempt, response_headers))
+                attempt += 1
+                continue
+            if status != 200:
+                raise urllib.error.HTTPError(
+                    url,
+                    status,
+                    http.client.responses.get(status, ""),
+                    response_headers,
+                    None,
+                )
+            encoding = response_headers.get_content_charset("utf-8")
+            return body.decode(encoding)
+
+    def fetchMeta(self, doi: str, kind: str) -> dict:
+        """
+        get the metadata of the given doi
+
+        Args:
+            doi(str): the DOI
+            kind(str): citeproc, bibtex or plaintext
+
+        Returns:
+            dict: the citeproc JSON or the latex BibTexDict - plaintext is converted by resolve
+        """
+        headers = DOIResolver.headers_by_kind[kind]
+        url = f"{self.base_url}/{urllib.parse.quote(doi, safe='/')}"
+        if self.cache is None:
+            text = self.fetchUrl(url, headers)
+        else:
+            text = self.cache.fetch(
+                doi, headers["Accept"], url, lambda: self.fetchUrl(url, headers)
+            )
+        if kind == "citeproc":
+            meta = json.loads(text)
+        else:
+            meta = DOI.parseBibTex(text)
+        return meta
+
+    def resolve(self, dois: List[str], kind: str = "bibtex") -> Dict[str, dict]:
+        """
+        resolve the given DOIs concurrently - each distinct DOI is fetched once
+
+        Args:
+            dois(List[str]): the DOIs - duplicates are allowed
+            kind(str): citeproc, bibtex or plaintext - giving the results of
+                fetchCiteprocMeta, fetchBibTexDict or fetchPlainTextBibTexDict of the DOI class
+
+        Returns:
+            Dict[str, dict]: the metadata by the given DOI - failed DOIs are
+            missing and their exceptions are in my errors
+        """
+        if kind not in DOIResolver.headers_by_kind:
+            raise ValueError(f"invalid kind {kind}")
+        # DOIs are case insensitive
+        unique = {}
+        for doi in dois:
+            unique.setdefault(DOICache.normalize(doi), doi.strip())
+        self.errors = {}
+        metas = {}
+        futures = {
+            self.executor.submit(self.fetchMeta, doi, kind): key
+            for key, doi in unique.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                metas[key] = future.result()
+            except Exception as ex:
+                self.errors[unique[key]] = ex
+        if kind == "plaintext":
+            ln2t = LatexNodes2Text()
+            for meta in metas.values():
+                DOI.toPlainText(meta, ln2t)
+        results = {}
+        for doi in dois:
+            key = DOICache.normalize(doi)
+            if key in metas:
+                results[doi] = metas[key]
+        return results
@@ -4,9 +4,13 @@ Created on 2023-02-14
 @author: wf
 """
 
+import functools
+import itertools
+import re
 import traceback
 import typing
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 
 import pyparsing as pp
 
@@ -26,6 +30,8 @@ class KeyValueParserConfig:
     ignore_errors: bool = True
     defined_keys_only: bool = False
     debug: bool = False
+    # "pyparsing" or "scanner" for the hand-written state machine
+    backend: str = "pyparsing"
 
 
 @dataclass
@@ -56,6 +62,354 @@ class Keydef:
         return keydefs_by_keyword
 
 
+@dataclass
+class KeyValueError:
+    """
+    an error of parsing a single text in a bulk extraction
+    """
+
+    # index of the text in the bulk input
+    index: int
+    message: str
+    # the exception class name or "error" for errors reported by the parser
+    kind: str = "error"
+
+
+@dataclass
+class KeyValueTable:
+    """
+    the result of a bulk key/value extraction
+    """
+
+    # the Keydef keys
+    keys: typing.List[str]
+    # one key/value dict per text
+    rows: typing.List[dict] = field(default_factory=list)
+    errors: typing.List[KeyValueError] = field(default_factory=list)
+
+    def as_columns(self, keys: typing.List[str] = None) -> typing.Dict[str, list]:
+        """
+        get my rows as columns
+
+        Args:
+            keys(list): the keys to get columns for - default: my Keydef keys
+
+        Returns:
+            dict: key -> list of values with None for texts without the key
+        """
+        if keys is None:
+            keys = self.keys
+        columns = {key: [row.get(key) for row in self.rows] for key in keys}
+        return columns
+
+
+def set_whitespace(grammar: pp.ParserElement, whitespace: str) -> pp.ParserElement:
+    """
+    set the whitespace of all elements of the given grammar instead of
+    changing pyparsing's process wide default whitespace - so that
+    grammars do not influence each other e.g. when used in threads
+
+    Args:
+        grammar(pp.ParserElement): the grammar
+        whitespace(str): the characters to skip before each token
+
+    Returns:
+        pp.ParserElement: the grammar
+    """
+    seen = set()
+    elements = [grammar]
+    while elements:
+        element = elements.pop()
+        if id(element) in seen:
+            continue
+        seen.add(id(element))
+        if element.skipWhitespace:
+            element.set_whitespace_chars(whitespace)
+        elements.extend(element.recurse())
+    return grammar
+
+
+class ScanError(Exception):
+    """
+    raised if a scanner can not handle an input
+    """
+
+
+class Scanner:
+    """
+    hand-written state machine scanner base giving the same results as
+    the pyparsing grammars - inputs the grammars would reject raise a ScanError
+    so that callers can fall back to pyparsing for the identical error
+    """
+
+    # the unquoting of pp.QuotedString without escape char (pyparsing >= 3.1)
+    # to convert escapes exactly the same way - the repetition counts
+    # are literal digits there as well
+    escape_re = re.compile(
+        r"(\\t|\\n|\\f|\\r)"
+        r"|(\\[0-7]3|\\0|\\x[0-9a-fA-F]2|\\u[0-9a-fA-F]4)"
+        r"|(.)"
+        r"|(\n|.)"
+    )
+    ws_map = {r"\t": "\t", r"\n": "\n", r"\f": "\f", r"\r": "\r"}
+
+    def __init__(
+        self, chars: str, exclude_chars: str, quote: str, whitespace: str = ""
+    ):
+        """
+        constructor
+
+        Args:
+            chars(str): the characters of unquoted words
+            exclude_chars(str): characters not allowed in unquoted words
+            quote(str): the quote char
+            whitespace(str): characters skipped before each token
+        """
+        word_chars = "".join(sorted(set(chars) - set(exclude_chars)))
+        self.word_re = re.compile(f"[{re.escape(word_chars)}]+")
+        self.quote = quote
+        self.whitespace = whitespace
+        # only single character quotes are handled by the scanner
+        self.supported = len(quote) == 1 and not quote.isspace()
+
+    @classmethod
+    def unescape(cls, content: str) -> str:
+        """
+        convert whitespace and numeric escapes in the given quoted content
+        """
+        if "\\" not in content:
+            return content
+
+        def convert(match) -> str:
+            if match[1]:
+                return cls.ws_map[match[1]]
+            if match[2]:
+                code = match[2][1:]
+                if code == "0":
+                    return "\0"
+                if code.isdigit() and len(code) == 3:
+                    return chr(int(code, 8))
+                if code.startswith(("u", "x")):
+                    return chr(int(code[1:], 16))
+                return code
+            if match[3]:
+                return match[3][-1]
+            return match[4]
+
+        return "".join(convert(match) for match in cls.escape_re.finditer(content))
+
+    def skip(self, text: str, i: int) -> int:
+        """
+        skip my whitespace starting at the given position
+        """
+        n = len(text)
+        while i < n and text[i] in self.whitespace:
+            i += 1
+        return i
+
+    def scan_token(self, text: str, i: int):
+        """
+        scan an unquoted word or a quoted string at the given position
+
+        Returns:
+            tuple: the token, whether it was quoted and the end position - token is None if there is none
+        """
+        i = self.skip(text, i)
+        match = self.word_re.match(text, i)
+        if match:
+            return match.group(), False, match.end()
+        if i < len(text) and text[i] == self.quote:
+            end = text.find(self.quote, i + 1)
+            if end >= 0:
+                content = text[i + 1 : end]
+                if "\n" not in content and "\r" not in content:
+                    return Scanner.unescape(content), True, end + 1
+        return None, False, i
+
+    def check_end(self, text: str, i: int):
+        """
+        check that the given position is at the end of the text
+        ignoring my whitespace just like the grammar's StringEnd does
+        """
+        i = self.skip(text, i)
+        if i < len(text):
+            raise ScanError(f"unexpected {text[i]!r} at char {i}")
+
+
+class SplitScanner(Scanner):
+    """
+    scanner for the Split grammar
+    """
+
+    def __init__(self, delim: str, quote: str, unicode_chars: str, keep_quotes: bool):
+        """
+        constructor
+
+        Args:
+            delim(str): the delimiter
+            quote(str): the quote char
+            unicode_chars(str): unicode characters to allow
+            keep_quotes(str): if True keep the quoted strings if False remove quotes
+        """
+        super().__init__(pp.printables + unicode_chars + " ", delim + quote, quote)
+        self.delim = delim
+        self.keep_quotes = keep_quotes
+
+    def scan_value(self, text: str, i: int):
+        """
+        scan a value consisting of words and quoted strings
+
+        Returns:
+            tuple: the value (None if there is none) and the end position
+        """
+        parts = []
+        while True:
+            token, quoted, end = self.scan_token(text, i)
+            if token is None:
+                break
+            if quoted and self.keep_quotes:
+                token = f"{self.quote}{token}{self.quote}"
+            parts.append(token)
+            i = end
+        value = None
+        if parts:
+            value = "".join(parts) if len(parts) > 1 else parts[0]
+        return value, i
+
+    def scan(self, text: str) -> list:
+        """
+        split the given text
+
+        Args:
+            text(str): the text to split
+
+        Returns:
+            list: a list of strings
+        """
+        if not self.supported:
+            raise ScanError(f"quote {self.quote!r} is not supported")
+        text = text.expandtabs()
+        value, i = self.scan_value(text, 0)
+        if value is None:
+            raise ScanError("value expected at char 0")
+        values = [value]
+        while text.startswith(self.delim, i):
+            value, end = self.scan_value(text, i + len(self.delim))
+            if value is None:
+                break
+            values.append(value)
+            i = end
+        self.check_end(text, i)
+        return values
+
+
+class KeyValueScanner(Scanner):
+    """
+    scanner for the KeyValueParser grammar
+    """
+
+    alpha_re = re.compile("[A-Za-z]+")
+
+    def __init__(
+        self, config: KeyValueParserConfig, keydefs_by_keyword: dict, whitespace: str
+    ):
+        """
+        constructor
+
+        Args:
+            config(KeyValueParserConfig): the configuration to use
+            keydefs_by_keyword(dict): the key definitions
+            whitespace(str): the whitespace the grammar skips before each token
+        """
+        super().__init__(
+            pp.printables + " " + config.unicode_chars,
+            config.record_delim + config.value_delim + config.quote,
+            config.quote,
+            whitespace,
+        )
+        self.config = config
+        self.keydefs_by_keyword = keydefs_by_keyword
+
+    def scan_item(self, text: str, i: int):
+        """
+        scan the tokens of an item
+
+        Returns:
+            tuple: the list of tokens (empty if there is none) and the end position
+        """
+        tokens = []
+        while True:
+            token, _quoted, end = self.scan_token(text, i)
+            if token is None:
+                break
+            tokens.append(token)
+            i = end
+        return tokens, i
+
+    def scan_key_value(self, text: str, i: int):
+        """
+        scan a key value pair
+
+        Returns:
+            tuple: the key value tuple (None if there is none) and the end position
+        """
+        j = self.skip(text, i)
+        match = KeyValueScanner.alpha_re.match(text, j)
+        if not match:
+            return None, i
+        keyword = match.group()
+        j = self.skip(text, match.end())
+        if not text.startswith(self.config.key_value_delim, j):
+            return None, i
+        tokens, j = self.scan_item(text, j + len(self.config.key_value_delim))
+        if not tokens:
+            return None, i
+        value_delim = self.config.value_delim
+        while True:
+            k = self.skip(text, j)
+            if not text.startswith(value_delim, k):
+                break
+            more_tokens, k = self.scan_item(text, k + len(value_delim))
+            if not more_tokens:
+                break
+            tokens.extend(more_tokens)
+            j = k
+        keydef = self.keydefs_by_keyword.get(keyword)
+        key = keydef.key if keydef else keyword
+        value = tokens if len(tokens) > 1 else tokens[0]
+        return (key, value), j
+
+    def scan(self, text: str) -> list:
+        """
+        scan the given text
+
+        Args:
+            text(str): the text to scan
+
+        Returns:
+            list: a list of key value tuples
+        """
+        if not self.supported:
+            raise ScanError(f"quote {self.quote!r} is not supported")
+        text = text.expandtabs()
+        key_value, i = self.scan_key_value(text, 0)
+        if key_value is None:
+            raise ScanError("key expected at char 0")
+        key_values = [key_value]
+        record_delim = self.config.record_delim
+        while True:
+            j = self.skip(text, i)
+            if not text.startswith(record_delim, j):
+                break
+            key_value, j = self.scan_key_value(text, j + len(record_delim))
+            if key_value is None:
+                break
+            key_values.append(key_value)
+            i = j
+        self.check_end(text, i)
+        return key_values
+
+
 class Split:
     """
     quoted string splitter
@@ -67,6 +421,7 @@ class Split:
         quote: str = "'",
         unicode_chars: str = "•→–",
         keep_quotes: bool = True,
+        backend: str = "pyparsing",
     ):
         """
         constructor
@@ -76,23 +431,57 @@ class Split:
             quote(str): the quote char, default single quote
             unicode_chars(str): unicode characters to allow
             keep_quotes(str): if True keep the quoted strings if False remove quotes
+            backend(str): "pyparsing" or "scanner"
 
         """
         self.delim = delim
         self.quote = quote
         self.keep_quotes = keep_quotes
-        pp.ParserElement.setDefaultWhitespaceChars("")
-        self.g_quoted = pp.QuotedString(quote_char=quote)
-        self.g_value = pp.OneOrMore(
+        self.g_split = Split.compile(delim, quote, unicode_chars, keep_quotes)
+        self.scanner = None
+        if backend == "scanner":
+            self.scanner = Split.get_scanner(delim, quote, unicode_chars, keep_quotes)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get_scanner(
+        delim: str, quote: str, unicode_chars: str, keep_quotes: bool
+    ) -> SplitScanner:
+        """
+        get the scanner for the given configuration - created only once
+        """
+        return SplitScanner(delim, quote, unicode_chars, keep_quotes)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def compile(
+        delim: str, quote: str, unicode_chars: str, keep_quotes: bool
+    ) -> pp.ParserElement:
+        """
+        get the grammar for the given configuration - compiled only once
+
+        Args:
+            delim(str): the delimiter char
+            quote(str): the quote char
+            unicode_chars(str): unicode characters to allow
+            keep_quotes(str): if True keep the quoted strings if False remove quotes
+
+        Returns:
+            pp.ParserElement: the split grammar
+        """
+        g_quoted = pp.QuotedString(quote_char=quote)
+        g_value = pp.OneOrMore(
             pp.Word(pp.printables + unicode_chars + " ", excludeChars=delim + quote)
-            | self.g_quoted
+            | g_quoted
         )
-        self.g_quoted.add_parse_action(
-            lambda x: f"{quote}{x[0]}{quote}" if self.keep_quotes else f"{x[0]}"
+        g_quoted.add_parse_action(
+            lambda x: f"{quote}{x[0]}{quote}" if keep_quotes else f"{x[0]}"
         )
-        self.g_value.add_parse_action(lambda x: "".join(x) if len(x) > 1 else x)
-        self.g_split = pp.delimited_list(self.g_value, delim=delim)
-        pass
+        g_value.add_parse_action(lambda x: "".join(x) if len(x) > 1 else x)
+        g_split = pp.delimited_list(g_value, delim=delim) + pp.StringEnd()
+        # no whitespace skipping at all
+        set_whitespace(g_split, "")
+        return g_split
 
     def split(
         self,
@@ -107,7 +496,13 @@ class Split:
         Returns:
             list: a list of strings
         """
-        parse_result = self.g_split.parse_string(text, parse_all=True)
+        if self.scanner:
+            try:
+                return self.scanner.scan(text)
+            except ScanError:
+                # pyparsing gives the error
+                pass
+        parse_result = self.g_split.parse_string(text)
         result_list = parse_result.asList()
         return result_list
 
@@ -127,6 +522,8 @@ class BaseKeyValueParser:
         self.config = config
         self.errors = []
         self.keydefs_by_keyword = {}
+        # formatting tracebacks is expensive - bulk extraction switches it off
+        self.with_traceback = True
 
     def setKeydefs(self, keydefs: typing.List[Keydef]):
         """
@@ -152,7 +549,7 @@ class BaseKeyValueParser:
         """
         handle my error with respect to the given text to pars
         """
-        if not self.config.ignore_errors:
+        if not self.config.ignore_errors and self.errors:
             error_str = "\n".join(self.errors)
             raise Exception(
                 f"key/value parsing of {text} failed with {len(self.errors)} errors:\n{error_str}"
@@ -170,6 +567,100 @@ class BaseKeyValueParser:
                 stripped_values.append(value.strip())
             return stripped_values
 
+    def getKeyValuesChunk(
+        self, texts: typing.List[str], offset: int = 0
+    ) -> KeyValueTable:
+        """
+        get the key/value pairs of the given texts
+
+        Args:
+            texts(list): the texts to parse
+            offset(int): the index of the first text in the bulk input
+
+        Returns:
+            KeyValueTable: the rows and structured errors
+        """
+        keys = [keydef.key for keydef in self.keydefs_by_keyword.values()]
+        table = KeyValueTable(keys)
+        with_traceback = self.with_traceback
+        self.with_traceback = False
+        try:
+            for index, text in enumerate(texts, start=offset):
+                try:
+                    key_values = self.getKeyValues(text)
+                    for error_msg in self.errors:
+                        table.errors.append(KeyValueError(index, error_msg))
+                except Exception as ex:
+                    key_values = {}
+                    table.errors.append(
+                        KeyValueError(index, str(ex), type(ex).__name__)
+                    )
+                table.rows.append(key_values)
+        finally:
+            self.with_traceback = with_traceback
+        return table
+
+    @staticmethod
+    def parseChunk(
+        parser_class: type,
+        config: KeyValueParserConfig,
+        keydefs: typing.List[Keydef],
+        texts: typing.List[str],
+        offset: int,
+    ) -> KeyValueTable:
+        """
+        parse the given chunk of texts in a worker process - the grammars
+        can not be pickled so the parser is recreated from its configuration
+        """
+        parser = parser_class(config=config)
+        parser.setKeydefs(keydefs)
+        table = parser.getKeyValuesChunk(texts, offset)
+        return table
+
+    def getKeyValuesBulk(
+        self,
+        texts: typing.Iterable[str],
+        workers: int = 1,
+        chunk_size: int = 1000,
+    ) -> KeyValueTable:
+        """
+        get the key/value pairs of many texts e.g. the notes of all slides
+        of a corpus - errors are collected per text instead of raised
+
+        Args:
+            texts(Iterable[str]): the texts to parse
+            workers(int): number of worker processes - 1 parses in this process
+            chunk_size(int): number of texts per worker task
+
+        Returns:
+            KeyValueTable: one row per text and the structured errors
+        """
+        if workers <= 1:
+            return self.getKeyValuesChunk(list(texts))
+        keydefs = list(self.keydefs_by_keyword.values())
+        table = KeyValueTable([keydef.key for keydef in keydefs])
+        iterator = iter(texts)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            offset = 0
+            while chunk := list(itertools.islice(iterator, chunk_size)):
+                futures.append(
+                    executor.submit(
+                        BaseKeyValueParser.parseChunk,
+                        type(self),
+                        self.config,
+                        keydefs,
+                        chunk,
+                        offset,
+                    )
+                )
+                offset += len(chunk)
+            for future in futures:
+                chunk_table = future.result()
+                table.rows.extend(chunk_table.rows)
+                table.errors.extend(chunk_table.errors)
+        return table
+
 
 class KeyValueSplitParser(BaseKeyValueParser):
     """
@@ -191,20 +682,29 @@ class KeyValueSplitParser(BaseKeyValueParser):
         self.errors = []
         result = dict()
         if text:
+            # the grammars are compiled once per configuration
+            rsplit = Split(
+                delim=self.config.record_delim,
+                unicode_chars=self.config.unicode_chars,
+                backend=self.config.backend,
+            )
+            key_value_split = Split(
+                delim=self.config.key_value_delim,
+                unicode_chars=self.config.unicode_chars,
+                backend=self.config.backend,
+            )
+            values_split = Split(
+                delim=self.config.value_delim,
+                unicode_chars=self.config.unicode_chars,
+                keep_quotes=False,
+                backend=self.config.backend,
+            )
             try:
-                rsplit = Split(
-                    delim=self.config.record_delim,
-                    unicode_chars=self.config.unicode_chars,
-                )
                 records = rsplit.split(text)
             except Exception as rsplit_ex:
                 self.add_error(f"record split failed {rsplit_ex}")
                 records = []
             for record in records:
-                key_value_split = Split(
-                    delim=self.config.key_value_delim,
-                    unicode_chars=self.config.unicode_chars,
-                )
                 key_values = key_value_split.split(record)
                 if len(key_values) != 2:
                     self.add_error(
@@ -225,11 +725,6 @@ class KeyValueSplitParser(BaseKeyValueParser):
                         keydef = self.keydefs_by_keyword[keyword]
                         # map keyword to key
                         key = keydef.key
-                        values_split = Split(
-                            delim=self.config.value_delim,
-                            unicode_chars=self.config.unicode_chars,
-                            keep_quotes=False,
-                        )
                         if keydef.has_list:
                             value_list = values_split.split(values_str)
                             value_list = self.getStrippedValues(value_list)
@@ -259,10 +754,9 @@ class KeyValueParser(BaseKeyValueParser):
         """
         BaseKeyValueParser.__init__(self, config)
         if config.record_delim == "\n":
-            pp.ParserElement.setDefaultWhitespaceChars("\t")
+            self.whitespace = "\t"
         else:
-            pp.ParserElement.setDefaultWhitespaceChars("\n")
-        pass
+            self.whitespace = "\n"
 
     def setKeydefs(self, keydefs: typing.List[Keydef]):
         """
@@ -294,7 +788,10 @@ class KeyValueParser(BaseKeyValueParser):
         g_value = pp.delimited_list(g_item, delim=value_delim)
         l_key_value_sep = pp.Suppress(pp.Literal(key_value_delim))
         g_key_value = g_key + l_key_value_sep + g_value
-        self.g_grammar = pp.delimited_list(g_key_value, delim=record_delim)
+        self.g_grammar = (
+            pp.delimited_list(g_key_value, delim=record_delim) + pp.StringEnd()
+        )
+        set_whitespace(self.g_grammar, self.whitespace)
 
         g_key.add_parse_action(
             lambda x: (
@@ -311,7 +808,11 @@ class KeyValueParser(BaseKeyValueParser):
                 else (x[0], x[1])
             )
         )
-        pass
+        self.scanner = None
+        if self.config.backend == "scanner":
+            self.scanner = KeyValueScanner(
+                self.config, self.keydefs_by_keyword, self.whitespace
+            )
 
     def getKeyValues(self, text: str) -> dict:
         """
@@ -327,7 +828,16 @@ class KeyValueParser(BaseKeyValueParser):
         key_values = dict()
         if text:
             try:
-                for k, v in self.g_grammar.parse_string(text, parse_all=True):
+                parsed = None
+                if self.scanner:
+                    try:
+                        parsed = self.scanner.scan(text)
+                    except ScanError:
+                        # pyparsing gives the error
+                        pass
+                if parsed is None:
+                    parsed = self.g_grammar.parse_string(text)
+                for k, v in parsed:
                     if self.config.strip:
                         if isinstance(v, list):
                             v = self.getStrippedValues(v)
@@ -335,7 +845,7 @@ class KeyValueParser(BaseKeyValueParser):
                             v = v.strip()
                     key_values[k] = v
             except Exception as ex:
-                tb = traceback.format_exc()
+                tb = traceback.format_exc() if self.with_traceback else ""
                 error_msg = f"parsing {text} failed: \n{str(ex)}\n{tb}"
                 self.add_error(error_msg)
             self.handleErrors(text)
@@ -0,0 +1,311 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+import bibtexparser
+from pylatexenc.latex2text import LatexNodes2Text
+
+from slides.doi import DOI
+from slides.doi_cache import DOICache
+from slides.doi_resolver import DOIResolver
+from slides.keyvalue_parser import Keydef, KeyValueParserConfig, KeyValueSplitParser
+from slides.slidewalker import SlideWalker
+
+
+@dataclass
+class Reference:
+    """
+    a literature reference of the slide notes
+    """
+
+    key: str
+    doi: Optional[str] = None
+    # resolved, unresolved (no DOI or bibtex entry known) or failed
+    status: str = "unresolved"
+    # plain text BibTexDict
+    meta: Optional[dict] = None
+    error: Optional[str] = None
+
+
+class LiteraturePipeline:
+    """
+    collect the literature references of the notes of all slides,
+    resolve each distinct reference once and write a reference table
+    and a slide to reference map
+
+    references that are DOIs or bibtex entries with a doi field are
+    resolved by batch DOI resolution - other entries of the optional
+    bibtex file are used as they are
+    runs are incremental: references of a previous run are only
+    resolved again if they are not resolved yet e.g. because their
+    resolution failed or their bibtex entry was missing
+    """
+
+    references_file = "references.json"
+    slide_map_file = "slide_references.csv"
+    slide_map_fields = ["path", "page", "name", "reference"]
+    doi_regex = re.compile(
+        r"^(?:https?://(?:dx\.)?doi\.org/|doi:)?(10\.\d{4,9}/\S+)$", re.IGNORECASE
+    )
+
+    def __init__(
+        self,
+        slidewalker: SlideWalker,
+        output_dir: str,
+        resolver: DOIResolver = None,
+        bibtex_path: str = None,
+        keyword: str = "Literature",
+        config: KeyValueParserConfig = None,
+    ):
+        """
+        constructor
+
+        Args:
+            slidewalker(SlideWalker): the walker for the decks
+            output_dir(str): the directory for the reference table and slide map
+            resolver(DOIResolver): the resolver for DOIs - None for no lookups
+            bibtex_path(str): optional bibtex file with entries by reference key
+            keyword(str): the notes key of the literature list
+            config(KeyValueParserConfig): the format of the notes
+        """
+        self.slidewalker = slidewalker
+        self.output_dir = output_dir
+        self.resolver = resolver
+        self.bibtex_path = bibtex_path
+        if config is None:
+            config = KeyValueParserConfig(record_delim="\n")
+        self.parser = KeyValueSplitParser(config=config)
+        self.parser.setKeydefs([Keydef(keyword, "literature", True)])
+        # one converter for all references
+        self.ln2t = LatexNodes2Text()
+        self.references: Dict[str, Reference] = {}
+
+    @classmethod
+    def get_doi(cls, text: str) -> Optional[str]:
+        """
+        get the DOI of the given reference key or doi field if it is one
+        """
+        match = cls.doi_regex.match(text.strip()) if text else None
+        return match.group(1) if match else None
+
+    def load_bibtex(self) -> Dict[str, dict]:
+        """
+        load my bibtex file
+
+        Returns:
+            Dict[str, dict]: the latex BibTexDicts by entry key
+        """
+        entries = {}
+        if self.bibtex_path:
+            with open(self.bibtex_path, encoding="utf-8") as bibfile:
+                bd = bibtexparser.load(bibfile)
+            entries = {entry["ID"]: entry for entry in bd.entries}
+        return entries
+
+    def collect(self) -> List[dict]:
+        """
+        collect the literature references of all slides
+
+        Returns:
+            List[dict]: the slide map rows with path, page, name and reference
+        """
+        slide_infos = []
+        notes_list = []
+        for ppt in self.slidewalker.yieldPowerPointFiles():
+            for slide in ppt.getSlides():
+                slide_infos.append((ppt.relpath, slide.page, slide.name))
+                notes_list.append(slide.getNotes())
+        table = self.parser.getKeyValuesBulk(notes_list)
+        rows = []
+        for (path, page, name), key_values in zip(slide_infos, table.rows):
+            literature = key_values.get("literature") if key_values else None
+            if isinstance(literature, str):
+                literature = [literature]
+            seen = set()
+            for reference in literature or []:
+                reference = reference.strip()
+                if reference and reference not in seen:
+                    seen.add(reference)
+                    rows.append(
+                        {
+                            "path": path,
+                            "page": page,
+                            "name": name,
+                            "reference": reference,
+                        }
+                    )
+        return rows
+
+    def load_references(self) -> Dict[str, Reference]:
+        """
+        load the reference table of a previous run
+        """
+        references = {}
+        path = os.path.join(self.output_dir, LiteraturePipeline.references_file)
+        if os.path.isfile(path):
+            with open(path, encoding="utf-8") as json_file:
+                for record in json.load(json_file):
+                    reference = Reference(**record)
+                    references[reference.key] = reference
+        return references
+
+    def resolve(self, keys: List[str]) -> List[Reference]:
+        """
+        resolve the given reference keys
+
+        Args:
+            keys(List[str]): the distinct reference keys
+
+        Returns:
+            List[Reference]: the references
+        """
+        entries = self.load_bibtex()
+        references = []
+        by_doi: Dict[str, List[Reference]] = {}
+        for key in keys:
+            reference = Reference(key)
+            entry = entries.get(key)
+            reference.doi = self.get_doi(entry.get("doi") if entry else key)
+            if reference.doi and self.resolver:
+                by_doi.setdefault(reference.doi, []).append(reference)
+            elif entry is not None:
+                self.set_meta(reference, entry)
+            references.append(reference)
+        if by_doi:
+            metas = self.resolver.resolve(list(by_doi), kind="bibtex")
+            for doi, doi_references in by_doi.items():
+                error = self.resolver.errors.get(doi)
+                # temporary failures are retried in the next run
+                failed = (
+                    error is not None
+                    and getattr(error, "code", None) not in DOICache.negative_statuses
+                )
+                for reference in doi_references:
+                    entry = entries.get(reference.key)
+                    if metas.get(doi):
+                        self.set_meta(reference, metas[doi])
+                    elif failed:
+                        reference.status = "failed"
+                        reference.error = str(error)
+                    elif entry is not None:
+                        self.set_meta(reference, entry)
+                    elif error is not None:
+                        reference.error = str(error)
+        return references
+
+    def set_meta(self, reference: Reference, entry: dict):
+        """
+        set the plain text version of the given latex BibTexDict as metadata
+        of the given reference
+        """
+        reference.meta = DOI.toPlainText(dict(entry), self.ln2t)
+        reference.status = "resolved"
+
+    def write(self, rows: List[dict]):
+        """
+        write my reference table and the given slide map
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, LiteraturePipeline.references_file)
+        records = [asdict(self.references[key]) for key in sorted(self.references)]
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump(records, json_file, indent=2, ensure_ascii=False)
+        path = os.path.join(self.output_dir, LiteraturePipeline.slide_map_file)
+        with open(path, "w", encoding="utf-8", newline="") as csv_file:
+            writer = csv.DictWriter(
+                csv_file,
+                fieldnames=LiteraturePipeline.slide_map_fields,
+                quoting=csv.QUOTE_NONNUMERIC,
+            )
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def run(self) -> dict:
+        """
+        run the pipeline
+
+        Returns:
+            dict: counts of slides with references, references, newly resolved
+                and failed references
+        """
+        rows = self.collect()
+        self.references = self.load_references()
+        keys = list(dict.fromkeys(row["reference"] for row in rows))
+        new_keys = [
+            key
+            for key in keys
+            if key not in self.references
+            or self.references[key].status != "resolved"
+        ]
+        for reference in self.resolve(new_keys):
+            self.references[reference.key] = reference
+        self.write(rows)
+        summary = {
+            "slides": len({(row["path"], row["page"]) for row in rows}),
+            "references": len(keys),
+            "new": len(new_keys),
+            "resolved": sum(
+                1 for key in keys if self.references[key].status == "resolved"
+            ),
+            "failed": sum(1 for key in keys if self.references[key].status == "failed"),
+        }
+        return summary
+
+
+def main(argv=None):
+    """
+    main routine
+    """
+    parser = argparse.ArgumentParser(
+        description="collect and resolve the literature references of the slide notes"
+    )
+    parser.add_argument("slides", help="the root folder of the presentations")
+    parser.add_argument(
+        "-o", "--output", default=".", help="output directory (default: %(default)s)"
+    )
+    parser.add_argument("--bibtex", help="bibtex file with entries by reference key")
+    parser.add_argument(
+        "--cache-dir",
+        default=DOICache.default_cache_dir(),
+        help="directory of the DOI cache (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--offline", action="store_true", help="only use the DOI cache for lookups"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="concurrent DOI lookups (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    cache = DOICache(args.cache_dir, offline=args.offline)
+    resolver = DOIResolver(workers=args.workers, cache=cache)
+    try:
+        pipeline = LiteraturePipeline(
+            SlideWalker(args.slides),
+            args.output,
+            resolver=resolver,
+            bibtex_path=args.bibtex,
+        )
+        summary = pipeline.run()
+    finally:
+        resolver.close()
+        cache.close()
+    print(json.dumps(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
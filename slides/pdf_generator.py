@@ -4,14 +4,23 @@ Created on 2025-05-18
 @author: wf
 """
 
+import hashlib
+import json
+import os
+import queue
+import shutil
+import signal
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 import ngwidgets.persistent_log as log
 from ngwidgets.persistent_log import Log
 from ngwidgets.progress import Progressbar
 from ngwidgets.shell import Shell
 from dataclasses import dataclass, field
+from slides.soffice_service import SofficeService
 
 @dataclass
 class FileSet:
@@ -43,24 +52,53 @@ class FileSet:
             if not path.name.startswith("~$"):
                 yield path
 
+
+@dataclass
+class PdfStats:
+    """
+    statistics of a PDF generation run
+    """
+
+    converted: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+    def summary(self) -> str:
+        """
+        get a one line summary of these statistics
+        """
+        text = f"PDFs: {self.converted} converted, {self.skipped} skipped, {self.failed} failed"
+        return text
+
+
 class PdfGenerator:
     """
     Generates PDF files from PowerPoint presentations using LibreOffice (soffice).
     """
 
-    def __init__(self, debug: bool = False):
+    backends = ["subprocess", "uno"]
+
+    def __init__(self, debug: bool = False, backend: str = "subprocess"):
         """
         Initialize PdfGenerator with optional debug mode.
 
         Args:
             debug (bool): Enable debug output if True.
+            backend (str): "subprocess" to launch soffice per file or
+                "uno" to use long-lived soffice instances via UNO
         """
         self.debug = debug
+        self.backend = backend
+        self.service = None
         self.log = Log()
         self.shell = Shell()
         self.ignores = ["Unknown property", "warn:"]
+        self.stats = PdfStats()
         self.check_soffice()
 
+    # sidecar file in the pdf directory recording the sources of the PDFs
+    manifest_name = "pdf_manifest.json"
+
     def check_soffice(self):
         """
         Check if LibreOffice 'soffice' is available on the system.
@@ -72,41 +110,422 @@ class PdfGenerator:
         else:
             self.log.log("✅", "soffice", f"Found soffice at {result.stdout.strip()}")
 
-    def generate_pdfs(self,
-        pptx_set:FileSet,
+    @classmethod
+    def default_profile_dir(cls) -> str:
+        """
+        get the default base directory for the per worker LibreOffice profiles
+        """
+        profile_dir = os.path.join(
+            os.path.expanduser("~"), ".cache", "pySemanticSlides", "soffice"
+        )
+        return profile_dir
+
+    def get_cmd(self, pptx_path: Path, pdf_path, profile_dir: str = None) -> str:
+        """
+        get the soffice command to convert the given presentation
+
+        Args:
+            pptx_path (Path): the presentation to convert
+            pdf_path (str | Path): Directory for output .pdf files.
+            profile_dir (str): optional separate LibreOffice user profile directory
+
+        Returns:
+            str: the command
+        """
+        env_option = ""
+        if profile_dir:
+            # concurrent soffice instances need separate user profiles
+            env_option = (
+                f' "-env:UserInstallation={Path(profile_dir).absolute().as_uri()}"'
+            )
+        cmd = f'soffice{env_option} --headless --invisible --convert-to pdf "{pptx_path}" --outdir "{pdf_path}"'
+        return cmd
+
+    def run_with_timeout(self, cmd: str, timeout: float) -> subprocess.CompletedProcess:
+        """
+        run the given command in its own process group killing the
+        whole group (soffice and soffice.bin) if it does not finish in time
+
+        Args:
+            cmd (str): the command to run
+            timeout (float): the timeout in seconds
+
+        Returns:
+            subprocess.CompletedProcess: the process result
+        """
+        profile = self.shell.profile
+        shell_cmd = f"source {profile} && exec {cmd}" if profile else f"exec {cmd}"
+        if self.debug:
+            print(f"Running: {shell_cmd}")
+        popen_process = subprocess.Popen(
+            [self.shell.shell_path, "-c", shell_cmd],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        try:
+            stdout, stderr = popen_process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            os.killpg(popen_process.pid, signal.SIGKILL)
+            stdout, stderr = popen_process.communicate()
+            stderr += f"\nError: killed after timeout of {timeout}s"
+        process = subprocess.CompletedProcess(
+            args=popen_process.args,
+            returncode=popen_process.returncode,
+            stdout=stdout,
+            stderr=stderr,
+        )
+        return process
+
+    def convert(
+        self, pptx_path: Path, pdf_path, profile_dir: str = None, timeout: float = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Convert a single presentation to PDF.
+
+        Args:
+            pptx_path (Path): the presentation to convert
+            pdf_path (str | Path): Directory for output .pdf files.
+            profile_dir (str): optional separate LibreOffice user profile directory
+            timeout (float): optional timeout in seconds after which soffice is killed
+
+        Returns:
+            subprocess.CompletedProcess: the process result
+        """
+        base_name = pptx_path.stem
+        msg = f"converting {base_name} to PDF"
+        if self.debug:
+            msg += f" in {pptx_path.parent}"
+        self.log.color_msg(log.BLUE, msg)
+        cmd = self.get_cmd(pptx_path, pdf_path, profile_dir)
+        if timeout is None:
+            result = self.shell.run(cmd, debug=self.debug, tee=False)
+        else:
+            result = self.run_with_timeout(cmd, timeout)
+        return result
+
+    def load_manifest(self, pdf_path) -> Dict[str, dict]:
+        """
+        load the manifest of the given PDF directory
+
+        Args:
+            pdf_path (str | Path): Directory of the .pdf files.
+
+        Returns:
+            Dict[str, dict]: source records keyed by PDF file name
+        """
+        manifest_path = Path(pdf_path) / PdfGenerator.manifest_name
+        manifest = {}
+        if manifest_path.exists():
+            try:
+                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            except ValueError:
+                # a broken manifest just means everything is checked by mtime
+                manifest = {}
+        return manifest
+
+    def save_manifest(self, pdf_path, manifest: Dict[str, dict]):
+        """
+        save the manifest of the given PDF directory atomically
+
+        Args:
+            pdf_path (str | Path): Directory of the .pdf files.
+            manifest (Dict[str, dict]): source records keyed by PDF file name
+        """
+        Path(pdf_path).mkdir(parents=True, exist_ok=True)
+        manifest_path = Path(pdf_path) / PdfGenerator.manifest_name
+        tmp_path = manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_path, manifest_path)
+
+    def get_source_record(self, pptx_path: Path, use_hash: bool = False) -> dict:
+        """
+        get the record identifying the current state of the given presentation
+
+        Args:
+            pptx_path (Path): the presentation
+            use_hash (bool): if True add a sha256 content hash
+
+        Returns:
+            dict: source path, size, mtime and optionally the hash
+        """
+        stat = pptx_path.stat()
+        record = {
+            "source": str(pptx_path.absolute()),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+        }
+        if use_hash:
+            sha = hashlib.sha256()
+            with open(pptx_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            record["sha256"] = sha.hexdigest()
+        return record
+
+    def is_up_to_date(
+        self,
+        pptx_path: Path,
+        pdf_path,
+        manifest: Dict[str, dict],
+        use_hash: bool = False,
+    ) -> bool:
+        """
+        check whether the PDF of the given presentation is up to date
+
+        Args:
+            pptx_path (Path): the presentation
+            pdf_path (str | Path): Directory of the .pdf files.
+            manifest (Dict[str, dict]): source records keyed by PDF file name
+            use_hash (bool): if True compare the recorded content hash
+
+        Returns:
+            bool: True if the PDF exists and was generated from the current presentation
+        """
+        pdf_file = Path(pdf_path) / f"{pptx_path.stem}.pdf"
+        if not pdf_file.exists():
+            return False
+        recorded = manifest.get(pdf_file.name)
+        if recorded is None or recorded.get("source") != str(pptx_path.absolute()):
+            # PDFs generated without a manifest - compare the modification times
+            up_to_date = (
+                recorded is None
+                and pdf_file.stat().st_mtime >= pptx_path.stat().st_mtime
+            )
+        elif use_hash and "sha256" in recorded:
+            source = self.get_source_record(pptx_path, use_hash=True)
+            up_to_date = source["sha256"] == recorded["sha256"]
+        else:
+            source = self.get_source_record(pptx_path)
+            up_to_date = (source["size"], source["mtime"]) == (
+                recorded["size"],
+                recorded["mtime"],
+            )
+        return up_to_date
+
+    def generate_pdfs(
+        self,
+        pptx_set: FileSet,
         pdf_path,
         with_stats: bool = False,
-        progress_bar: Optional[Progressbar] = None) -> Dict[Path, subprocess.CompletedProcess]:
+        progress_bar: Optional[Progressbar] = None,
+        max_workers: int = 1,
+        timeout: float = None,
+        profile_dir: str = None,
+        incremental: bool = False,
+        use_hash: bool = False,
+    ) -> Dict[Path, subprocess.CompletedProcess]:
         """
         Convert all .pptx files in pptx_set to PDFs using LibreOffice.
+        The converted, skipped and failed counts are available in self.stats afterwards.
 
         Args:
             pptx_set(FileSet): FileSet of .pptx files.
             pdf_path (str | Path): Directory for output .pdf files.
             with_stats (bool): If True, show summary of results.
             progress_bar (Progressbar | None): Optional progress bar instance to update
+            max_workers (int): number of concurrent soffice instances
+            timeout (float): optional timeout per file in seconds
+            profile_dir (str): base directory of the per worker profiles - default: default_profile_dir()
+            incremental (bool): If True, only convert presentations whose PDF is missing or outdated
+            use_hash (bool): If True, detect outdated PDFs by a content hash of the presentation
 
         Returns:
-            Dict[Path, subprocess.CompletedProcess]: Mapping from input files to process results.
+            Dict[Path, subprocess.CompletedProcess]: Mapping from converted input files to process results.
         """
         procs = {}
+        self.stats = PdfStats()
+        manifest = self.load_manifest(pdf_path)
+        pptx_paths = []
+        for pptx_path in pptx_set.paths:
+            if incremental and self.is_up_to_date(
+                pptx_path, pdf_path, manifest, use_hash
+            ):
+                self.stats.skipped += 1
+            else:
+                pptx_paths.append(pptx_path)
+        # remember the previous PDF state to detect failed conversions
+        pdf_mtimes = {}
+        for pptx_path in pptx_paths:
+            pdf_file = Path(pdf_path) / f"{pptx_path.stem}.pdf"
+            pdf_mtimes[pptx_path] = (
+                pdf_file.stat().st_mtime_ns if pdf_file.exists() else None
+            )
         if progress_bar:
-            progress_bar.total = pptx_set.total
+            progress_bar.total = len(pptx_paths)
             progress_bar.reset()
-        for pptx_path in pptx_set.paths:
-            base_name = pptx_path.stem
-            msg = f"converting {base_name} to PDF"
-            if self.debug:
-                msg += f" in {pptx_path.parent}"
-            self.log.color_msg(log.BLUE, msg)
-
-            cmd = f'soffice --headless --invisible --convert-to pdf "{pptx_path}" --outdir "{pdf_path}"'
-            result = self.shell.run(cmd, debug=self.debug, tee=False)
-            procs[pptx_path] = result
-            if progress_bar:
-                progress_bar.update(1)
+        service = (
+            self.get_service(max_workers, timeout, profile_dir) if pptx_paths else None
+        )
+        if service:
+            procs = self.convert_paths(
+                pptx_paths,
+                lambda pptx_path: service.convert(pptx_path, pdf_path),
+                progress_bar,
+                service.workers,
+            )
+        elif max_workers > 1:
+            procs = self.generate_pdfs_parallel(
+                pptx_paths, pdf_path, progress_bar, max_workers, timeout, profile_dir
+            )
+        else:
+            for pptx_path in pptx_paths:
+                result = self.convert(pptx_path, pdf_path, timeout=timeout)
+                procs[pptx_path] = result
+                if progress_bar:
+                    progress_bar.update(1)
+        for pptx_path in procs:
+            pdf_file = Path(pdf_path) / f"{pptx_path.stem}.pdf"
+            if (
+                pdf_file.exists()
+                and pdf_file.stat().st_mtime_ns != pdf_mtimes[pptx_path]
+            ):
+                self.stats.converted += 1
+                manifest[pdf_file.name] = self.get_source_record(pptx_path, use_hash)
+            else:
+                self.stats.failed += 1
+        if procs:
+            self.save_manifest(pdf_path, manifest)
 
         if with_stats:
             self.shell.proc_stats("PDF conversions", procs, ignores=self.ignores)
+            print(self.stats.summary())
+
+        return procs
+
+    def generate_pdfs_parallel(
+        self,
+        pptx_paths: List[Path],
+        pdf_path,
+        progress_bar: Optional[Progressbar],
+        max_workers: int,
+        timeout: float = None,
+        profile_dir: str = None,
+    ) -> Dict[Path, subprocess.CompletedProcess]:
+        """
+        Convert the given presentations with a pool of soffice workers
+        each using its own LibreOffice user profile.
+
+        Args:
+            pptx_paths (List[Path]): the presentations to convert
+            pdf_path (str | Path): Directory for output .pdf files.
+            progress_bar (Progressbar | None): Optional progress bar instance to update
+            max_workers (int): number of concurrent soffice instances
+            timeout (float): optional timeout per file in seconds
+            profile_dir (str): base directory of the per run worker profiles
+
+        Returns:
+            Dict[Path, subprocess.CompletedProcess]: Mapping from input files to process results in input order.
+        """
+        if profile_dir is None:
+            profile_dir = PdfGenerator.default_profile_dir()
+        os.makedirs(profile_dir, exist_ok=True)
+        # a separate directory per run - concurrent runs must not share a profile
+        run_dir = tempfile.mkdtemp(prefix="run", dir=profile_dir)
+        profiles = queue.Queue()
+        for worker in range(max_workers):
+            profiles.put(os.path.join(run_dir, f"worker{worker}"))
+
+        def convert_with_profile(pptx_path: Path) -> subprocess.CompletedProcess:
+            worker_profile = profiles.get()
+            try:
+                result = self.convert(pptx_path, pdf_path, worker_profile, timeout)
+            finally:
+                profiles.put(worker_profile)
+            return result
+
+        try:
+            procs = self.convert_paths(
+                pptx_paths, convert_with_profile, progress_bar, max_workers
+            )
+        finally:
+            shutil.rmtree(run_dir, ignore_errors=True)
+        return procs
+
+    def convert_paths(
+        self,
+        pptx_paths: List[Path],
+        convert: Callable[[Path], subprocess.CompletedProcess],
+        progress_bar: Optional[Progressbar],
+        max_workers: int,
+    ) -> Dict[Path, subprocess.CompletedProcess]:
+        """
+        Run the given conversion function for the given presentations in a thread pool.
+
+        Args:
+            pptx_paths (List[Path]): the presentations to convert
+            convert (Callable): the function converting a single presentation
+            progress_bar (Progressbar | None): Optional progress bar instance to update
+            max_workers (int): number of concurrent conversions
 
+        Returns:
+            Dict[Path, subprocess.CompletedProcess]: Mapping from input files to process results in input order.
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(convert, pptx_path): pptx_path
+                for pptx_path in pptx_paths
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if progress_bar:
+                    progress_bar.update(1)
+        procs = {pptx_path: results[pptx_path] for pptx_path in pptx_paths}
         return procs
+
+    def get_service(
+        self, max_workers: int, timeout: float = None, profile_dir: str = None
+    ) -> Optional[SofficeService]:
+        """
+        get the long-lived conversion service if the uno backend is configured
+        and available - starting it on first use
+
+        Args:
+            max_workers (int): number of soffice instances
+            timeout (float): optional timeout per file in seconds
+            profile_dir (str): base directory of the per instance profiles
+
+        Returns:
+            SofficeService: the running service or None to use the subprocess backend
+        """
+        if self.backend != "uno":
+            return None
+        if self.service is None or self.service.workers != max_workers:
+            self.close()
+            if not SofficeService.is_available():
+                self.log.log(
+                    "⚠️",
+                    "uno",
+                    "python uno bridge not available - using soffice subprocesses",
+                )
+                self.backend = "subprocess"
+                return None
+            service = SofficeService(
+                workers=max_workers,
+                profile_dir=profile_dir or PdfGenerator.default_profile_dir(),
+                timeout=timeout,
+            )
+            try:
+                service.start()
+            except Exception as ex:
+                service.stop()
+                self.log.log(
+                    "⚠️",
+                    "uno",
+                    f"conversion service failed to start: {ex} - using soffice subprocesses",
+                )
+                self.backend = "subprocess"
+                return None
+            self.service = service
+        self.service.timeout = timeout
+        return self.service
+
+    def close(self):
+        """
+        stop the conversion service if it is running
+        """
+        if self.service:
+            self.service.stop()
+            self.service = None
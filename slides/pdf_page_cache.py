@@ -0,0 +1,103 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Dict
+
+from slides.versioned_cache import VersionedCache
+
+
+class PdfPageCache(VersionedCache):
+    """
+    on disk cache of single page PDFs cut from presentation PDFs
+    with pdfseparate (poppler) on first use
+    """
+
+    def __init__(self, cache_dir: str, timeout: float = 60.0):
+        """
+        constructor
+
+        Args:
+            cache_dir(str): the directory of the single page PDF files
+            timeout(float): timeout per extraction in seconds
+        """
+        super().__init__(cache_dir)
+        self.timeout = timeout
+        # extraction locks by cache file
+        self.path_locks: Dict[str, threading.Lock] = {}
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        check whether pdfseparate is installed
+        """
+        return shutil.which("pdfseparate") is not None
+
+    def get_path(self, pdf_file: str, page: int) -> str:
+        """
+        get the cache file for the given page
+
+        Args:
+            pdf_file(str): the PDF file
+            page(int): the 1-based page in the PDF
+
+        Returns:
+            str: the path of the single page PDF - which might not be extracted yet
+        """
+        path = os.path.join(self.cache_dir, f"{self.get_version(pdf_file)}-{page}.pdf")
+        return path
+
+    def extract(self, pdf_file: str, page: int, path: str) -> str:
+        """
+        extract the given page to the given path
+
+        Args:
+            pdf_file(str): the PDF file
+            page(int): the 1-based page in the PDF
+            path(str): the target PDF file
+
+        Returns:
+            str: the path of the single page PDF
+        """
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as tmp:
+            pattern = os.path.join(tmp, "page-%d.pdf")
+            cmd = ["pdfseparate", "-f", str(page), "-l", str(page), pdf_file, pattern]
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=self.timeout
+            )
+            page_file = pattern % page
+            if result.returncode != 0 or not os.path.exists(page_file):
+                raise RuntimeError(
+                    f"pdfseparate failed for page {page} of {pdf_file}: {result.stderr.strip()}"
+                )
+            os.replace(page_file, path)
+        self.prune(self.get_version(pdf_file))
+        return path
+
+    def get(self, pdf_file: str, page: int) -> str:
+        """
+        get the single page PDF of the given page - extracting it if needed
+
+        Args:
+            pdf_file(str): the PDF file
+            page(int): the 1-based page in the PDF
+
+        Returns:
+            str: the path of the single page PDF
+        """
+        path = self.get_path(pdf_file, page)
+        with self.lock:
+            path_lock = self.path_locks.setdefault(path, threading.Lock())
+        with path_lock:
+            if not os.path.exists(path):
+                self.extract(pdf_file, page, path)
+        with self.lock:
+            self.path_locks.pop(path, None)
+        return path
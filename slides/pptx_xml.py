@@ -0,0 +1,408 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import posixpath
+import zipfile
+from typing import Dict, List, Optional
+
+from lxml import etree
+from pptx.oxml import parse_xml
+
+NS = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+    "ep": "http://schemas.openxmlformats.org/officeDocument/2006/extended-properties",
+}
+
+
+def qn(tag: str) -> str:
+    """
+    get the clark notation for the given prefixed tag e.g. p:sp
+    """
+    prefix, local = tag.split(":")
+    return f"{{{NS[prefix]}}}{local}"
+
+
+class PptxXmlExtractor:
+    """
+    extract slide records directly from the XML parts of a pptx file
+    without constructing python-pptx objects
+
+    the records have the same content as Slide.extractRecord
+    """
+
+    EMUS_PER_MM = 36000.0
+
+    # shape elements of a shape tree
+    shape_tags = {
+        qn("p:sp"),
+        qn("p:grpSp"),
+        qn("p:graphicFrame"),
+        qn("p:cxnSp"),
+        qn("p:pic"),
+        qn("p:contentPart"),
+    }
+
+    # placeholder type of a layout placeholder -> type of the master placeholder it inherits from
+    base_ph_type = {
+        "body": "body",
+        "chart": "body",
+        "clipArt": "body",
+        "ctrTitle": "title",
+        "dgm": "body",
+        "dt": "dt",
+        "ftr": "ftr",
+        "media": "body",
+        "obj": "body",
+        "pic": "body",
+        "sldNum": "sldNum",
+        "subTitle": "body",
+        "tbl": "body",
+        "title": "title",
+    }
+
+    def __init__(self, filepath: str):
+        """
+        constructor
+
+        Args:
+            filepath(str): the path of the pptx file
+        """
+        self.filepath = filepath
+        self.layouts = {}
+        self.masters = {}
+
+    def read_xml(self, zf: zipfile.ZipFile, partname: str):
+        """
+        read and parse the given part completely
+        """
+        with zf.open(partname) as f:
+            root = etree.parse(f).getroot()
+        return root
+
+    def get_rels(self, zf: zipfile.ZipFile, partname: str) -> Dict[str, tuple]:
+        """
+        get the relationships of the given part
+
+        Returns:
+            dict: rId -> (type, absolute target partname)
+        """
+        base, name = posixpath.split(partname)
+        rels_name = posixpath.join(base, "_rels", f"{name}.rels")
+        rels = {}
+        if rels_name in zf.namelist():
+            root = self.read_xml(zf, rels_name)
+            for rel in root.iter(qn("rel:Relationship")):
+                if rel.get("TargetMode") == "External":
+                    continue
+                target = rel.get("Target")
+                if target.startswith("/"):
+                    target = target[1:]
+                else:
+                    target = posixpath.normpath(posixpath.join(base, target))
+                rels[rel.get("Id")] = (rel.get("Type"), target)
+        return rels
+
+    def get_rel_target(self, rels: dict, rel_type: str) -> Optional[str]:
+        """
+        get the first target of the given relationship type (suffix)
+        """
+        for rtype, target in rels.values():
+            if rtype.endswith(f"/{rel_type}"):
+                return target
+        return None
+
+    @staticmethod
+    def get_ph(shape_elm):
+        """
+        get the placeholder element of the given shape element or None
+        """
+        nv_pr = shape_elm.find("*/" + qn("p:nvPr"))
+        ph = nv_pr.find(qn("p:ph")) if nv_pr is not None else None
+        return ph
+
+    @classmethod
+    def get_y(cls, shape_elm) -> Optional[int]:
+        """
+        get the directly applied y offset in EMU of the given shape element
+        """
+        if shape_elm.tag == qn("p:graphicFrame"):
+            path = "p:xfrm/a:off"
+        elif shape_elm.tag == qn("p:grpSp"):
+            path = "p:grpSpPr/a:xfrm/a:off"
+        else:
+            path = "p:spPr/a:xfrm/a:off"
+        off = shape_elm.find(path, NS)
+        y = None
+        if off is not None and off.get("y") is not None:
+            y = int(off.get("y"))
+        return y
+
+    def get_placeholders(self, root) -> List[tuple]:
+        """
+        get the (idx, type, y) tuples of the placeholders in the shape tree of the given part
+        """
+        placeholders = []
+        sp_tree = root.find("p:cSld/p:spTree", NS)
+        if sp_tree is not None:
+            for shape_elm in sp_tree:
+                if shape_elm.tag not in self.shape_tags:
+                    continue
+                ph = self.get_ph(shape_elm)
+                if ph is not None:
+                    placeholders.append(
+                        (
+                            int(ph.get("idx", "0")),
+                            ph.get("type", "obj"),
+                            self.get_y(shape_elm),
+                        )
+                    )
+        return placeholders
+
+    def get_master(self, zf: zipfile.ZipFile, partname: str) -> dict:
+        """
+        get the placeholder info of the given slide master
+        """
+        if partname not in self.masters:
+            root = self.read_xml(zf, partname)
+            self.masters[partname] = {"placeholders": self.get_placeholders(root)}
+        return self.masters[partname]
+
+    def get_layout(self, zf: zipfile.ZipFile, partname: str) -> dict:
+        """
+        get the name and placeholder info of the given slide layout
+        """
+        if partname not in self.layouts:
+            root = self.read_xml(zf, partname)
+            rels = self.get_rels(zf, partname)
+            master_part = self.get_rel_target(rels, "slideMaster")
+            self.layouts[partname] = {
+                "name": root.find("p:cSld", NS).get("name", ""),
+                "placeholders": self.get_placeholders(root),
+                "master": self.get_master(zf, master_part) if master_part else None,
+            }
+        return self.layouts[partname]
+
+    def get_inherited_y(self, layout: dict, idx: int) -> Optional[int]:
+        """
+        get the y offset a slide placeholder with the given idx inherits
+        from its layout placeholder (and that from its master placeholder)
+        """
+        y = None
+        for ph_idx, ph_type, ph_y in layout["placeholders"]:
+            if ph_idx == idx:
+                y = ph_y
+                if y is None and layout["master"]:
+                    master_type = self.base_ph_type.get(ph_type)
+                    for _idx, m_type, m_y in layout["master"]["placeholders"]:
+                        if m_type == master_type:
+                            y = m_y
+                            break
+                break
+        return y
+
+    @staticmethod
+    def get_paragraph_text(p) -> str:
+        """
+        get the text of the given a:p element with line breaks as vertical tabs
+        """
+        parts = []
+        for child in p:
+            if child.tag == qn("a:r") or child.tag == qn("a:fld"):
+                parts.append(child.findtext(qn("a:t")) or "")
+            elif child.tag == qn("a:br"):
+                parts.append("\v")
+        return "".join(parts)
+
+    @classmethod
+    def get_shape_text(cls, sp) -> str:
+        """
+        get the text of the text frame of the given p:sp element
+        """
+        tx_body = sp.find(qn("p:txBody"))
+        text = ""
+        if tx_body is not None:
+            text = "\n".join(
+                cls.get_paragraph_text(p) for p in tx_body.iterfind(qn("a:p"))
+            )
+        return text
+
+    @staticmethod
+    def get_runs(sp) -> List[str]:
+        """
+        get the visible run texts of the given p:sp element, excluding icon font runs
+        """
+        runs = []
+        tx_body = sp.find(qn("p:txBody"))
+        if tx_body is not None:
+            for p in tx_body.iterfind(qn("a:p")):
+                for r in p.iterfind(qn("a:r")):
+                    text = r.findtext(qn("a:t")) or ""
+                    if any("\ue000" <= c <= "\uf8ff" for c in text):
+                        continue  # skip icon glyphs
+                    runs.append(text)
+        return runs
+
+    def iter_top_shapes(self, f):
+        """
+        stream the top level shape elements of the slide part in the
+        given file - yielding (event, element) for the slide root, the common
+        slide data and each top level shape once it is completely parsed
+        """
+        sp_tree_tag = qn("p:spTree")
+        for event, elm in etree.iterparse(f, events=("start", "end")):
+            if event == "start":
+                if elm.tag in (qn("p:sld"), qn("p:notes"), qn("p:cSld")):
+                    yield event, elm
+            elif elm.tag in self.shape_tags:
+                parent = elm.getparent()
+                if parent is not None and parent.tag == sp_tree_tag:
+                    yield event, elm
+                    elm.clear()
+
+    def extract_slide(self, zf: zipfile.ZipFile, partname: str, page: int) -> dict:
+        """
+        extract the record for the given slide part
+
+        Args:
+            zf(ZipFile): the opened pptx file
+            partname(str): the slide part e.g. ppt/slides/slide1.xml
+            page(int): the 1-based page number
+
+        Returns:
+            dict: the slide record
+        """
+        rels = self.get_rels(zf, partname)
+        layout_part = self.get_rel_target(rels, "slideLayout")
+        layout = self.get_layout(zf, layout_part)
+        record = {
+            "page": page,
+            "name": "",
+            "title": None,
+            "layout": layout["name"],
+            "hidden": False,
+            "shapes": [],
+            "notes": "",
+        }
+        with zf.open(partname) as f:
+            for event, elm in self.iter_top_shapes(f):
+                if event == "start":
+                    if elm.tag == qn("p:sld"):
+                        record["hidden"] = elm.get("show") == "0"
+                    elif elm.tag == qn("p:cSld"):
+                        record["name"] = elm.get("name", "")
+                    continue
+                ph = self.get_ph(elm)
+                if (
+                    record["title"] is None
+                    and ph is not None
+                    and int(ph.get("idx", "0")) == 0
+                ):
+                    record["title"] = self.get_shape_text(elm)
+                if elm.tag != qn("p:sp"):
+                    continue
+                y = self.get_y(elm)
+                if y is None and ph is not None:
+                    y = self.get_inherited_y(layout, int(ph.get("idx", "0")))
+                y_mm = y / PptxXmlExtractor.EMUS_PER_MM if y is not None else 0
+                record["shapes"].append([y_mm, self.get_runs(elm)])
+        if record["title"] is None:
+            record["title"] = record["name"]
+        notes_part = self.get_rel_target(rels, "notesSlide")
+        if notes_part:
+            record["notes"] = self.extract_notes(zf, notes_part)
+        return record
+
+    def extract_notes(self, zf: zipfile.ZipFile, partname: str) -> str:
+        """
+        get the text of the first body placeholder of the given notes slide part
+        """
+        notes = ""
+        with zf.open(partname) as f:
+            for event, elm in self.iter_top_shapes(f):
+                if event == "start":
+                    continue
+                ph = self.get_ph(elm)
+                if ph is not None and ph.get("type", "obj") == "body":
+                    notes = self.get_shape_text(elm)
+                    break
+        return notes
+
+    def get_presentation_part(self, zf: zipfile.ZipFile) -> str:
+        """
+        get the partname of the main presentation part
+        """
+        package_rels = self.get_rels(zf, "")
+        prs_part = self.get_rel_target(package_rels, "officeDocument")
+        if prs_part is None:
+            prs_part = "ppt/presentation.xml"
+        return prs_part
+
+    def get_slide_parts(self, zf: zipfile.ZipFile) -> List[str]:
+        """
+        get the slide partnames in presentation order
+        """
+        prs_part = self.get_presentation_part(zf)
+        rels = self.get_rels(zf, prs_part)
+        root = self.read_xml(zf, prs_part)
+        slide_parts = []
+        for sld_id in root.iterfind("p:sldIdLst/p:sldId", NS):
+            rid = sld_id.get(qn("r:id"))
+            slide_parts.append(rels[rid][1])
+        return slide_parts
+
+    def extractSlideRecords(self) -> List[dict]:
+        """
+        extract the records of all slides including the hidden ones
+
+        Returns:
+            List[dict]: the slide records
+        """
+        records = []
+        with zipfile.ZipFile(self.filepath) as zf:
+            for page, partname in enumerate(self.get_slide_parts(zf), start=1):
+                records.append(self.extract_slide(zf, partname, page))
+        return records
+
+    def extractMetadata(self) -> Optional[dict]:
+        """
+        extract the metadata from the docProps/core.xml and docProps/app.xml
+        parts without parsing any slide
+
+        the slide count is taken from the slide list of the presentation part,
+        the hidden slide count from the app.xml properties if these are
+        consistent with it
+
+        Returns:
+            dict: title, author, created, slide_count and hidden_count
+            or None if there are no core properties
+        """
+        with zipfile.ZipFile(self.filepath) as zf:
+            package_rels = self.get_rels(zf, "")
+            core_part = self.get_rel_target(package_rels, "core-properties")
+            if core_part is None or core_part not in zf.namelist():
+                return None
+            # use the python-pptx core properties element for identical parsing
+            core = parse_xml(zf.read(core_part))
+            slide_count = len(self.get_slide_parts(zf))
+            hidden_count = None
+            app_part = self.get_rel_target(package_rels, "extended-properties")
+            if app_part and app_part in zf.namelist():
+                app = self.read_xml(zf, app_part)
+                app_slides = app.findtext("ep:Slides", namespaces=NS)
+                app_hidden = app.findtext("ep:HiddenSlides", namespaces=NS)
+                if app_slides and app_hidden and int(app_slides) == slide_count:
+                    hidden_count = int(app_hidden)
+        meta = {
+            "title": core.title_text,
+            "author": core.author_text,
+            "created": core.created_datetime,
+            "slide_count": slide_count,
+            "hidden_count": hidden_count,
+        }
+        return meta
@@ -6,12 +6,27 @@ Created on 2025-05-16
 
 import os
 
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+
 from ngwidgets.input_webserver import InputWebserver, InputWebSolution, WebserverConfig
 from ngwidgets.task_runner import TaskRunner
 from nicegui import app, Client, ui
-from slides.slide_viewer import PresentationsViewer, SlideDetailViewer, SlidesViewer
+from slides.pdf_generator import PdfGenerator
+from slides.pdf_page_cache import PdfPageCache
+from slides.slide_cache import SlideCache
+from slides.slide_watcher import SlideWatcher
+from slides.slide_viewer import (
+    PDF,
+    PresentationsViewer,
+    SearchViewer,
+    SlideDetailViewer,
+    SlidesViewer,
+)
 from slides.slidewalker import PPTSet, SlideWalker
+from slides.thumbnail_cache import ThumbnailCache
 from slides.version import Version
+from slides.web_metrics import WebMetrics
 from typing import List
 
 class SlideBrowserWebserver(InputWebserver):
@@ -38,16 +53,36 @@ class SlideBrowserWebserver(InputWebserver):
         constructor
         """
         super().__init__(config=SlideBrowserWebserver.get_config())
+        self.metrics = WebMetrics()
+        metrics = self.metrics
 
         @ui.page("/presentations")
+        @metrics.instrument("/presentations")
         async def presentations(client: Client):
             return await self.page(client, SlideBrowser.show_presentations)
 
+        @app.get("/thumbnail/{size}/{presentation_path:path}/{pdf_page}")
+        @metrics.instrument("/thumbnail/{size}/{presentation_path:path}/{pdf_page}")
+        def thumbnail(size: str, presentation_path: str, pdf_page: int):
+            return self.get_thumbnail_response(size, presentation_path, pdf_page)
+
+        @app.get("/pdf/{presentation_path:path}/{pdf_page}")
+        @metrics.instrument("/pdf/{presentation_path:path}/{pdf_page}")
+        def pdf_page(presentation_path: str, pdf_page: int):
+            return self.get_pdf_page_response(presentation_path, pdf_page)
+
+        @ui.page("/search")
+        @metrics.instrument("/search")
+        async def search(client: Client, q: str = ""):
+            return await self.page(client, SlideBrowser.show_search, q)
+
         @ui.page("/slides/{presentation_paths:path}")
+        @metrics.instrument("/slides/{presentation_paths:path}")
         async def slides(presentation_paths: str, client: Client):
             return await self.page(client, SlideBrowser.show_slides, presentation_paths)
 
         @ui.page("/slide/{presentation_path:path}/{slide_index}")
+        @metrics.instrument("/slide/{presentation_path:path}/{slide_index}")
         async def slide_detail(
             presentation_path: str, slide_index: int, client: Client
         ):
@@ -55,6 +90,78 @@ class SlideBrowserWebserver(InputWebserver):
                 client, SlideBrowser.show_slide, presentation_path, slide_index
             )
 
+        @app.get("/metrics")
+        def metrics_endpoint():
+            return PlainTextResponse(
+                metrics.render(), media_type="text/plain; version=0.0.4"
+            )
+
+    def get_thumbnail_response(
+        self, size: str, presentation_path: str, pdf_page: int
+    ) -> FileResponse:
+        """
+        get the thumbnail of the given PDF page - rendering it on first use
+
+        Args:
+            size: small, medium or large
+            presentation_path: the relative path of the presentation
+            pdf_page: the 1-based page in the PDF
+
+        Returns:
+            FileResponse: the PNG file
+        """
+        ppt = self.ppt_set.get_ppt(presentation_path, relative=True)
+        if not self.thumbnails or not ppt or size not in ThumbnailCache.sizes:
+            raise HTTPException(status_code=404)
+        pdf = PDF(self, ppt)
+        if not pdf.valid:
+            raise HTTPException(status_code=404)
+        try:
+            path = self.thumbnails.get(pdf.pdf_file, pdf_page, size)
+        except Exception as ex:
+            raise HTTPException(status_code=404, detail=str(ex))
+        # the urls are versioned by the path, size and modification time of the PDF
+        headers = {"Cache-Control": "public, max-age=31536000, immutable"}
+        return FileResponse(path, media_type="image/png", headers=headers)
+
+    def get_pdf_page_response(
+        self, presentation_path: str, pdf_page: int
+    ) -> FileResponse:
+        """
+        get a single page of the PDF of the given presentation - extracting it on first use
+
+        Args:
+            presentation_path: the relative path of the presentation
+            pdf_page: the 1-based page in the PDF
+
+        Returns:
+            FileResponse: the single page PDF file
+        """
+        ppt = self.ppt_set.get_ppt(presentation_path, relative=True)
+        if not self.page_pdfs or not ppt:
+            raise HTTPException(status_code=404)
+        pdf = PDF(self, ppt)
+        if not pdf.valid:
+            raise HTTPException(status_code=404)
+        try:
+            path = self.page_pdfs.get(pdf.pdf_file, pdf_page)
+        except Exception as ex:
+            raise HTTPException(status_code=404, detail=str(ex))
+        # the urls are versioned by the state of the PDF
+        headers = {"Cache-Control": "public, max-age=31536000, immutable"}
+        return FileResponse(path, media_type="application/pdf", headers=headers)
+
+    def get_pdf_generator(self, debug: bool = False) -> PdfGenerator:
+        """
+        get the PDF generator shared by all clients
+        so that a conversion service stays alive between exports
+        """
+        if self.pdf_generator is None:
+            self.pdf_generator = PdfGenerator(
+                debug=debug, backend=self.args.pdf_backend
+            )
+        return self.pdf_generator
+
     def configure_run(self):
         """
         configure me before run
@@ -64,9 +171,31 @@ class SlideBrowserWebserver(InputWebserver):
         self.allowed_urls = [
             self.root_path,
         ]
-        self.slidewalker = SlideWalker(self.root_path)
+        self.cache = None
+        self.pdf_generator = None
+        if not self.args.no_cache:
+            self.cache = SlideCache(
+                self.args.cache_dir, rebuild=self.args.rebuild_cache
+            )
+        self.slidewalker = SlideWalker(
+            self.root_path, cache=self.cache, metadata_only=True
+        )
         self.ppt_set = PPTSet(self.slidewalker)
+        self.watcher = None
+        if self.args.watch:
+            # snapshot the files before loading to catch changes during the load
+            self.watcher = SlideWatcher(
+                self.ppt_set,
+                interval=self.args.watch_interval,
+                use_polling=self.args.watch_polling,
+                debug=self.args.debug,
+            )
+        # metadata only - the search index is built on the first search
         self.ppt_set.load(with_progress=True)
+        if self.cache:
+            print(self.cache.stats.summary())
+        if self.watcher:
+            self.watcher.start()
         # PDF path
         self.pdf_path = os.path.abspath(self.args.pdf_path) if self.args.pdf_path else None
         # Serve static PDF files if --pdf_path was given
@@ -75,6 +204,54 @@ class SlideBrowserWebserver(InputWebserver):
                 app.add_static_files("/static/pdf", self.pdf_path)
             else:
                 self.pdf_path=None
+        self.page_pdfs = None
+        if self.pdf_path and PdfPageCache.is_available():
+            self.page_pdfs = PdfPageCache(os.path.join(self.args.cache_dir, "pdf_pages"))
+        self.thumbnails = None
+        if self.pdf_path and ThumbnailCache.is_available():
+            self.thumbnails = ThumbnailCache(
+                os.path.join(self.args.cache_dir, "thumbnails")
+            )
+        self.add_metric_gauges()
+
+    def add_metric_gauges(self):
+        """
+        add the gauges for the loaded presentations and caches to my metrics
+        """
+
+        def get_slide_count() -> int:
+            ppts = list(self.ppt_set.ppts_by_path.values())
+            # only count opened presentations - a scrape should not parse files
+            return sum(ppt.getSlideCount() for ppt in ppts if ppt.opened)
+
+        metrics = self.metrics
+        metrics.add_gauge(
+            "decks",
+            "number of loaded presentations",
+            lambda: len(self.ppt_set.ppts_by_path),
+        )
+        metrics.add_gauge(
+            "slides", "number of slides of the loaded presentations", get_slide_count
+        )
+        if self.cache:
+            stats = self.cache.stats
+            metrics.add_gauge(
+                "slide_cache_lookups",
+                "slide cache lookups by result",
+                lambda: {"hit": stats.hits, "miss": stats.misses},
+                label="result",
+            )
+            metrics.add_gauge(
+                "slide_cache_hit_ratio",
+                "ratio of slide cache hits to lookups",
+                lambda: stats.hits / max(stats.hits + stats.misses, 1),
+            )
+        if self.thumbnails:
+            metrics.add_gauge(
+                "thumbnails_pending",
+                "thumbnail renderings in progress",
+                lambda: len(self.thumbnails.pending),
+            )
 
 
 class SlideBrowser(InputWebSolution):
@@ -85,7 +262,11 @@ class SlideBrowser(InputWebSolution):
     def __init__(self, webserver: SlideBrowserWebserver, client: Client):
         super().__init__(webserver, client)
         self.pdf_path=webserver.pdf_path
-        pass
+        self.watcher=webserver.watcher
+        self.thumbnails=webserver.thumbnails
+        self.page_pdfs=webserver.page_pdfs
+        self.pdf_workers=webserver.args.pdf_workers
+        self.pdf_timeout=webserver.args.pdf_timeout
 
     def prepare_ui(self):
         anchor_style = r"a:link, a:visited {color: inherit !important; text-decoration: none; font-weight: 500}"
@@ -148,6 +329,29 @@ class SlideBrowser(InputWebSolution):
         await self.setup_content_div(show)
         TaskRunner().run_async(render_task)
 
+    async def show_search(self, query: str):
+        """
+        Display the slides matching the given full text query.
+
+        Args:
+            query: the query
+        """
+        self.search_viewer = None
+        self.grid_row = None
+
+        async def render_task():
+            await self.search_viewer.load_and_render(self.grid_row)
+
+        def show():
+            try:
+                self.grid_row = ui.row()
+                self.search_viewer = SearchViewer(solution=self, query=query)
+            except Exception as ex:
+                self.handle_exception(ex)
+
+        await self.setup_content_div(show)
+        TaskRunner().run_async(render_task)
+
     def show_presentations(self):
         """
         Display the presentations viewer.
@@ -9,7 +9,9 @@ from argparse import ArgumentParser
 
 from ngwidgets.cmd import WebserverCmd
 
+from slides.pdf_generator import PdfGenerator
 from slides.slide_browser import SlideBrowserWebserver
+from slides.slide_cache import SlideCache
 
 
 class SlideBrowserCmd(WebserverCmd):
@@ -35,6 +37,57 @@ class SlideBrowserCmd(WebserverCmd):
             help="optional path for PDF export and image display from such PDFs",
             default=None,
         )
+        parser.add_argument(
+            "--pdf_workers",
+            type=int,
+            default=1,
+            help="number of concurrent soffice instances for the PDF export (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--pdf_timeout",
+            type=float,
+            default=None,
+            help="timeout in seconds per PDF conversion (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--pdf_backend",
+            choices=PdfGenerator.backends,
+            default="subprocess",
+            help="launch soffice per file or keep soffice instances running via uno (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--cache_dir",
+            help="directory of the persistent extraction cache (default: %(default)s)",
+            default=SlideCache.default_cache_dir(),
+        )
+        parser.add_argument(
+            "--no-cache",
+            dest="no_cache",
+            action="store_true",
+            help="do not use the persistent extraction cache",
+        )
+        parser.add_argument(
+            "--rebuild-cache",
+            dest="rebuild_cache",
+            action="store_true",
+            help="discard and rebuild the persistent extraction cache",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="watch slide_path and refresh added, changed and removed presentations",
+        )
+        parser.add_argument(
+            "--watch_polling",
+            action="store_true",
+            help="poll for changes instead of using filesystem notifications",
+        )
+        parser.add_argument(
+            "--watch_interval",
+            type=float,
+            default=2.0,
+            help="polling interval in seconds (default: %(default)s)",
+        )
         parser.add_argument(
             "slide_path",
             help="path to PowerPoint files (required)",
@@ -0,0 +1,307 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+
+@dataclass
+class CacheStats:
+    """
+    statistics of a SlideCache
+    """
+
+    hits: int = 0
+    misses: int = 0
+    # bytes of presentation files served from the cache
+    bytes_hit: int = 0
+    # bytes of presentation files that had to be parsed
+    bytes_parsed: int = 0
+
+    def summary(self) -> str:
+        """
+        get a one line summary of these statistics
+        """
+        total = self.hits + self.misses
+        rate = self.hits / total * 100 if total else 0.0
+        text = (
+            f"cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate), "
+            f"{self.bytes_hit} bytes from cache, {self.bytes_parsed} bytes parsed"
+        )
+        return text
+
+
+@dataclass
+class Fingerprint:
+    """
+    fingerprint of a presentation file
+    """
+
+    size: int
+    mtime: float
+    hash: Optional[str] = None
+
+
+class SlideCache:
+    """
+    persistent SQLite cache for the metadata and slide content
+    extracted from PowerPoint presentations
+
+    presentations are keyed by absolute path and validated by
+    size, modification time and optionally a content hash
+    """
+
+    schema_version = 2
+    db_name = "slides_cache.db"
+
+    def __init__(self, cache_dir: str, use_hash: bool = False, rebuild: bool = False):
+        """
+        constructor
+
+        Args:
+            cache_dir(str): the directory to keep the cache database in
+            use_hash(bool): if True validate entries by a sha256 content hash
+            rebuild(bool): if True discard all cached entries
+        """
+        self.cache_dir = cache_dir
+        self.use_hash = use_hash
+        os.makedirs(cache_dir, exist_ok=True)
+        self.db_path = os.path.join(cache_dir, SlideCache.db_name)
+        self.stats = CacheStats()
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.create_schema(rebuild)
+
+    @classmethod
+    def default_cache_dir(cls) -> str:
+        """
+        get the default cache directory
+        """
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "pySemanticSlides")
+        return cache_dir
+
+    def create_schema(self, rebuild: bool = False):
+        """
+        create my database schema - dropping outdated or unwanted content
+
+        Args:
+            rebuild(bool): if True drop all existing content
+        """
+        with self.lock, self.conn:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if rebuild or version != SlideCache.schema_version:
+                self.conn.execute("DROP TABLE IF EXISTS slide")
+                self.conn.execute("DROP TABLE IF EXISTS deck")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS deck (
+                path TEXT PRIMARY KEY,
+                size INTEGER,
+                mtime REAL,
+                hash TEXT,
+                title TEXT,
+                author TEXT,
+                created TEXT,
+                error TEXT,
+                slide_count INTEGER,
+                hidden_count INTEGER
+                )""")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS slide (
+                path TEXT,
+                page INTEGER,
+                name TEXT,
+                title TEXT,
+                layout TEXT,
+                hidden INTEGER,
+                shapes TEXT,
+                notes TEXT,
+                PRIMARY KEY (path, page)
+                )""")
+            self.conn.execute(f"PRAGMA user_version={SlideCache.schema_version}")
+
+    def close(self):
+        """
+        close my database connection
+        """
+        with self.lock:
+            self.conn.close()
+
+    def fingerprint(self, filepath: str) -> Fingerprint:
+        """
+        get the fingerprint of the given file
+
+        Args:
+            filepath(str): the path of the file
+
+        Returns:
+            Fingerprint: size, mtime and (if configured) content hash
+        """
+        stat = os.stat(filepath)
+        fp = Fingerprint(size=stat.st_size, mtime=stat.st_mtime)
+        if self.use_hash:
+            sha = hashlib.sha256()
+            with open(filepath, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    sha.update(chunk)
+            fp.hash = sha.hexdigest()
+        return fp
+
+    def get_deck(self, filepath: str) -> Optional[dict]:
+        """
+        get the cached metadata for the given presentation
+        if the cache entry is still valid - counting hits and misses
+
+        Args:
+            filepath(str): the path of the presentation
+
+        Returns:
+            dict: the metadata record or None on a cache miss
+        """
+        filepath = os.path.abspath(filepath)
+        fp = self.fingerprint(filepath)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT size,mtime,hash,title,author,created,error,slide_count,hidden_count "
+                "FROM deck WHERE path=?",
+                (filepath,),
+            ).fetchone()
+        record = None
+        if row:
+            (
+                size,
+                mtime,
+                fhash,
+                title,
+                author,
+                created,
+                error,
+                slide_count,
+                hidden_count,
+            ) = row
+            if self.use_hash and fhash is not None:
+                valid = fhash == fp.hash
+                if valid and (size != fp.size or mtime != fp.mtime):
+                    # e.g. a touched file - remember the new fingerprint
+                    with self.lock, self.conn:
+                        self.conn.execute(
+                            "UPDATE deck SET size=?,mtime=? WHERE path=?",
+                            (fp.size, fp.mtime, filepath),
+                        )
+            else:
+                valid = size == fp.size and mtime == fp.mtime
+            if valid:
+                record = {
+                    "title": title,
+                    "author": author,
+                    "created": datetime.fromisoformat(created) if created else None,
+                    "error": error,
+                    "slide_count": slide_count,
+                    "hidden_count": hidden_count,
+                }
+        if record:
+            self.stats.hits += 1
+            self.stats.bytes_hit += fp.size
+        else:
+            self.stats.misses += 1
+            self.stats.bytes_parsed += fp.size
+        return record
+
+    def get_slide_records(self, filepath: str) -> List[dict]:
+        """
+        get the cached slide records of the given presentation
+
+        Args:
+            filepath(str): the path of the presentation
+
+        Returns:
+            List[dict]: the slide records ordered by page
+        """
+        filepath = os.path.abspath(filepath)
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT page,name,title,layout,hidden,shapes,notes "
+                "FROM slide WHERE path=? ORDER BY page",
+                (filepath,),
+            ).fetchall()
+        records = []
+        for page, name, title, layout, hidden, shapes, notes in rows:
+            record = {
+                "page": page,
+                "name": name,
+                "title": title,
+                "layout": layout,
+                "hidden": bool(hidden),
+                "shapes": json.loads(shapes),
+                "notes": notes,
+            }
+            records.append(record)
+        return records
+
+    def put_deck(self, filepath: str, deck_record: dict, slide_records: List[dict]):
+        """
+        store the given presentation metadata and slide records
+
+        Args:
+            filepath(str): the path of the presentation
+            deck_record(dict): title, author, created and error of the presentation
+            slide_records(List[dict]): the extracted slide records
+        """
+        filepath = os.path.abspath(filepath)
+        fp = self.fingerprint(filepath)
+        created = deck_record.get("created")
+        if isinstance(created, datetime):
+            created = created.isoformat()
+        error = deck_record.get("error")
+        hidden_count = sum(1 for record in slide_records if record["hidden"])
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM slide WHERE path=?", (filepath,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO deck VALUES (?,?,?,?,?,?,?,?,?,?)",
+                (
+                    filepath,
+                    fp.size,
+                    fp.mtime,
+                    fp.hash,
+                    deck_record.get("title"),
+                    deck_record.get("author"),
+                    created,
+                    str(error) if error else None,
+                    len(slide_records),
+                    hidden_count,
+                ),
+            )
+            self.conn.executemany(
+                "INSERT INTO slide VALUES (?,?,?,?,?,?,?,?)",
+                [
+                    (
+                        filepath,
+                        record["page"],
+                        record["name"],
+                        record["title"],
+                        record["layout"],
+                        int(record["hidden"]),
+                        json.dumps(record["shapes"], ensure_ascii=False),
+                        record["notes"],
+                    )
+                    for record in slide_records
+                ],
+            )
+
+    def remove_deck(self, filepath: str):
+        """
+        remove the given presentation from the cache
+
+        Args:
+            filepath(str): the path of the presentation
+        """
+        filepath = os.path.abspath(filepath)
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM slide WHERE path=?", (filepath,))
+            self.conn.execute("DELETE FROM deck WHERE path=?", (filepath,))
@@ -0,0 +1,204 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Set, Tuple
+
+
+@dataclass
+class SearchHit:
+    """
+    a slide found by a SlideIndex search
+    """
+
+    path: str
+    page: int
+    score: float
+
+
+class SlideIndex:
+    """
+    inverted index over the titles, texts and notes of slides
+    supporting prefix matching and ranked results
+
+    presentations are added one at a time so that the index
+    can be built incrementally while a PPTSet loads
+    """
+
+    # weight of a token occurrence per field
+    field_weights = {"title": 3.0, "text": 1.0, "notes": 0.5}
+    # bonus factor for tokens matching the query term exactly
+    exact_bonus = 2.0
+    token_pattern = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self):
+        """
+        constructor
+        """
+        self.lock = threading.RLock()
+        # token -> doc id -> weight
+        self.postings: Dict[str, Dict[int, float]] = {}
+        # doc id -> (path, page)
+        self.docs: Dict[int, Tuple[str, int]] = {}
+        # doc id -> tokens of the doc for removal
+        self.doc_tokens: Dict[int, Set[str]] = {}
+        # path -> doc ids of the presentation
+        self.docs_by_path: Dict[str, List[int]] = {}
+        self.next_doc_id = 0
+        # sorted vocabulary for prefix lookups - rebuilt lazily
+        self.vocabulary: List[str] = []
+        self.vocabulary_dirty = False
+
+    @classmethod
+    def tokenize(cls, text: str) -> List[str]:
+        """
+        split the given text into lower case word tokens
+
+        Args:
+            text(str): the text to tokenize
+
+        Returns:
+            List[str]: the tokens
+        """
+        tokens = cls.token_pattern.findall(text.lower()) if text else []
+        return tokens
+
+    def add_slide(self, path: str, page: int, title: str, text: str, notes: str):
+        """
+        add a single slide to the index
+
+        Args:
+            path(str): the path of the presentation
+            page(int): the page of the slide
+            title(str): the slide title
+            text(str): the slide text
+            notes(str): the slide notes
+        """
+        weights: Dict[str, float] = {}
+        for field, value in (("title", title), ("text", text), ("notes", notes)):
+            field_weight = SlideIndex.field_weights[field]
+            for token in SlideIndex.tokenize(value):
+                weights[token] = weights.get(token, 0.0) + field_weight
+        with self.lock:
+            doc_id = self.next_doc_id
+            self.next_doc_id += 1
+            self.docs[doc_id] = (path, page)
+            self.doc_tokens[doc_id] = set(weights)
+            self.docs_by_path.setdefault(path, []).append(doc_id)
+            for token, weight in weights.items():
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = {}
+                    self.postings[token] = posting
+                    self.vocabulary_dirty = True
+                posting[doc_id] = weight
+
+    def add_ppt(self, ppt):
+        """
+        (re)index all slides of the given presentation
+
+        Args:
+            ppt(PPT): the presentation to index
+        """
+        self.remove_path(ppt.filepath)
+        for slide in ppt.getSlides():
+            text = "\n".join(slide.getText())
+            self.add_slide(
+                ppt.filepath, slide.page, slide.title, text, slide.getNotes()
+            )
+
+    def remove_path(self, path: str):
+        """
+        remove all slides of the presentation with the given path
+
+        Args:
+            path(str): the path of the presentation
+        """
+        with self.lock:
+            for doc_id in self.docs_by_path.pop(path, []):
+                for token in self.doc_tokens.pop(doc_id):
+                    posting = self.postings[token]
+                    del posting[doc_id]
+                    if not posting:
+                        del self.postings[token]
+                        self.vocabulary_dirty = True
+                del self.docs[doc_id]
+
+    def get_vocabulary(self) -> List[str]:
+        """
+        get the sorted vocabulary - rebuilding it if tokens have been added or removed
+        """
+        with self.lock:
+            if self.vocabulary_dirty:
+                self.vocabulary = sorted(self.postings)
+                self.vocabulary_dirty = False
+            return self.vocabulary
+
+    def match_term(self, term: str) -> Dict[int, float]:
+        """
+        get the scores of the docs matching the given query term as a prefix
+
+        Args:
+            term(str): the lower case query term
+
+        Returns:
+            Dict[int, float]: doc id -> score
+        """
+        scores: Dict[int, float] = {}
+        vocabulary = self.get_vocabulary()
+        i = bisect_left(vocabulary, term)
+        while i < len(vocabulary) and vocabulary[i].startswith(term):
+            token = vocabulary[i]
+            factor = SlideIndex.exact_bonus if token == term else 1.0
+            for doc_id, weight in self.postings[token].items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * factor
+            i += 1
+        return scores
+
+    def search(self, query: str, limit: int = None) -> List[SearchHit]:
+        """
+        search the slides matching all terms of the given query
+
+        Args:
+            query(str): the query - each term is matched as a token prefix
+            limit(int): the maximum number of hits - default: all
+
+        Returns:
+            List[SearchHit]: the hits ordered by descending score
+        """
+        terms = SlideIndex.tokenize(query)
+        hits = []
+        if terms:
+            with self.lock:
+                scores = None
+                for term in terms:
+                    term_scores = self.match_term(term)
+                    if scores is None:
+                        scores = term_scores
+                    else:
+                        scores = {
+                            doc_id: score + term_scores[doc_id]
+                            for doc_id, score in scores.items()
+                            if doc_id in term_scores
+                        }
+                    if not scores:
+                        break
+                for doc_id, score in scores.items():
+                    path, page = self.docs[doc_id]
+                    hits.append(SearchHit(path=path, page=page, score=score))
+            hits.sort(key=lambda hit: (-hit.score, hit.path, hit.page))
+            if limit is not None:
+                hits = hits[:limit]
+        return hits
+
+    def __len__(self) -> int:
+        """
+        the number of indexed slides
+        """
+        return len(self.docs)
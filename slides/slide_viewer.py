@@ -3,16 +3,18 @@ Created on 2025-05-16
 
 @author: wf
 """
+import asyncio
 from collections import OrderedDict
 import os
 from typing import List
+from urllib.parse import quote
 
 from ngwidgets.input_webserver import InputWebSolution
 from ngwidgets.lod_grid import GridConfig, ListOfDictsGrid
 from ngwidgets.progress import NiceguiProgressbar
 from ngwidgets.widgets import Link
 from nicegui import ui
-from slides.pdf_generator import PdfGenerator, FileSet
+from slides.pdf_generator import FileSet
 from slides.slidewalker import PPT, Slide
 from ngwidgets.task_runner import TaskRunner
 
@@ -21,7 +23,7 @@ class PageNavigator:
     Simple page navigator with URL generation callback
     """
 
-    def __init__(self, current_page: int, total_pages: int, url_for_page):
+    def __init__(self, current_page: int, total_pages: int, url_for_page, prefetch_url_for_page=None):
         """
         Initialize the page navigator
 
@@ -29,10 +31,12 @@ class PageNavigator:
             current_page: Current page number (1-based)
             total_pages: Total number of pages
             url_for_page: Callback function that returns URL for a given page number
+            prefetch_url_for_page: optional callback returning the URL of a resource to prefetch for a page
         """
         self.current_page = current_page
         self.total_pages = total_pages
         self.url_for_page = url_for_page
+        self.prefetch_url_for_page = prefetch_url_for_page
 
     def generate_markup(self) -> str:
         """Generate HTML markup for page navigation"""
@@ -53,6 +57,13 @@ class PageNavigator:
         markup += get_link(min(self.total_pages, self.current_page + 10), "⏩", "Fast Forward (Jump +10 Pages)")
         markup += get_link(self.total_pages, "⏭", f"Last Page ({self.total_pages}/{self.total_pages})")
         markup += "</div>"
+        if self.prefetch_url_for_page:
+            # let the browser fetch the neighbouring pages ahead
+            for page in (self.current_page - 1, self.current_page + 1):
+                if 1 <= page <= self.total_pages:
+                    prefetch_url = self.prefetch_url_for_page(page)
+                    if prefetch_url:
+                        markup += f'<link rel="prefetch" href="{prefetch_url}">'
         return markup
 
     def render(self):
@@ -75,9 +86,42 @@ class PDF:
             self.valid=False
 
     def get_url(self,page:int=None):
+        """
+        get the url of the PDF or of a single page of it
+
+        Args:
+            page: the optional 1-based page in the PDF
+
+        Returns:
+            the url or None if there is no PDF
+        """
         url=f"/static/pdf/{self.pdf_name}" if self.valid else None
         if url and page:
-            url=f"{url}#page={page}"
+            page_pdfs = getattr(self.solution, "page_pdfs", None)
+            if page_pdfs:
+                # only the single page instead of the whole document
+                version = page_pdfs.get_version(self.pdf_file)
+                url = f"/pdf/{self.ppt.relpath}/{page}?v={version}"
+            else:
+                url=f"{url}#page={page}"
+        return url
+
+    def get_thumbnail_url(self, page: int, size: str = "small") -> str:
+        """
+        get the url of the thumbnail of the given PDF page
+
+        Args:
+            page: the 1-based page in the PDF
+            size: small, medium or large
+
+        Returns:
+            the url - versioned by the PDF file state - or None if thumbnails are not available
+        """
+        thumbnails = getattr(self.solution, "thumbnails", None)
+        url = None
+        if self.valid and thumbnails:
+            version = thumbnails.get_version(self.pdf_file)
+            url = f"/thumbnail/{size}/{self.ppt.relpath}/{page}?v={version}"
         return url
 
     def get_link(self,page:int=None):
@@ -152,21 +196,38 @@ class GridView(View):
         )
         ui.button("Search", on_click=self.on_search_click)
 
+    def get_search_keys(self, search_text: str) -> List:
+        """
+        get the keys of the rows matching the given search text
+        by a substring scan of the search columns
+
+        Args:
+            search_text: the text to search for
+
+        Returns:
+            the list of matching key values
+        """
+        search_lower = search_text.lower()
+        matched_keys = []
+        columns = (
+            self.search_cols or list(self.view_lod[0].keys()) if self.view_lod else []
+        )
+        for row in self.lod:
+            for col in columns:
+                val = row.get(col)
+                if isinstance(val, str) and search_lower in val.lower():
+                    key_value = row.get(self.key_col)
+                    matched_keys.append(key_value)
+        return matched_keys
+
     async def on_search_click(self):
         try:
             if not self.grid or not self.search_text.strip():
                 return
-            search_lower = self.search_text.strip().lower()
-            matched_keys = []
-            columns = (
-                self.search_cols or list(self.view_lod[0].keys()) if self.view_lod else []
+            # a first full text search builds the index - keep it off the event loop
+            matched_keys = await asyncio.to_thread(
+                self.get_search_keys, self.search_text.strip()
             )
-            for row in self.lod:
-                for col in columns:
-                    val = row.get(col)
-                    if isinstance(val, str) and search_lower in val.lower():
-                        key_value = row.get(self.key_col)
-                        matched_keys.append(key_value)
             msg = f"search {self.search_text}→{len(matched_keys)}"
             ui.notify(msg)
             self.grid.select_rows_by_keys(matched_keys)
@@ -255,9 +316,13 @@ class SlidesViewer(GridView):
 
     def to_view_lod(self):
         """
-        Add links to slide detail view
+        Add links to slide detail view and thumbnails
         """
         super().to_view_lod()
+        thumbnails = getattr(self.solution, "thumbnails", None)
+        pdfs = {}
+        if thumbnails:
+            self.html_columns = [1, 2, 3]
         for record in self.view_lod:
             path = record["path"]
             page = record["page"]
@@ -269,12 +334,43 @@ class SlidesViewer(GridView):
                 ppt = slide.ppt
                 url = f"/slides/{ppt.relpath}"
                 record["path"] = Link.create(url, ppt.basename)
+                if thumbnails:
+                    pdf = pdfs.get(ppt.relpath)
+                    if pdf is None:
+                        pdf = PDF(self.solution, ppt)
+                        pdfs[ppt.relpath] = pdf
+                    thumbnail_url = pdf.get_thumbnail_url(slide.pdf_page)
+                    if thumbnail_url:
+                        # render ahead in the background
+                        thumbnails.submit(pdf.pdf_file, slide.pdf_page)
+                        record["thumbnail"] = f'<img src="{thumbnail_url}" loading="lazy" width="160">'
+                    else:
+                        record["thumbnail"] = ""
+                    record.move_to_end("thumbnail", last=False)
             else:
                 self.solution.logger.error(f"Slide not found: path={path}, page={page}")
             record.move_to_end("path", last=False)
             record.move_to_end("name", last=False)
             record.move_to_end("#", last=False)
 
+    def get_search_keys(self, search_text: str) -> List:
+        """
+        get the pages of the shown slides matching the given search text
+        via the full text index of the presentation set
+
+        Args:
+            search_text: the query
+
+        Returns:
+            the list of matching pages
+        """
+        hits = self.ppt_set.search(search_text)
+        if not len(self.ppt_set.slide_index):
+            return super().get_search_keys(search_text)
+        paths = {ppt.filepath for ppt in self.ppts}
+        matched_keys = [hit.page for hit in hits if hit.path in paths]
+        return matched_keys
+
     def render_master(self,grid_row):
         # Master view (presentation details)
         with grid_row:
@@ -294,6 +390,74 @@ class SlidesViewer(GridView):
         self.load_lod()
         await self.render_view_lod(grid_row)
 
+class SearchViewer(GridView):
+    """
+    Shows the slides of all presentations matching a full text query
+    """
+
+    def __init__(self, solution: InputWebSolution, query: str, limit: int = 1000):
+        """
+        Initialize the SearchViewer.
+
+        Args:
+            solution: the UI solution context
+            query: the full text query
+            limit: the maximum number of hits to show
+        """
+        super().__init__(solution, "rank", html_columns=[1, 2])
+        self.ppt_set = solution.ppt_set
+        self.query = query
+        self.search_text = query
+        self.limit = limit
+
+    def load_lod(self):
+        """
+        Load the hits of the query
+        """
+        self.reset_lod()
+        self.hits = self.ppt_set.search(self.query, limit=self.limit)
+        for rank, hit in enumerate(self.hits, start=1):
+            slide = self.ppt_set.get_slide(hit.path, hit.page)
+            if slide:
+                record = {
+                    "rank": rank,
+                    "path": slide.ppt.relpath,
+                    "page": hit.page,
+                    "name": slide.name,
+                    "title": slide.title,
+                    "score": round(hit.score, 2),
+                }
+                self.lod.append(record)
+
+    def to_view_lod(self):
+        """
+        Add links to the slide detail and presentation views
+        """
+        super().to_view_lod()
+        for record in self.view_lod:
+            path = record["path"]
+            page = record["page"]
+            record["name"] = Link.create(f"/slide/{path}/{page}", record["name"])
+            ppt = self.ppt_set.get_ppt(path, relative=True)
+            record["path"] = Link.create(f"/slides/{path}", ppt.basename)
+            record.move_to_end("path", last=False)
+            record.move_to_end("name", last=False)
+            record.move_to_end("#", last=False)
+
+    async def on_search_click(self):
+        """
+        search again with the entered query
+        """
+        ui.navigate.to(f"/search?q={quote(self.search_text.strip())}")
+
+    async def load_and_render(self, grid_row):
+        # the first search builds the index - keep it off the event loop
+        await asyncio.to_thread(self.load_lod)
+        with grid_row:
+            ui.label(f"{len(self.hits)} slides matching '{self.query}'")
+        await self.render_view_lod(grid_row)
+
+
 class PresentationView(View):
     """
     View for a single presentation
@@ -318,7 +482,7 @@ class PresentationView(View):
         """
         with ui.row().classes("items-center gap-2 w-full"):
             ui.label(self.ppt.basename).classes("font-bold")
-            ui.label(f"({len(self.ppt.getSlides())} slides)")
+            ui.label(f"({self.ppt.getSlideCount()} slides)")
             # Action buttons
             ui.button(icon="open_in_new", on_click=self.open_in_office, color="primary").props("flat dense")
             if self.pdf and self.pdf.valid:
@@ -345,7 +509,7 @@ class PresentationView(View):
     def get_ppt_header(cls,ppt,with_delim:bool=False):
         pres_url = f"/slides/{ppt.relpath}"
         name=ppt.basename.replace(".pptx","")
-        pres_info = f"{name} ({len(ppt.getSlides())} slides)"
+        pres_info = f"{name} ({ppt.getSlideCount()} slides)"
         if with_delim:
             ui.label("•").classes("text-gray-500")
         ui.link(pres_info, pres_url).classes("block mb-2").tooltip(ppt.title)
@@ -366,6 +530,8 @@ class PresentationsViewer(GridView):
         self.ppt_set = solution.ppt_set
         self.slide_viewer = None
         self.task_runner = TaskRunner()
+        # the version of the presentation set shown in the grid
+        self.shown_version = None
 
     def setup_ui(self):
         """
@@ -390,6 +556,23 @@ class PresentationsViewer(GridView):
 
         self.grid_row = ui.row()
         self.slide_grid_row = ui.row()
+        if self.solution.watcher:
+            ui.timer(self.solution.watcher.interval, self.check_for_updates)
+
+    def check_for_updates(self):
+        """
+        refresh the grid if the watcher has changed the presentation set
+        """
+        try:
+            if self.grid and self.shown_version != self.ppt_set.version:
+                self.shown_version = self.ppt_set.version
+                self.load_lod()
+                self.to_view_lod()
+                self.grid.load_lod(self.view_lod)
+                self.grid.update()
+                ui.notify(f"{len(self.lod)} presentations")
+        except Exception as ex:
+            self.solution.handle_exception(ex)
 
     async def on_walk(self):
         self.task_runner.run_async(self.load_and_show_presentations)
@@ -407,11 +590,27 @@ class PresentationsViewer(GridView):
             pdf=PDF(self.solution,ppt)
             record["pdf"] = pdf.get_link()
 
+    def get_search_keys(self, search_text: str) -> List:
+        """
+        get the paths of the presentations whose metadata
+        or slides match the given search text
+
+        Args:
+            search_text: the query
+
+        Returns:
+            the list of matching presentation paths
+        """
+        matched_keys = set(super().get_search_keys(search_text))
+        matched_keys.update(hit.path for hit in self.ppt_set.search(search_text))
+        return list(matched_keys)
+
     async def load_and_show_presentations(self):
         """
         Load and display presentations
         """
         try:
+            self.shown_version = self.ppt_set.version
             self.load_lod()
             await self.render_view_lod(self.grid_row)
         except Exception as ex:
@@ -449,12 +648,15 @@ class PresentationsViewer(GridView):
             pdf_path = self.solution.pdf_path
             pptx_set = FileSet(base_path=str(base_path), ext="pptx")
 
-            pdfgen = PdfGenerator(debug=self.debug)
+            pdfgen = self.solution.webserver.get_pdf_generator(debug=self.debug)
             _result = pdfgen.generate_pdfs(
                 pptx_set=pptx_set,
                 pdf_path=pdf_path,
                 with_stats=True,
-                progress_bar=self.progress_bar
+                progress_bar=self.progress_bar,
+                max_workers=self.solution.pdf_workers,
+                timeout=self.solution.pdf_timeout,
+                incremental=True,
             )
             self.task_runner.run_async(self.load_and_show_presentations)
 
@@ -501,11 +703,31 @@ class SlideDetailViewer:
         self.solution = solution
         self.slide = slide
         self.pdf = PDF(solution, self.slide.ppt)
-        self.total_slides = len(self.slide.ppt.getSlides())
+        self.total_slides = self.slide.ppt.getSlideCount()
+
+    def get_page_pdf_url(self, page: int) -> str:
+        """
+        get the url of the single page PDF of the given slide page
+
+        Args:
+            page: the 1-based slide page of my presentation
+
+        Returns:
+            the url or None if the slide is not available
+        """
+        slide = self.solution.ppt_set.get_slide(self.slide.ppt.relpath, page, relative=True)
+        url = self.pdf.get_url(page=slide.pdf_page) if slide else None
+        return url
 
     def show_pdf(self):
         # Show PDF preview if available
-        if self.pdf.valid:
+        thumbnail_url = self.pdf.get_thumbnail_url(self.slide.pdf_page, size="large")
+        if thumbnail_url:
+            # a single image instead of the whole document
+            pdf_url = self.pdf.get_url(page=self.slide.pdf_page)
+            markup = f"""<a href="{pdf_url}"><img src="{thumbnail_url}" class="w-full" style="border: 1px solid #ddd; border-radius: 4px;"></a>"""
+            ui.html(markup)
+        elif self.pdf.valid:
             pdf_url = self.pdf.get_url(page=self.slide.pdf_page)
             # Use an iframe to embed the PDF with specific page
             markup=f"""
@@ -527,10 +749,14 @@ class SlideDetailViewer:
         #PresentationView.get_ppt_header(self.slide.ppt)
         # Add page navigation
         relpath = self.slide.ppt.relpath
+        prefetch_url_for_page = None
+        if getattr(self.solution, "page_pdfs", None) and self.pdf.valid:
+            prefetch_url_for_page = self.get_page_pdf_url
         navigator = PageNavigator(
             current_page=self.slide.page,
             total_pages=self.total_slides,
-            url_for_page=lambda page, path=relpath: f"/slide/{path}/{page}"
+            url_for_page=lambda page, path=relpath: f"/slide/{path}/{page}",
+            prefetch_url_for_page=prefetch_url_for_page,
         )
         navigator.render()
         with ui.row():
@@ -0,0 +1,215 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import threading
+import traceback
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+from slides.slidewalker import PPTSet
+
+try:
+    # inotify/FSEvents/ReadDirectoryChangesW based watching - optional
+    import watchfiles
+except ImportError:  # pragma: no cover
+    watchfiles = None
+
+
+@dataclass
+class FileChanges:
+    """
+    the presentation files added, changed or removed since the last check
+    """
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        """
+        check whether there are no changes
+        """
+        return not (self.added or self.changed or self.removed)
+
+    def summary(self) -> str:
+        """
+        get a one line summary of the changes
+        """
+        text = f"{len(self.added)} added, {len(self.changed)} changed, {len(self.removed)} removed"
+        return text
+
+
+class SlideWatcher:
+    """
+    watch the root folder of a PPTSet for added, changed and removed
+    presentations and refresh only the affected ones in a background thread
+
+    uses watchfiles if available and falls back to polling
+
+    the known state is the snapshot taken by the constructor - create the
+    watcher before loading the set so that no change during the load is missed
+    """
+
+    def __init__(
+        self,
+        ppt_set: PPTSet,
+        interval: float = 2.0,
+        use_polling: bool = False,
+        debug: bool = False,
+    ):
+        """
+        constructor
+
+        Args:
+            ppt_set(PPTSet): the presentation set to keep up to date
+            interval(float): the polling interval in seconds
+            use_polling(bool): if True poll even if watchfiles is available
+            debug(bool): if True show the detected changes
+        """
+        self.ppt_set = ppt_set
+        self.root_folder = ppt_set.slidewalker.rootFolder
+        self.interval = interval
+        self.use_polling = use_polling or watchfiles is None
+        self.debug = debug
+        self.stop_event = threading.Event()
+        self.thread = None
+        # full path -> (size, mtime) of the known presentation files
+        self.known = self.snapshot()
+
+    @staticmethod
+    def is_presentation(path: str) -> bool:
+        """
+        check whether the given path is a presentation that should be watched
+        """
+        name = os.path.basename(path)
+        return name.endswith(".pptx") and not name.startswith("~$")
+
+    @staticmethod
+    def stat(path: str) -> Tuple[int, float]:
+        """
+        get the size and modification time of the given file or None if it does not exist
+        """
+        try:
+            st = os.stat(path)
+            result = (st.st_size, st.st_mtime)
+        except OSError:
+            result = None
+        return result
+
+    def snapshot(self) -> Dict[str, Tuple[int, float]]:
+        """
+        get the size and modification time of all presentations below my root folder
+        """
+        files = {}
+        for path in self.ppt_set.slidewalker.findFiles(self.root_folder, ".pptx"):
+            stat = SlideWatcher.stat(path)
+            if stat:
+                files[path] = stat
+        return files
+
+    def get_changes(self, paths: Iterable[str] = None) -> FileChanges:
+        """
+        compare the given paths (default: a full scan) with the known files
+        and remember their new state
+
+        Args:
+            paths(Iterable[str]): the paths reported as touched
+
+        Returns:
+            FileChanges: the added, changed and removed presentations
+        """
+        changes = FileChanges()
+        if paths is None:
+            current = self.snapshot()
+            paths = set(current) | set(self.known)
+        else:
+            current = {}
+            for path in paths:
+                stat = (
+                    SlideWatcher.stat(path)
+                    if SlideWatcher.is_presentation(path)
+                    else None
+                )
+                if stat:
+                    current[path] = stat
+        for path in sorted(paths):
+            old = self.known.get(path)
+            new = current.get(path)
+            if old is None and new is not None:
+                changes.added.append(path)
+            elif old is not None and new is None:
+                changes.removed.append(path)
+            elif old != new:
+                changes.changed.append(path)
+            if new is None:
+                self.known.pop(path, None)
+            else:
+                self.known[path] = new
+        return changes
+
+    def apply(self, changes: FileChanges):
+        """
+        refresh the presentation set for the given changes
+        """
+        if not changes.is_empty():
+            if self.debug:
+                print(f"slide watcher: {changes.summary()}")
+            self.ppt_set.update_paths(changes.added + changes.changed, changes.removed)
+
+    def poll_once(self) -> FileChanges:
+        """
+        check for changes by a full scan and apply them
+        """
+        changes = self.get_changes()
+        self.apply(changes)
+        return changes
+
+    def run(self):
+        """
+        watch until stopped
+        """
+        if self.use_polling:
+            while not self.stop_event.wait(self.interval):
+                self.check(self.poll_once)
+        else:
+            for events in watchfiles.watch(
+                self.root_folder,
+                watch_filter=lambda _change, path: SlideWatcher.is_presentation(path),
+                stop_event=self.stop_event,
+            ):
+                paths = {path for _change, path in events}
+                self.check(lambda: self.apply(self.get_changes(paths)))
+
+    def check(self, callback):
+        """
+        run the given check keeping the watcher alive on errors
+        """
+        try:
+            callback()
+        except Exception as ex:
+            print(f"slide watcher failed: {ex}")
+            if self.debug:
+                print(traceback.format_exc())
+
+    def start(self):
+        """
+        start watching in a background thread
+        """
+        self.stop_event.clear()
+        self.thread = threading.Thread(
+            target=self.run, name="slide_watcher", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """
+        stop watching
+        """
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=self.interval + 5)
+            self.thread = None
@@ -7,20 +7,29 @@ Created on 2022-04-07
 import argparse
 import csv
 import io
+import itertools
 import json
 import os
 import sys
+import threading
 import traceback
 import webbrowser
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import redirect_stdout
+from dataclasses import dataclass, field
 from io import StringIO
-from typing import List
+from typing import Dict, List, TextIO
 
 from pptx import Presentation
 from tqdm import tqdm
 
+from slides.pptx_xml import PptxXmlExtractor
+from slides.slide_cache import SlideCache
+from slides.slide_index import SearchHit, SlideIndex
+from slides.sqlite_export import SqliteExporter
 from slides.version import Version
+from slides.walk_stats import WalkStats
 
 
 # https://stackoverflow.com/a/70631361/1497139
@@ -46,25 +55,95 @@ class Slide(object):
 
     defaultRunDelim = ""
 
-    def __init__(self, ppt, slide, page, pdf_page, runDelim: str = None):
+    def __init__(
+        self, ppt, slide, page, pdf_page, runDelim: str = None, record: dict = None
+    ):
         """
         constructor
+
+        Args:
+            ppt(PPT): the presentation this slide belongs to
+            slide: the python-pptx slide or None if the slide is backed by a record
+            page(int): the 1-based page number
+            pdf_page(int): the 1-based page number in the PDF export
+            runDelim(str): delimiter for slide text runs
+            record(dict): optional extracted slide record e.g. from a SlideCache
         """
         self.ppt = ppt
         self.slide = slide
         self.page = page
         self.pdf_page = pdf_page
-        self.name = slide.name
-        self.title = None
+        self.record = record
         if runDelim is None:
             runDelim = Slide.defaultRunDelim
         self.runDelim = runDelim
+        if record is not None:
+            self.name = record["name"]
+            self.title = record["title"]
+        else:
+            self.name = slide.name
+            self.title = Slide.getTitle(slide)
+        pass
+
+    @staticmethod
+    def getTitle(slide) -> str:
+        """
+        get the title of the given python-pptx slide falling back to its name
+        """
+        title = None
         # https://stackoverflow.com/a/40821359/1497139
         if slide.shapes.title:
-            self.title = slide.shapes.title.text
-        if self.title is None:
-            self.title = self.name
-        pass
+            title = slide.shapes.title.text
+        if title is None:
+            title = slide.name
+        return title
+
+    @staticmethod
+    def isHidden(slide) -> bool:
+        """
+        check whether the given python-pptx slide is hidden
+        """
+        hidden = slide._element.get("show") == "0"
+        return hidden
+
+    @classmethod
+    def extractRecord(cls, slide, page: int) -> dict:
+        """
+        extract a plain record of the given python-pptx slide
+        which allows to recreate the slide text for any yRange and runDelim
+
+        Args:
+            slide: the python-pptx slide
+            page(int): the 1-based page number
+
+        Returns:
+            dict: the slide record
+        """
+        notes = ""
+        if slide.has_notes_slide:
+            notes_slide = slide.notes_slide
+            if notes_slide.notes_text_frame:
+                notes = notes_slide.notes_text_frame.text
+        record = {
+            "page": page,
+            "name": slide.name,
+            "title": cls.getTitle(slide),
+            "layout": slide.slide_layout.name,
+            "hidden": cls.isHidden(slide),
+            "shapes": cls.getRuns4Shapes(slide.shapes),
+            "notes": notes,
+        }
+        return record
+
+    def getPptxSlide(self):
+        """
+        get my python-pptx slide - opening the presentation if
+        i am only backed by a record
+        """
+        if self.slide is None:
+            prs = self.ppt.getPresentation()
+            self.slide = prs.slides[self.page - 1]
+        return self.slide
 
     def asDict(self):
         summary = {
@@ -81,40 +160,68 @@ class Slide(object):
         text = f"{self.page:3d}({self.name}):{self.title}"
         return text
 
-    def getMM(self, emu):
+    @staticmethod
+    def getMM(emu):
         # https://startbigthinksmall.wordpress.com/2010/01/04/points-inches-and-emus-measuring-units-in-office-open-xml/
         if emu is None:
             return 0
         else:
             return emu.mm
 
-    def getText4Shapes(self, shapes, yRange, runDelim: str = None):
-        """
-        Get visible text from shapes in a y-range, excluding icon font runs.
+    @classmethod
+    def getRuns4Shapes(cls, shapes) -> list:
         """
-        lines = []
-        if runDelim is None:
-            runDelim = self.runDelim
+        get the visible text runs of the given shapes, excluding icon font runs
+
+        Args:
+            shapes: the python-pptx shapes
 
+        Returns:
+            list: a list of [y, runs] pairs with the y position in mm
+            and the list of run texts for each shape with a text frame
+        """
+        shape_runs = []
         for shape in shapes:
             if not shape.has_text_frame:
                 continue
-
-            line = ""
-            delim = ""
+            runs = []
             for paragraph in shape.text_frame.paragraphs:
                 for run in paragraph.runs:
-                    if any('\ue000' <= c <= '\uf8ff' for c in run.text):
+                    if any("\ue000" <= c <= "\uf8ff" for c in run.text):
                         continue  # skip icon glyphs
-                    line += f"{delim}{run.text}"
-                    delim = runDelim
+                    runs.append(run.text)
+            shape_runs.append([cls.getMM(shape.top), runs])
+        return shape_runs
 
-            y = self.getMM(shape.top)
+    @staticmethod
+    def getText4Runs(shape_runs: list, yRange, runDelim: str) -> List[str]:
+        """
+        get the text lines for the given shape runs in a y-range
+
+        Args:
+            shape_runs(list): list of [y, runs] pairs as returned by getRuns4Shapes
+            yRange(YRange): the range to filter by
+            runDelim(str): the delimiter to join the runs with
+
+        Returns:
+            List[str]: the stripped non empty lines
+        """
+        lines = []
+        for y, runs in shape_runs:
+            line = runDelim.join(runs)
             if y and YRange.isIn(yRange, y) and line.strip():
                 lines.append(line.strip())
-
         return lines
 
+    def getText4Shapes(self, shapes, yRange, runDelim: str = None):
+        """
+        Get visible text from shapes in a y-range, excluding icon font runs.
+        """
+        if runDelim is None:
+            runDelim = self.runDelim
+        shape_runs = self.getRuns4Shapes(shapes)
+        lines = self.getText4Runs(shape_runs, yRange, runDelim)
+        return lines
 
     def getText(self, yRange=None):
         """
@@ -126,7 +233,19 @@ class Slide(object):
         Return:
             str: the notes for this slide
         """
-        text = self.getText4Shapes(self.slide.shapes, yRange, runDelim=self.runDelim)
+        stats = self.ppt.stats
+        with stats.phase("text", self.ppt.filepath):
+            if self.record is not None:
+                shape_runs = self.record["shapes"]
+            else:
+                shape_runs = self.getRuns4Shapes(self.slide.shapes)
+            text = self.getText4Runs(shape_runs, yRange, self.runDelim)
+        if stats.enabled:
+            stats.count(
+                self.ppt.filepath,
+                shapes=len(shape_runs),
+                runs=sum(len(runs) for _y, runs in shape_runs),
+            )
         return text
 
     def getNotes(self, yRange=None, useShapes: bool = False) -> str:
@@ -136,9 +255,12 @@ class Slide(object):
         Return:
             str: the notes for this slide
         """
+        if self.record is not None and not useShapes:
+            return self.record["notes"]
         text = ""
-        if self.slide.has_notes_slide:
-            notes_slide = self.slide.notes_slide
+        slide = self.getPptxSlide()
+        if slide.has_notes_slide:
+            notes_slide = slide.notes_slide
             if useShapes:
                 text = self.getText4Shapes(
                     notes_slide.shapes, yRange, runDelim=self.runDelim
@@ -151,7 +273,10 @@ class Slide(object):
         """
         get the layoutName of this slide
         """
-        layoutName = self.slide.slide_layout.name
+        if self.record is not None:
+            layoutName = self.record["layout"]
+        else:
+            layoutName = self.slide.slide_layout.name
         return layoutName
 
 
@@ -160,18 +285,51 @@ class PPT(object):
     PowerPoint Presentation with lecture
     """
 
-    def __init__(self, filepath, pageHeight=297):
+    # available slide extraction engines
+    engines = ["pptx", "xml"]
+
+    def __init__(
+        self,
+        filepath,
+        pageHeight=297,
+        cache: SlideCache = None,
+        engine: str = "pptx",
+        metadata_only: bool = False,
+        stats: WalkStats = None,
+    ):
         """
         Constructor
+
+        Args:
+            filepath(str): the path of the presentation
+            pageHeight(int): the page height in mm
+            cache(SlideCache): optional persistent cache for extracted content
+            engine(str): the slide extraction engine "pptx" (python-pptx) or "xml" (direct XML)
+            metadata_only(bool): if True open only reads the document properties
+                and defers parsing the slides until they are needed
+            stats(WalkStats): optional instrumentation of the processing phases
         """
         self.filepath = filepath
         self.basename = os.path.basename(filepath)
         self.pageHeight = pageHeight
         if not os.path.isfile(filepath):
             raise Exception("%s does not exist" % filepath)
+        self.cache = cache
+        self.engine = engine
+        self.metadata_only = metadata_only
+        if stats is None:
+            stats = WalkStats()
+        self.stats = stats
         self.prs = None
         self.error = None
+        self.opened = False
+        self.cached = False
+        self.slide_records = None
+        self.slide_count = None
+        self.hidden_count = None
         self.slides_loaded=False
+        # incremented each time my slides are (re)built
+        self.slides_generation = 0
         self.slides = []
 
     def summary(self) -> str:
@@ -207,15 +365,248 @@ class PPT(object):
 
     def open(self):
         """
-        open my presentation
+        open my presentation - serving the metadata from my cache if
+        the cached entry is still valid
         """
+        self.opened = True
+        if self.cache is not None and self.openFromCache():
+            return
+        if self.metadata_only and self.openMetadata():
+            return
         try:
-            self.prs = Presentation(self.filepath)
-            self.author = self.prs.core_properties.author
-            self.created = self.prs.core_properties.created
-            self.title = self.prs.core_properties.title
+            self.readCoreProperties()
+            if self.cache is not None:
+                self.slide_records = self.extractSlideRecords()
         except Exception as ex:
             self.error = ex
+        if self.cache is not None:
+            self.cache.put_deck(self.filepath, self.asRecord(), self.slide_records or [])
+
+    def readCoreProperties(self):
+        """
+        read my title, author and creation date - with the xml engine
+        directly from the XML parts without building a python-pptx Presentation
+        """
+        meta = None
+        if self.engine == "xml":
+            with self.stats.phase("open", self.filepath):
+                meta = PptxXmlExtractor(self.filepath).extractMetadata()
+        if meta is not None:
+            self.title = meta["title"]
+            self.author = meta["author"]
+            self.created = meta["created"]
+            self.slide_count = meta["slide_count"]
+            self.hidden_count = meta["hidden_count"]
+        else:
+            core_properties = self.getPresentation().core_properties
+            self.author = core_properties.author
+            self.created = core_properties.created
+            self.title = core_properties.title
+
+    def openFromCache(self) -> bool:
+        """
+        try opening my presentation from my cache
+
+        Returns:
+            bool: True if my cache had a valid entry
+        """
+        self.opened = True
+        deck_record = self.cache.get_deck(self.filepath)
+        if deck_record is not None:
+            self.cached = True
+            self.title = deck_record["title"]
+            self.author = deck_record["author"]
+            self.created = deck_record["created"]
+            self.slide_count = deck_record["slide_count"]
+            self.hidden_count = deck_record["hidden_count"]
+            if deck_record["error"]:
+                self.error = Exception(deck_record["error"])
+        return self.cached
+
+    def openMetadata(self) -> bool:
+        """
+        read my metadata from the document properties without parsing any slide
+
+        Returns:
+            bool: True if the metadata could be read or the file is broken,
+            False if there are no document properties to read
+        """
+        self.opened = True
+        try:
+            with self.stats.phase("open", self.filepath):
+                meta = PptxXmlExtractor(self.filepath).extractMetadata()
+        except Exception as ex:
+            self.error = ex
+            return True
+        if meta is not None:
+            self.title = meta["title"]
+            self.author = meta["author"]
+            self.created = meta["created"]
+            self.slide_count = meta["slide_count"]
+            self.hidden_count = meta["hidden_count"]
+        return meta is not None
+
+    def getSlideCount(self, excludeHiddenSlides: bool = False) -> int:
+        """
+        get the number of my slides - without extracting the slides if possible
+
+        Args:
+            excludeHiddenSlides(bool): if True do not count hidden slides
+
+        Returns:
+            int: the number of slides
+        """
+        if not self.opened:
+            self.open()
+        if self.slide_records is not None:
+            count = sum(
+                1
+                for record in self.slide_records
+                if not (excludeHiddenSlides and record["hidden"])
+            )
+        elif self.slide_count is not None and not excludeHiddenSlides:
+            count = self.slide_count
+        elif self.slide_count is not None and self.hidden_count is not None:
+            count = self.slide_count - self.hidden_count
+        elif self.error:
+            count = 0
+        elif self.engine == "xml":
+            try:
+                count = sum(
+                    1
+                    for record in self.getSlideRecords()
+                    if not (excludeHiddenSlides and record["hidden"])
+                )
+            except Exception as ex:
+                self.error = ex
+                count = 0
+        else:
+            try:
+                count = sum(
+                    1
+                    for slide in self.getPresentation().slides
+                    if not (excludeHiddenSlides and Slide.isHidden(slide))
+                )
+            except Exception as ex:
+                self.error = ex
+                count = 0
+        return count
+
+    def asRecord(self, with_slides: bool = False) -> dict:
+        """
+        get a plain (picklable) record of my metadata
+
+        Args:
+            with_slides(bool): if True include my slide records
+
+        Returns:
+            dict: the record
+        """
+        record = {"error": str(self.error) if self.error else None}
+        if not self.error:
+            record.update(
+                {"title": self.title, "author": self.author, "created": self.created}
+            )
+            if with_slides:
+                record["slides"] = self.slide_records
+        return record
+
+    def setRecord(self, record: dict):
+        """
+        set my metadata and slides from the given record
+        as created by asRecord and store it in my cache if i have one
+
+        Args:
+            record(dict): the record
+        """
+        self.opened = True
+        if record["error"]:
+            self.error = Exception(record["error"])
+        else:
+            self.title = record["title"]
+            self.author = record["author"]
+            self.created = record["created"]
+            self.slide_records = record["slides"]
+        if self.cache is not None:
+            self.cache.put_deck(self.filepath, record, self.slide_records or [])
+
+    @staticmethod
+    def extractDeck(filepath: str, engine: str = "pptx") -> dict:
+        """
+        extract the metadata and slide records of the presentation
+        at the given path e.g. in a worker process
+
+        Args:
+            filepath(str): the path of the presentation
+            engine(str): the slide extraction engine
+
+        Returns:
+            dict: the record of the presentation
+        """
+        ppt = PPT(filepath, engine=engine)
+        ppt.open()
+        if not ppt.error:
+            try:
+                ppt.slide_records = ppt.extractSlideRecords()
+            except Exception as ex:
+                ppt.error = ex
+        record = ppt.asRecord(with_slides=True)
+        return record
+
+    def getPresentation(self):
+        """
+        get my python-pptx presentation - parsing it if necessary
+        """
+        if self.prs is None:
+            with self.stats.phase("open", self.filepath):
+                self.prs = Presentation(self.filepath)
+            if self.stats.enabled:
+                self.stats.count(self.filepath, bytes_read=os.path.getsize(self.filepath))
+        return self.prs
+
+    def extractSlideRecords(self, engine: str = None) -> List[dict]:
+        """
+        extract plain records for all my slides including the hidden ones
+
+        Args:
+            engine(str): the extraction engine to use - default: my engine
+
+        Returns:
+            List[dict]: the slide records
+        """
+        if engine is None:
+            engine = self.engine
+        if engine == "xml":
+            with self.stats.phase("extract", self.filepath):
+                records = PptxXmlExtractor(self.filepath).extractSlideRecords()
+        elif engine == "pptx":
+            slides = self.getPresentation().slides
+            with self.stats.phase("extract", self.filepath):
+                records = []
+                for page, slide in enumerate(slides, start=1):
+                    records.append(Slide.extractRecord(slide, page))
+        else:
+            raise ValueError(f"unknown slide extraction engine {engine}")
+        return records
+
+    def getSlideRecords(self, engine: str = None) -> List[dict]:
+        """
+        get my slide records - fetching them from my cache or extracting
+        (and caching) them if necessary
+
+        Args:
+            engine(str): the extraction engine to use - default: my engine
+        """
+        if self.slide_records is None:
+            if self.cached:
+                self.slide_records = self.cache.get_slide_records(self.filepath)
+            else:
+                self.slide_records = self.extractSlideRecords(engine)
+                if self.cache is not None:
+                    self.cache.put_deck(
+                        self.filepath, self.asRecord(), self.slide_records
+                    )
+        return self.slide_records
 
     def open_in_office(self):
         """
@@ -223,7 +614,13 @@ class PPT(object):
         """
         os.system(f"open {self.filepath}")  # MacOS – adjust for platform
 
-    def getSlides(self, excludeHiddenSlides: bool = False, runDelim: str = None, force: bool = False):
+    def getSlides(
+        self,
+        excludeHiddenSlides: bool = False,
+        runDelim: str = None,
+        force: bool = False,
+        engine: str = None,
+    ):
         """
         get my slides
 
@@ -231,6 +628,7 @@ class PPT(object):
             excludeHiddenSlides(bool): if True exclude hidden Slides
             runDelim(str): delimiter for slide text runs
             force(bool): if True, reload slides even if already loaded
+            engine(str): the slide extraction engine - default: my engine
         """
         # Return existing slides if already loaded and not forced to reload
         if not force and self.slides_loaded:
@@ -238,27 +636,99 @@ class PPT(object):
         # Clear existing slides if forcing reload
         if force:
             self.slides = []
+        self.slides_generation += 1
         if runDelim is None:
             runDelim = Slide.defaultRunDelim
-        if self.prs is None:
+        if not self.opened:
             self.open()
-        if not self.error:
-            page = 0
-            pdf_page = 0
-            for slide in self.prs.slides:
-                page += 1
-                if excludeHiddenSlides:
-                    if slide._element.get("show") == "0":
-                        # slide is hidden → go to next slide
-                        continue
-                pdf_page += 1
-                pptSlide = Slide(
-                    self, slide, page=page, pdf_page=pdf_page, runDelim=runDelim
-                )
-                self.slides.append(pptSlide)
+        if engine is None:
+            engine = self.engine
+        use_records = (
+            self.cache is not None or self.slide_records is not None or engine == "xml"
+        )
+        try:
+            self.addSlides(excludeHiddenSlides, runDelim, engine, use_records)
+        except Exception as ex:
+            # e.g. a broken deck whose slide parsing was deferred
+            self.error = ex
+            self.slides = []
         self.slides_loaded=True
+        if self.stats.enabled:
+            self.stats.count(self.filepath, slides=len(self.slides))
         return self.slides
 
+    def addSlides(
+        self, excludeHiddenSlides: bool, runDelim: str, engine: str, use_records: bool
+    ):
+        """
+        add my slides from my slide records or my python-pptx presentation
+
+        Args:
+            excludeHiddenSlides(bool): if True exclude hidden Slides
+            runDelim(str): delimiter for slide text runs
+            engine(str): the slide extraction engine
+            use_records(bool): if True create the slides from my slide records
+        """
+        if self.error:
+            return
+        if use_records:
+            records = self.getSlideRecords(engine)
+        else:
+            pptx_slides = self.getPresentation().slides
+        with self.stats.phase("slides", self.filepath):
+            if use_records:
+                pdf_page = 0
+                for record in records:
+                    if excludeHiddenSlides and record["hidden"]:
+                        continue
+                    pdf_page += 1
+                    pptSlide = Slide(
+                        self,
+                        None,
+                        page=record["page"],
+                        pdf_page=pdf_page,
+                        runDelim=runDelim,
+                        record=record,
+                    )
+                    self.slides.append(pptSlide)
+            else:
+                page = 0
+                pdf_page = 0
+                for slide in pptx_slides:
+                    page += 1
+                    if excludeHiddenSlides:
+                        if Slide.isHidden(slide):
+                            # slide is hidden → go to next slide
+                            continue
+                    pdf_page += 1
+                    pptSlide = Slide(
+                        self, slide, page=page, pdf_page=pdf_page, runDelim=runDelim
+                    )
+                    self.slides.append(pptSlide)
+
+
+@dataclass
+class PageIndex:
+    """
+    page and pdf_page lookup index for the slides of a presentation
+    """
+
+    generation: int
+    by_page: Dict[int, Slide] = field(default_factory=dict)
+    by_pdf_page: Dict[int, Slide] = field(default_factory=dict)
+
+    @classmethod
+    def of_ppt(cls, ppt: PPT) -> "PageIndex":
+        """
+        build the index for the given presentation
+        """
+        slides = ppt.getSlides()
+        index = cls(generation=ppt.slides_generation)
+        for slide in slides:
+            index.by_page[slide.page] = slide
+            index.by_pdf_page[slide.pdf_page] = slide
+        return index
+
 
 class PPTSet:
     """
@@ -271,19 +741,116 @@ class PPTSet:
         self.verbose = verbose
         self.ppts_by_path: dict[str, PPT] = {}
         self.ppts_by_relpath: dict[str, PPT] = {}
+        # page indexes by full path
+        self.page_indexes: dict[str, PageIndex] = {}
+        # full text index of the slides - built on first use
+        self.slide_index = SlideIndex()
+        # True if my presentations are indexed and kept indexed on updates
+        self.with_index = False
+        # incremented whenever the set of presentations changes
+        self.version = 0
+        self.lock = threading.RLock()
+
+    @property
+    def stats(self) -> WalkStats:
+        """
+        the instrumentation of the processing phases of my SlideWalker
+        """
+        return self.slidewalker.stats
 
-    def load(self, with_progress: bool = False):
+    def load(
+        self, with_progress: bool = False, workers: int = 1, with_index: bool = False
+    ):
         """
         Load presentations using the configured SlideWalker.
 
         Args:
             with_progress(bool): If True, show a tqdm progress bar.
+            workers(int): number of worker processes for the extraction
+            with_index(bool): If True, add the slides to the full text index
+                right away instead of on the first search
         """
-        ppt_iter = self.slidewalker.yieldPowerPointFiles(verbose=self.verbose)
+        ppt_iter = self.slidewalker.yieldPowerPointFiles(
+            verbose=self.verbose, workers=workers
+        )
         iterator = tqdm(ppt_iter, desc="Loading PPTs") if with_progress else ppt_iter
+        self.with_index = self.with_index or with_index
         for ppt in iterator:
             self.ppts_by_path[ppt.filepath] = ppt
             self.ppts_by_relpath[ppt.relpath] = ppt
+            if self.with_index:
+                self.slide_index.add_ppt(ppt)
+        self.version += 1
+
+    def build_index(self):
+        """
+        add the slides of all my presentations to the full text index
+        unless this has already been done - the slides are served from the
+        SlideCache records where available
+        """
+        with self.lock:
+            if not self.with_index:
+                for ppt in self.ppts_by_path.values():
+                    self.slide_index.add_ppt(ppt)
+                self.with_index = True
+
+    def update_paths(self, changed: List[str], removed: List[str]) -> int:
+        """
+        re-extract the given added or changed presentations and drop the removed ones
+        the lookup dicts are replaced as a whole so that readers
+        always see a consistent state
+
+        Args:
+            changed(List[str]): full paths of added or changed presentations
+            removed(List[str]): full paths of removed presentations
+
+        Returns:
+            int: the number of presentations that could not be read
+        """
+        ppts = []
+        failed = []
+        for path in changed:
+            ppt = self.slidewalker.createPPT(path)
+            ppt.open()
+            if self.slidewalker.checkError(ppt):
+                ppts.append(ppt)
+            else:
+                # e.g. a partially written file - keep it out of the set
+                failed.append(path)
+        with self.lock:
+            ppts_by_path = dict(self.ppts_by_path)
+            ppts_by_relpath = dict(self.ppts_by_relpath)
+            for path in removed + failed:
+                old_ppt = ppts_by_path.pop(path, None)
+                if old_ppt:
+                    ppts_by_relpath.pop(old_ppt.relpath, None)
+                self.page_indexes.pop(path, None)
+                self.slide_index.remove_path(path)
+            for ppt in ppts:
+                ppts_by_path[ppt.filepath] = ppt
+                ppts_by_relpath[ppt.relpath] = ppt
+                self.page_indexes.pop(ppt.filepath, None)
+                if self.with_index:
+                    self.slide_index.add_ppt(ppt)
+            self.ppts_by_path = ppts_by_path
+            self.ppts_by_relpath = ppts_by_relpath
+            self.version += 1
+        return len(failed)
+
+    def search(self, query: str, limit: int = None) -> List[SearchHit]:
+        """
+        search the slides of my presentations - building the index on first use
+
+        Args:
+            query(str): the query - each term is matched as a word prefix
+            limit(int): the maximum number of hits - default: all
+
+        Returns:
+            List[SearchHit]: the hits ordered by descending score
+        """
+        self.build_index()
+        hits = self.slide_index.search(query, limit=limit)
+        return hits
 
     def get_ppt(self, path: str, relative: bool = False) -> PPT:
         """
@@ -313,12 +880,32 @@ class PPTSet:
         Returns:
             dict[int, Slide]: map from page number to slide
         """
+        index = self.get_page_index(path, relative=relative)
+        slides_by_page = index.by_page if index else {}
+        return slides_by_page
+
+    def get_page_index(self, path: str, relative: bool = False) -> PageIndex:
+        """
+        Get the page index of the presentation at the given path -
+        building it on first use or when the slides have been reloaded
+
+        Args:
+            path (str): path to the presentation
+            relative (bool): if True, lookup by relpath; else, by full path
+
+        Returns:
+            PageIndex: the index or None if the presentation is not loaded
+        """
         ppt = self.get_ppt(path, relative=relative)
-        slides_by_page: dict[int, Slide] = {}
+        index = None
         if ppt:
-            for slide in ppt.getSlides():
-                slides_by_page[slide.page] = slide
-        return slides_by_page
+            if not ppt.slides_loaded:
+                ppt.getSlides()
+            index = self.page_indexes.get(ppt.filepath)
+            if index is None or index.generation != ppt.slides_generation:
+                index = PageIndex.of_ppt(ppt)
+                self.page_indexes[ppt.filepath] = index
+        return index
 
     def get_slide(self, path: str, page: int, relative: bool = False) -> Slide:
         """
@@ -332,8 +919,26 @@ class PPTSet:
         Returns:
             Slide: the slide object or None if not found
         """
-        slides_by_page = self.get_slides(path, relative=relative)
-        slide = slides_by_page.get(page)
+        index = self.get_page_index(path, relative=relative)
+        slide = index.by_page.get(page) if index else None
+        return slide
+
+    def get_slide_by_pdf_page(
+        self, path: str, pdf_page: int, relative: bool = False
+    ) -> Slide:
+        """
+        Get a specific slide by its page number in the PDF export of a presentation.
+
+        Args:
+            path (str): path to the presentation
+            pdf_page (int): 1-based page index in the PDF
+            relative (bool): if True, lookup by relpath; else, by full path
+
+        Returns:
+            Slide: the slide object or None if not found
+        """
+        index = self.get_page_index(path, relative=relative)
+        slide = index.by_pdf_page.get(pdf_page) if index else None
         return slide
 
 
@@ -356,16 +961,41 @@ class SlideWalker(object):
     get meta information for all powerpoint presentations in a certain folder
     """
 
-    def __init__(self, rootFolder: str, debug: bool = False):
+    def __init__(
+        self,
+        rootFolder: str,
+        debug: bool = False,
+        cache: SlideCache = None,
+        engine: str = "pptx",
+        metadata_only: bool = False,
+        stats: WalkStats = None,
+    ):
         """
         Constructor
 
         Args:
             rootFolder(str): the path to the root folder of the analysis
             debug(bool): if True switch on debugging
+            cache(SlideCache): optional persistent cache for extracted content
+            engine(str): the slide extraction engine "pptx" or "xml"
+            metadata_only(bool): if True only read the document properties
+                when opening presentations and defer parsing the slides
+            stats(WalkStats): optional instrumentation of the processing phases
+                - disabled by default
         """
         self.rootFolder = rootFolder
         self.debug = debug
+        self.cache = cache
+        self.engine = engine
+        self.metadata_only = metadata_only
+        if stats is None:
+            stats = WalkStats()
+        self.stats = stats
+        # (filepath, error message) of presentations that could not be read
+        self.failures = []
+
+    # the columns of the slide CSV export
+    csvFieldNames = ["basename", "page", "name", "title"]
 
     def asCsv(self, listOfDicts: list, fieldNames: list = None) -> str:
         """convert the given list of dicts to CSV
@@ -373,6 +1003,7 @@ class SlideWalker(object):
 
         Args:
             listOfDicts(list): the table to convert
+            fieldNames(list): the columns - if None the union of all keys
 
         Returns:
             str: the CSV formated result
@@ -384,34 +1015,136 @@ class SlideWalker(object):
                 for key in record.keys():
                     fieldNameSet.add(key)
             fieldNames = list(fieldNameSet)
+        self.writeCsv(listOfDicts, output, fieldNames)
+        return output.getvalue()
+
+    def writeCsv(self, records, output: TextIO, fieldNames: list):
+        """
+        write the given records as CSV in a single pass
+
+        Args:
+            records: iterable of dicts to write
+            output(TextIO): the stream to write to
+            fieldNames(list): the declared columns
+        """
         writer = csv.DictWriter(
             output, fieldnames=fieldNames, quoting=csv.QUOTE_NONNUMERIC
         )
         writer.writeheader()
-        for record in listOfDicts:
-            writer.writerow(record)
-        return output.getvalue()
+        for record in records:
+            with self.stats.phase("serialize"):
+                writer.writerow(record)
+
+    def createPPT(self, pptxFile: str) -> PPT:
+        """
+        create a presentation for the given file relative to my root folder
+        """
+        ppt = PPT(
+            pptxFile,
+            cache=self.cache,
+            engine=self.engine,
+            metadata_only=self.metadata_only,
+            stats=self.stats,
+        )
+        relpath = os.path.relpath(ppt.filepath, self.rootFolder)
+        ppt.relpath = relpath
+        return ppt
 
-    def yieldPowerPointFiles(self, verbose: bool = False):
+    def checkError(self, ppt: PPT) -> bool:
+        """
+        check the given presentation for an error and record it as a failure
+
+        Returns:
+            bool: True if the presentation is ok
+        """
+        if ppt.error:
+            self.failures.append((ppt.filepath, str(ppt.error)))
+        return not ppt.error
+
+    def yieldPowerPointFiles(
+        self,
+        verbose: bool = False,
+        workers: int = 1,
+        sortByBasename: bool = False,
+        pptxFiles: List[str] = None,
+        groupByBasename: bool = False,
+    ):
         """
         generate  my power point files
 
         Args:
             verbose(bool): if True show information about the processing
+            workers(int): number of worker processes for the extraction
+            sortByBasename(bool): if True generate the files ordered by basename
+            pptxFiles(List[str]): the files to generate - default: all files below my root folder
+            groupByBasename(bool): if True generate files with the same basename
+                one after the other at the position of the first of them
         """
-        pptxFiles = self.findFiles(self.rootFolder, ".pptx")
+        if pptxFiles is None:
+            with self.stats.phase("find"):
+                pptxFiles = self.findFiles(self.rootFolder, ".pptx")
+        if sortByBasename:
+            # stable - files with the same basename keep their order
+            pptxFiles = sorted(pptxFiles, key=os.path.basename)
+        elif groupByBasename:
+            firstIndex = {}
+            for index, path in enumerate(pptxFiles):
+                firstIndex.setdefault(os.path.basename(path), index)
+            # stable - files with the same basename keep their order
+            pptxFiles = sorted(
+                pptxFiles, key=lambda path: firstIndex[os.path.basename(path)]
+            )
         if verbose:
             print(f"found {len(pptxFiles)} powerpoint files")
+        if workers > 1:
+            yield from self.yieldPowerPointFilesParallel(pptxFiles, verbose, workers)
+            return
         for pptxFile in pptxFiles:
             if verbose:
                 print(f"Extracting data from {pptxFile}")
-            ppt = PPT(pptxFile)
-            relpath = os.path.relpath(ppt.filepath, self.rootFolder)
-            ppt.relpath = relpath
+            ppt = self.createPPT(pptxFile)
             ppt.open()
-            if not ppt.error:
+            if self.checkError(ppt):
                 yield ppt
 
+    def yieldPowerPointFilesParallel(
+        self, pptxFiles: List[str], verbose: bool, workers: int
+    ):
+        """
+        generate the given power point files extracting them in a process pool
+        in the order of the given files
+
+        Args:
+            pptxFiles(list): the files to extract
+            verbose(bool): if True show information about the processing
+            workers(int): number of worker processes
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = []
+            for pptxFile in pptxFiles:
+                ppt = self.createPPT(pptxFile)
+                future = None
+                if self.cache is None or not ppt.openFromCache():
+                    future = executor.submit(PPT.extractDeck, pptxFile, self.engine)
+                pending.append((ppt, future))
+            for ppt, future in pending:
+                if verbose:
+                    print(f"Extracting data from {ppt.filepath}")
+                if future is not None:
+                    # time spent waiting for the worker process
+                    with self.stats.phase("extract", ppt.filepath):
+                        try:
+                            record = future.result()
+                        except Exception as ex:
+                            record = {"error": f"extraction failed: {ex}"}
+                    if self.stats.enabled:
+                        self.stats.count(
+                            ppt.filepath, bytes_read=os.path.getsize(ppt.filepath)
+                        )
+                    ppt.setRecord(record)
+                if self.checkError(ppt):
+                    yield ppt
+
     def yieldSlides(
         self,
         ppt,
@@ -434,25 +1167,38 @@ class SlideWalker(object):
                 print(slide.summary())
             yield slide
 
-    def dumpInfo(
+    def yieldInfo(
         self,
-        outputFormat: str,
         excludeHiddenSlides: bool = False,
         runDelim: str = None,
         slideDetails: bool = False,
+        workers: int = 1,
+        verbose: bool = False,
+        sortByBasename: bool = False,
+        groupByBasename: bool = False,
     ):
         """
-        dump information about the lecture in the given format
+        generate the information about the presentations one presentation at a time
 
         Args:
-            outputFormat(str): csv, json or txt
             excludeHiddenSlides(bool): If True hidden lecture will be excluded and also ignored in the page counting
             runDelim(str): the delimiter to use for powerpoint slide text
+            slideDetails(bool): if True and verbose show a summary of each slide
+            workers(int): number of worker processes for the extraction
+            verbose(bool): if True show information about the processing
+            sortByBasename(bool): if True generate the presentations ordered by basename
+            groupByBasename(bool): if True generate presentations with the same
+                basename one after the other
+
+        Yields:
+            tuple: basename and presentation summary dict with the slide records
         """
-        info = {}
-        csvRecords = []
-        verbose = self.debug or outputFormat == "txt"
-        for ppt in self.yieldPowerPointFiles(verbose):
+        for ppt in self.yieldPowerPointFiles(
+            verbose,
+            workers=workers,
+            sortByBasename=sortByBasename,
+            groupByBasename=groupByBasename,
+        ):
             pptSummary = ppt.asDict()
             if verbose:
                 print(f"{ppt.summary()}")
@@ -460,48 +1206,235 @@ class SlideWalker(object):
             for slide in self.yieldSlides(
                 ppt, verbose, excludeHiddenSlides, runDelim, slideDetails=slideDetails
             ):
-                slideRecord = slide.asDict()
+                slideSummary.append(slide.asDict())
+            pptSummary["slides"] = slideSummary
+            yield ppt.basename, pptSummary
+
+    def writeJson(self, infoIter, output: TextIO):
+        """
+        stream the given presentation information as a JSON object
+        giving the same result as json.dumps(info, indent=2) of the
+        complete dict without keeping it in memory
+
+        as in the dict the last of consecutive presentations with the same
+        basename wins - see yieldInfo(groupByBasename=True)
+
+        Args:
+            infoIter: iterable of (basename, presentation summary) tuples
+            output(TextIO): the stream to write to
+        """
+        delim = "{\n"
+        pending = None
+        for basename, pptSummary in itertools.chain(infoIter, [(None, None)]):
+            if pending is not None and pending[0] != basename:
+                with self.stats.phase("serialize"):
+                    key = json.dumps(pending[0], ensure_ascii=False)
+                    value = json.dumps(
+                        pending[1], indent=2, default=str, ensure_ascii=False
+                    )
+                    # JSON strings never contain raw newlines so this only indents the lines
+                    value = value.replace("\n", "\n  ")
+                    output.write(f"{delim}  {key}: {value}")
+                delim = ",\n"
+            pending = (basename, pptSummary)
+        output.write("{}\n" if delim == "{\n" else "\n}\n")
+
+    def writeNdJson(self, infoIter, output: TextIO):
+        """
+        stream the given presentation information as newline delimited JSON
+        with one record per presentation
+
+        Args:
+            infoIter: iterable of (basename, presentation summary) tuples
+            output(TextIO): the stream to write to
+        """
+        for basename, pptSummary in infoIter:
+            with self.stats.phase("serialize"):
+                record = {"basename": basename, **pptSummary}
+                line = json.dumps(record, default=str, ensure_ascii=False)
+                output.write(f"{line}\n")
+                output.flush()
+
+    def yieldCsvRecords(
+        self, infoIter, withText: bool = False, withNotes: bool = False
+    ):
+        """
+        generate the CSV records for the slides of the given presentation information
+
+        the slides of consecutive presentations with the same basename are
+        ordered by page so that presentations ordered by basename give the
+        rows ordered by basename and page
+
+        Args:
+            infoIter: iterable of (basename, presentation summary) tuples
+            withText(bool): if True add a text column
+            withNotes(bool): if True add a notes column
+        """
+        for basename, group in itertools.groupby(infoIter, key=lambda info: info[0]):
+            slideRecords = [
+                slideRecord
+                for _basename, pptSummary in group
+                for slideRecord in pptSummary["slides"]
+            ]
+            # stable - equal pages keep the order of the presentations
+            slideRecords.sort(key=lambda slideRecord: int(slideRecord["page"]))
+            for slideRecord in slideRecords:
                 csvRecord = OrderedDict()
-                csvRecord["basename"] = ppt.basename
+                csvRecord["basename"] = basename
                 csvRecord["page"] = slideRecord["page"]
                 csvRecord["name"] = slideRecord["name"]
                 title = "".join(slideRecord["title"].split())
                 csvRecord["title"] = title
-                csvRecords.append(csvRecord)
-                slideSummary.append(slideRecord)
-            pptSummary["slides"] = slideSummary
-            info[ppt.basename] = pptSummary
+                if withText:
+                    csvRecord["text"] = "\n".join(slideRecord["text"])
+                if withNotes:
+                    csvRecord["notes"] = slideRecord["notes"]
+                yield csvRecord
+
+    def writeSqlite(
+        self,
+        dbPath: str,
+        excludeHiddenSlides: bool = False,
+        runDelim: str = None,
+        workers: int = 1,
+        verbose: bool = False,
+    ) -> dict:
+        """
+        write the information about the presentations to the given SQLite database
+        only added, changed and removed presentations are updated
+
+        Args:
+            dbPath(str): the path of the database file
+            excludeHiddenSlides(bool): If True hidden lecture will be excluded and also ignored in the page counting
+            runDelim(str): the delimiter to use for powerpoint slide text
+            workers(int): number of worker processes for the extraction
+            verbose(bool): if True show information about the processing
+
+        Returns:
+            dict: the number of updated, unchanged and removed presentations
+        """
+        exporter = SqliteExporter(dbPath)
+        try:
+            # content of other settings can not be reused
+            settings = {
+                "excludeHiddenSlides": excludeHiddenSlides,
+                "runDelim": runDelim,
+                "engine": self.engine,
+            }
+            exporter.check_settings(settings)
+            with self.stats.phase("find"):
+                pptxFiles = self.findFiles(self.rootFolder, ".pptx")
+            exported = exporter.get_fingerprints()
+            fingerprints = {}
+            changed = []
+            for pptxFile in pptxFiles:
+                relpath = os.path.relpath(pptxFile, self.rootFolder)
+                stat = os.stat(pptxFile)
+                fingerprints[relpath] = (stat.st_size, stat.st_mtime)
+                if exported.get(relpath) != fingerprints[relpath]:
+                    changed.append(pptxFile)
+            removed = [path for path in exported if path not in fingerprints]
+            exporter.remove(removed)
+            updated = 0
+            for ppt in self.yieldPowerPointFiles(
+                verbose, workers=workers, pptxFiles=changed
+            ):
+                slideRecords = [
+                    slide.asDict()
+                    for slide in self.yieldSlides(
+                        ppt, verbose, excludeHiddenSlides, runDelim
+                    )
+                ]
+                size, mtime = fingerprints[ppt.relpath]
+                with self.stats.phase("serialize", ppt.filepath):
+                    pptRecord = {"basename": ppt.basename, **ppt.asDict()}
+                    exporter.upsert(ppt.relpath, pptRecord, slideRecords, size, mtime)
+                updated += 1
+        finally:
+            exporter.close()
+        result = {
+            "updated": updated,
+            "unchanged": len(pptxFiles) - len(changed),
+            "removed": len(removed),
+        }
+        return result
+
+    def dumpInfo(
+        self,
+        outputFormat: str,
+        excludeHiddenSlides: bool = False,
+        runDelim: str = None,
+        slideDetails: bool = False,
+        workers: int = 1,
+        output: TextIO = None,
+        withText: bool = False,
+        withNotes: bool = False,
+    ):
+        """
+        dump information about the lecture in the given format
+
+        Args:
+            outputFormat(str): csv, json, ndjson, lod or txt
+            excludeHiddenSlides(bool): If True hidden lecture will be excluded and also ignored in the page counting
+            runDelim(str): the delimiter to use for powerpoint slide text
+            workers(int): number of worker processes for the extraction
+            output(TextIO): the stream to write to - default: stdout
+            withText(bool): if True add a text column to the csv output
+            withNotes(bool): if True add a notes column to the csv output
+        """
+        if output is None:
+            output = sys.stdout
+        verbose = self.debug or outputFormat == "txt"
+        infoIter = self.yieldInfo(
+            excludeHiddenSlides,
+            runDelim,
+            slideDetails=slideDetails,
+            workers=workers,
+            verbose=verbose,
+            # csv rows are ordered by basename and page
+            sortByBasename=outputFormat == "csv",
+            # duplicate basenames are single json keys
+            groupByBasename=outputFormat == "json",
+        )
+        info = None
         if outputFormat == "json":
-            #
-            # avoid the windows horror story
-            # https://stackoverflow.com/questions/9233027/unicodedecodeerror-charmap-codec-cant-decode-byte-x-in-position-y-character
-            # https://stackoverflow.com/a/18337754/1497139
-            jsonStr = json.dumps(
-                info, indent=2, default=str, ensure_ascii=False
-            ).encode("utf8")
-            print(jsonStr.decode("utf-8"))
+            # streamed to avoid keeping the whole corpus in memory
+            self.writeJson(infoIter, output)
+        elif outputFormat == "ndjson":
+            self.writeNdJson(infoIter, output)
         elif outputFormat == "csv":
-            sortedCsvRecords = sorted(
-                csvRecords, key=lambda row: (row["basename"], int(row["page"]))
-            )
-            csvText = self.asCsv(
-                sortedCsvRecords, ["basename", "page", "name", "title"]
-            )
-            print(csvText)
-        elif outputFormat == "lod":
+            fieldNames = list(self.csvFieldNames)
+            if withText:
+                fieldNames.append("text")
+            if withNotes:
+                fieldNames.append("notes")
+            csvRecords = self.yieldCsvRecords(infoIter, withText, withNotes)
+            self.writeCsv(csvRecords, output, fieldNames)
+            # keep the empty last line of the former print based output
+            output.write("\n")
+        else:
+            info = {}
+            for basename, pptSummary in infoIter:
+                info[basename] = pptSummary
+        if outputFormat == "lod":
             return info
 
-    def dumpInfoToString(self, outputFormat: str, excludeHiddenSlides: bool = True):
+    def dumpInfoToString(
+        self, outputFormat: str, excludeHiddenSlides: bool = True, workers: int = 1
+    ):
         """
         dump information about the presentations in the given format
 
         Args:
             outputFormat(str): csv, json or txt
             excludeHiddenSlides(bool): If True hidden lecture will be excluded and also ignored in the page counting
+            workers(int): number of worker processes for the extraction
         """
         f = StringIO()
         with redirect_stdout(f):
-            self.dumpInfo(outputFormat, excludeHiddenSlides=excludeHiddenSlides)
+            self.dumpInfo(
+                outputFormat, excludeHiddenSlides=excludeHiddenSlides, workers=workers
+            )
         stdout = f.getvalue()
         return stdout
 
@@ -550,7 +1483,28 @@ def main(argv=None):
             "-f",
             "--format",
             default="json",
-            help="output format to create: csv,json or txt (default: %(default)s)",
+            help="output format to create: csv,json,ndjson,sqlite or txt (default: %(default)s)",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            help="file to write the output to (default: stdout) - required for sqlite",
+        )
+        parser.add_argument(
+            "--engine",
+            choices=PPT.engines,
+            default="pptx",
+            help="slide extraction engine (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--withText",
+            action="store_true",
+            help="add a text column to the csv output (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--withNotes",
+            action="store_true",
+            help="add a notes column to the csv output (default: %(default)s)",
         )
         parser.add_argument(
             "--includeHidden",
@@ -564,7 +1518,41 @@ def main(argv=None):
             help="text run delimiter (default: %(default)s) suggested: ＿↵•",
             default=Slide.defaultRunDelim,
         )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="number of worker processes for the extraction (default: %(default)s)",
+        )
         parser.add_argument("--rootPath", default=".")
+        parser.add_argument(
+            "--cacheDir",
+            default=SlideCache.default_cache_dir(),
+            help="directory of the persistent extraction cache (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--cacheHash",
+            action="store_true",
+            help="validate cache entries by content hash (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--no-cache",
+            dest="noCache",
+            action="store_true",
+            help="do not use the persistent extraction cache",
+        )
+        parser.add_argument(
+            "--rebuild-cache",
+            dest="rebuildCache",
+            action="store_true",
+            help="discard and rebuild the persistent extraction cache",
+        )
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="show timing statistics per phase and the slowest decks on stderr",
+        )
         parser.add_argument(
             "-V", "--version", action="version", version=program_version_message
         )
@@ -574,12 +1562,59 @@ def main(argv=None):
             print(f"see {Version.doc_url}")
             webbrowser.open(Version.doc_url)
         else:
-            sw = SlideWalker(args.rootPath, args.debug)
-            sw.dumpInfo(
-                args.format,
-                excludeHiddenSlides=not args.includeHidden,
-                runDelim=args.runDelim,
+            cache = None
+            if not args.noCache:
+                cache = SlideCache(
+                    args.cacheDir, use_hash=args.cacheHash, rebuild=args.rebuildCache
+                )
+            sw = SlideWalker(
+                args.rootPath,
+                args.debug,
+                cache=cache,
+                engine=args.engine,
+                stats=WalkStats(enabled=args.stats),
+            )
+            # avoid the windows horror story
+            # https://stackoverflow.com/questions/9233027/unicodedecodeerror-charmap-codec-cant-decode-byte-x-in-position-y-character
+            output = (
+                open(args.output, "w", encoding="utf-8")
+                if args.output and args.format != "sqlite"
+                else None
             )
+            try:
+                if args.format == "sqlite":
+                    if not args.output:
+                        raise ValueError("the sqlite format needs an --output database")
+                    result = sw.writeSqlite(
+                        args.output,
+                        excludeHiddenSlides=not args.includeHidden,
+                        runDelim=args.runDelim,
+                        workers=args.jobs,
+                        verbose=args.debug,
+                    )
+                    sys.stderr.write(
+                        f"{result['updated']} presentations updated, "
+                        f"{result['unchanged']} unchanged, {result['removed']} removed\n"
+                    )
+                else:
+                    sw.dumpInfo(
+                        args.format,
+                        excludeHiddenSlides=not args.includeHidden,
+                        runDelim=args.runDelim,
+                        workers=args.jobs,
+                        output=output,
+                        withText=args.withText,
+                        withNotes=args.withNotes,
+                    )
+            finally:
+                if output:
+                    output.close()
+            for filepath, error in sw.failures:
+                sys.stderr.write(f"failed to read {filepath}: {error}\n")
+            if cache:
+                sys.stderr.write(cache.stats.summary() + "\n")
+            if args.stats:
+                sys.stderr.write(sw.stats.summary() + "\n")
 
     except KeyboardInterrupt:
         ### handle keyboard interrupt ###
@@ -0,0 +1,301 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import suppress
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    # LibreOffice's python bridge - only available with a LibreOffice installation
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+
+
+class SofficeInstance:
+    """
+    a headless soffice process listening on a local socket
+    that converts documents to PDF via UNO
+    """
+
+    def __init__(
+        self,
+        port: Optional[int],
+        profile_dir: str,
+        max_conversions: int = 200,
+        start_timeout: float = 60.0,
+    ):
+        """
+        constructor
+
+        Args:
+            port(int): the local port to listen on - None for a free port
+                picked on each start
+            profile_dir(str): the separate LibreOffice user profile directory
+            max_conversions(int): number of conversions after which the instance is
+                restarted to release leaked memory
+            start_timeout(float): seconds to wait for the instance to accept connections
+        """
+        self.port = port
+        self.pick_port = port is None
+        self.profile_dir = profile_dir
+        self.max_conversions = max_conversions
+        self.start_timeout = start_timeout
+        # guards process and desktop against a concurrent kill by the timeout timer
+        self.lock = threading.Lock()
+        self.process = None
+        self.desktop = None
+        self.conversions = 0
+
+    @staticmethod
+    def get_free_port() -> int:
+        """
+        get a currently unused local port
+        """
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        return port
+
+    def get_cmd(self) -> List[str]:
+        """
+        get the command line to start the instance
+        """
+        profile_url = Path(self.profile_dir).absolute().as_uri()
+        cmd = [
+            "soffice",
+            f"-env:UserInstallation={profile_url}",
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext",
+        ]
+        return cmd
+
+    def is_alive(self) -> bool:
+        """
+        check whether my soffice process is running
+        """
+        process = self.process
+        alive = process is not None and process.poll() is None
+        return alive
+
+    def start(self):
+        """
+        start the soffice process and connect to it
+        """
+        if self.pick_port:
+            self.port = SofficeInstance.get_free_port()
+        process = subprocess.Popen(
+            self.get_cmd(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        with self.lock:
+            self.process = process
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context
+        )
+        url = f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+        deadline = time.time() + self.start_timeout
+        while True:
+            try:
+                context = resolver.resolve(url)
+                break
+            except Exception:
+                if time.time() > deadline or not self.is_alive():
+                    self.kill()
+                    raise RuntimeError(f"soffice on port {self.port} did not start")
+                time.sleep(0.25)
+        if not self.is_alive():
+            # e.g. the port was taken in the meantime - not our listener
+            self.kill()
+            raise RuntimeError(f"soffice on port {self.port} is not mine")
+        desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+        with self.lock:
+            self.desktop = desktop
+        self.conversions = 0
+
+    def kill(self):
+        """
+        kill my soffice process group - safe to be called concurrently
+        """
+        with self.lock:
+            process = self.process
+            self.process = None
+            self.desktop = None
+        if process is not None:
+            if process.poll() is None:
+                # the process may exit in the meantime
+                with suppress(ProcessLookupError):
+                    os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+    def restart(self):
+        """
+        restart e.g. after a crash or to release memory
+        """
+        self.kill()
+        self.start()
+
+    @staticmethod
+    def props(**kwargs) -> tuple:
+        """
+        get a tuple of UNO PropertyValues for the given keyword arguments
+        """
+        props = []
+        for name, value in kwargs.items():
+            prop = PropertyValue()
+            prop.Name = name
+            prop.Value = value
+            props.append(prop)
+        return tuple(props)
+
+    def convert(self, pptx_path: Path, pdf_file: Path):
+        """
+        convert the given presentation to the given PDF file
+
+        Args:
+            pptx_path(Path): the presentation
+            pdf_file(Path): the PDF file to write
+        """
+        if not self.is_alive() or self.conversions >= self.max_conversions:
+            self.restart()
+        self.conversions += 1
+        desktop = self.desktop
+        if desktop is None:
+            raise RuntimeError(f"soffice on port {self.port} has been killed")
+        doc = desktop.loadComponentFromURL(
+            Path(pptx_path).absolute().as_uri(), "_blank", 0, self.props(Hidden=True)
+        )
+        if doc is None:
+            raise RuntimeError(f"soffice could not load {pptx_path}")
+        try:
+            doc.storeToURL(
+                Path(pdf_file).absolute().as_uri(),
+                self.props(FilterName="impress_pdf_Export"),
+            )
+        finally:
+            doc.close(True)
+
+
+class SofficeService:
+    """
+    a pool of long-lived soffice instances avoiding the
+    start up cost of one soffice launch per document
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        profile_dir: str,
+        max_conversions: int = 200,
+        timeout: float = None,
+    ):
+        """
+        constructor
+
+        Args:
+            workers(int): the number of soffice instances
+            profile_dir(str): the base directory of the per service instance profiles
+            max_conversions(int): conversions after which an instance is restarted
+            timeout(float): optional timeout per conversion in seconds
+        """
+        self.workers = workers
+        self.timeout = timeout
+        os.makedirs(profile_dir, exist_ok=True)
+        # a separate directory per service - concurrent services must not share a profile
+        self.run_dir = tempfile.mkdtemp(prefix="uno", dir=profile_dir)
+        self.instances = [
+            SofficeInstance(
+                None,
+                os.path.join(self.run_dir, f"uno{i}"),
+                max_conversions=max_conversions,
+            )
+            for i in range(workers)
+        ]
+        self.idle = queue.Queue()
+        for instance in self.instances:
+            self.idle.put(instance)
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        check whether the UNO python bridge is available
+        """
+        return uno is not None
+
+    def start(self):
+        """
+        start all instances
+        """
+        for instance in self.instances:
+            instance.start()
+
+    def stop(self):
+        """
+        stop all instances and remove their profiles
+        """
+        for instance in self.instances:
+            instance.kill()
+        shutil.rmtree(self.run_dir, ignore_errors=True)
+
+    def convert(self, pptx_path: Path, pdf_path) -> subprocess.CompletedProcess:
+        """
+        convert the given presentation with the next idle instance
+
+        Args:
+            pptx_path(Path): the presentation
+            pdf_path(str | Path): Directory for output .pdf files.
+
+        Returns:
+            subprocess.CompletedProcess: the result in the form of the subprocess backend
+        """
+        pdf_file = Path(pdf_path) / f"{pptx_path.stem}.pdf"
+        Path(pdf_path).mkdir(parents=True, exist_ok=True)
+        instance = self.idle.get()
+        returncode = 0
+        stderr = ""
+        timer = None
+        if self.timeout is not None:
+            # a hung conversion can only be stopped by killing the instance
+            timer = threading.Timer(self.timeout, instance.kill)
+            timer.start()
+        try:
+            instance.convert(pptx_path, pdf_file)
+        except Exception as ex:
+            returncode = 1
+            stderr = f"Error: {ex}"
+            if timer is not None and not timer.is_alive():
+                stderr = f"Error: killed after timeout of {self.timeout}s"
+            # the next conversion will restart the instance
+            instance.kill()
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self.idle.put(instance)
+        result = subprocess.CompletedProcess(
+            args=["uno", str(pptx_path)],
+            returncode=returncode,
+            stdout="",
+            stderr=stderr,
+        )
+        return result
@@ -0,0 +1,298 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import sqlite3
+from typing import Dict, List, Tuple
+
+from slides.keyvalue_parser import (
+    BaseKeyValueParser,
+    Keydef,
+    KeyValueParserConfig,
+    KeyValueSplitParser,
+)
+
+
+class SqliteExporter:
+    """
+    export of presentations and slides to normalized SQLite tables
+    with a full text index over the titles, texts and notes of the slides
+
+    presentations are upserted - a re-run only replaces the rows of
+    changed presentations which are recognized by size and modification time
+    """
+
+    schema_version = 1
+    tables = ["key_value", "slide_fts", "slide", "presentation", "export_setting"]
+    # notes keys with comma separated values
+    list_keys = ["Keywords", "Literature"]
+
+    def __init__(
+        self, db_path: str, parser: BaseKeyValueParser = None, batch_size: int = 100
+    ):
+        """
+        constructor
+
+        Args:
+            db_path(str): the path of the database file
+            parser(BaseKeyValueParser): the parser for the key/values of the notes
+                - default: a parser splitting the values of my list keys
+            batch_size(int): number of presentations per transaction
+        """
+        self.db_path = db_path
+        if parser is None:
+            parser = KeyValueSplitParser(KeyValueParserConfig(record_delim="\n"))
+            parser.setKeydefs(
+                [Keydef(key, key, True) for key in SqliteExporter.list_keys]
+            )
+        self.parser = parser
+        self.batch_size = batch_size
+        self.pending = 0
+        self.conn = sqlite3.connect(db_path)
+        self.create_schema()
+
+    def create_schema(self, rebuild: bool = False):
+        """
+        create my database schema - dropping outdated or unwanted content
+
+        Args:
+            rebuild(bool): if True drop all existing content
+        """
+        with self.conn:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if rebuild or version != SqliteExporter.schema_version:
+                for table in SqliteExporter.tables:
+                    self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS export_setting (
+                name TEXT PRIMARY KEY,
+                value TEXT
+                )""")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS presentation (
+                id INTEGER PRIMARY KEY,
+                path TEXT UNIQUE,
+                basename TEXT,
+                title TEXT,
+                author TEXT,
+                created TEXT,
+                size INTEGER,
+                mtime REAL,
+                slide_count INTEGER
+                )""")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS slide (
+                id INTEGER PRIMARY KEY,
+                presentation_id INTEGER REFERENCES presentation(id),
+                page INTEGER,
+                pdf_page INTEGER,
+                name TEXT,
+                title TEXT,
+                text TEXT,
+                notes TEXT,
+                UNIQUE (presentation_id, page)
+                )""")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS key_value (
+                slide_id INTEGER REFERENCES slide(id),
+                key TEXT,
+                position INTEGER,
+                value TEXT
+                )""")
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS key_value_slide ON key_value(slide_id)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS key_value_key ON key_value(key, value)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS slide_name ON slide(name)")
+            self.conn.execute("""CREATE VIRTUAL TABLE IF NOT EXISTS slide_fts
+                USING fts5(title, text, notes)""")
+            self.conn.execute(f"PRAGMA user_version={SqliteExporter.schema_version}")
+
+    def check_settings(self, settings: dict) -> bool:
+        """
+        check that the given export settings are the ones of the existing
+        content - dropping the content otherwise
+
+        Args:
+            settings(dict): the settings that influence the exported content
+
+        Returns:
+            bool: True if the existing content was kept
+        """
+        value = json.dumps(settings, sort_keys=True)
+        row = self.conn.execute(
+            "SELECT value FROM export_setting WHERE name='settings'"
+        ).fetchone()
+        kept = row is not None and row[0] == value
+        if not kept:
+            self.create_schema(rebuild=True)
+            with self.conn:
+                self.conn.execute(
+                    "INSERT INTO export_setting VALUES ('settings', ?)", (value,)
+                )
+        return kept
+
+    def get_fingerprints(self) -> Dict[str, Tuple[int, float]]:
+        """
+        get the size and modification time of the exported presentations by path
+        """
+        rows = self.conn.execute("SELECT path,size,mtime FROM presentation")
+        fingerprints = {path: (size, mtime) for path, size, mtime in rows}
+        return fingerprints
+
+    def delete_slides(self, presentation_id: int):
+        """
+        delete the slides of the given presentation including their
+        key/values and full text index entries
+        """
+        slide_ids = "SELECT id FROM slide WHERE presentation_id=?"
+        self.conn.execute(
+            f"DELETE FROM key_value WHERE slide_id IN ({slide_ids})", (presentation_id,)
+        )
+        self.conn.execute(
+            f"DELETE FROM slide_fts WHERE rowid IN ({slide_ids})", (presentation_id,)
+        )
+        self.conn.execute(
+            "DELETE FROM slide WHERE presentation_id=?", (presentation_id,)
+        )
+
+    def upsert(
+        self,
+        path: str,
+        ppt_record: dict,
+        slide_records: List[dict],
+        size: int,
+        mtime: float,
+    ):
+        """
+        insert or replace the given presentation and its slides
+
+        Args:
+            path(str): the path of the presentation relative to the root folder
+            ppt_record(dict): the presentation summary
+            slide_records(List[dict]): the slide summaries
+            size(int): the file size
+            mtime(float): the file modification time
+        """
+        created = ppt_record.get("created")
+        self.conn.execute(
+            """INSERT INTO presentation
+            (path,basename,title,author,created,size,mtime,slide_count)
+            VALUES (?,?,?,?,?,?,?,?)
+            ON CONFLICT(path) DO UPDATE SET
+            basename=excluded.basename,title=excluded.title,author=excluded.author,
+            created=excluded.created,size=excluded.size,mtime=excluded.mtime,
+            slide_count=excluded.slide_count""",
+            (
+                path,
+                ppt_record.get("basename"),
+                ppt_record.get("title"),
+                ppt_record.get("author"),
+                str(created) if created is not None else None,
+                size,
+                mtime,
+                len(slide_records),
+            ),
+        )
+        presentation_id = self.conn.execute(
+            "SELECT id FROM presentation WHERE path=?", (path,)
+        ).fetchone()[0]
+        self.delete_slides(presentation_id)
+        self.conn.executemany(
+            """INSERT INTO slide (presentation_id,page,pdf_page,name,title,text,notes)
+            VALUES (?,?,?,?,?,?,?)""",
+            [
+                (
+                    presentation_id,
+                    record["page"],
+                    record.get("pdf_page"),
+                    record["name"],
+                    record["title"],
+                    "\n".join(record["text"]),
+                    record["notes"],
+                )
+                for record in slide_records
+            ],
+        )
+        slide_ids = dict(
+            self.conn.execute(
+                "SELECT page,id FROM slide WHERE presentation_id=?", (presentation_id,)
+            )
+        )
+        table = self.parser.getKeyValuesBulk([r["notes"] for r in slide_records])
+        key_values = []
+        for record, row in zip(slide_records, table.rows):
+            for key, value in (row or {}).items():
+                values = value if isinstance(value, list) else [value]
+                for position, item in enumerate(values):
+                    key_values.append((slide_ids[record["page"]], key, position, item))
+        self.conn.executemany("INSERT INTO key_value VALUES (?,?,?,?)", key_values)
+        self.conn.execute(
+            """INSERT INTO slide_fts (rowid,title,text,notes)
+            SELECT id,title,text,notes FROM slide WHERE presentation_id=?""",
+            (presentation_id,),
+        )
+        self.batch()
+
+    def remove(self, paths: List[str]):
+        """
+        remove the given presentations
+
+        Args:
+            paths(List[str]): the paths of the presentations
+        """
+        for path in paths:
+            row = self.conn.execute(
+                "SELECT id FROM presentation WHERE path=?", (path,)
+            ).fetchone()
+            if row:
+                self.delete_slides(row[0])
+                self.conn.execute("DELETE FROM presentation WHERE id=?", row)
+                self.batch()
+
+    def batch(self):
+        """
+        commit after every batch_size changes
+        """
+        self.pending += 1
+        if self.pending >= self.batch_size:
+            self.commit()
+
+    def commit(self):
+        """
+        commit the pending changes
+        """
+        self.conn.commit()
+        self.pending = 0
+
+    def close(self):
+        """
+        commit the pending changes and close my database connection
+        """
+        self.commit()
+        self.conn.close()
+
+    def search(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        search the slides with the given full text query
+
+        Args:
+            query(str): an FTS5 query e.g. "semantic AND slides"
+            limit(int): the maximum number of results
+
+        Returns:
+            List[dict]: path, page, name and title of the best matches first
+        """
+        rows = self.conn.execute(
+            """SELECT p.path,s.page,s.name,s.title FROM slide_fts
+            JOIN slide s ON s.id=slide_fts.rowid
+            JOIN presentation p ON p.id=s.presentation_id
+            WHERE slide_fts MATCH ? ORDER BY rank LIMIT ?""",
+            (query, limit),
+        )
+        hits = [
+            {"path": path, "page": page, "name": name, "title": title}
+            for path, page, name, title in rows
+        ]
+        return hits
@@ -0,0 +1,158 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+from slides.versioned_cache import VersionedCache
+
+
+class ThumbnailCache(VersionedCache):
+    """
+    cache of PNG thumbnails of PDF pages keyed by path, size and
+    modification time of the PDF rendered with pdftoppm (poppler)
+    in a background pool
+    """
+
+    # fixed thumbnail widths in pixels
+    sizes = {"small": 160, "medium": 480, "large": 1280}
+
+    def __init__(self, cache_dir: str, workers: int = 2, timeout: float = 60.0):
+        """
+        constructor
+
+        Args:
+            cache_dir(str): the directory of the PNG files
+            workers(int): number of concurrent pdftoppm processes
+            timeout(float): timeout per rendering in seconds
+        """
+        super().__init__(cache_dir)
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="thumbnails"
+        )
+        # renderings in progress by cache file
+        self.pending: Dict[str, Future] = {}
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        check whether pdftoppm is installed
+        """
+        return shutil.which("pdftoppm") is not None
+
+    def get_path(self, pdf_file: str, page: int, size: str) -> str:
+        """
+        get the cache file for the given page thumbnail
+
+        Args:
+            pdf_file(str): the PDF file
+            page(int): the 1-based page in the PDF
+            size(str): small, medium or large
+
+        Returns:
+            str: the path of the PNG file - which might not be rendered yet
+        """
+        version = self.get_version(pdf_file)
+        path = os.path.join(self.cache_dir, f"{version}-{page}-{size}.png")
+        return path
+
+    def render(self, pdf_file: str, page: int, size: str, path: str) -> str:
+        """
+        render the given page thumbnail to the given path
+
+        Args:
+            pdf_file(str): the PDF file
+            page(int): the 1-based page in the PDF
+            size(str): small, medium or large
+            path(str): the target PNG file
+
+        Returns:
+            str: the path of the PNG file
+        """
+        width = ThumbnailCache.sizes[size]
+        with tempfile.TemporaryDirectory(dir=self.cache_dir) as tmp:
+            prefix = os.path.join(tmp, "thumbnail")
+            cmd = [
+                "pdftoppm",
+                "-png",
+                "-f",
+                str(page),
+                "-l",
+                str(page),
+                "-scale-to-x",
+                str(width),
+                "-scale-to-y",
+                "-1",
+                "-singlefile",
+                pdf_file,
+                prefix,
+            ]
+            result = subprocess.run(
+                cmd, capture_output=True, text=True, timeout=self.timeout
+            )
+            if result.returncode != 0:
+                raise RuntimeError(
+                    f"pdftoppm failed for page {page} of {pdf_file}: {result.stderr.strip()}"
+                )
+            os.replace(f"{prefix}.png", path)
+        self.prune(self.get_version(pdf_file))
+        return path
+
+    def submit(self, pdf_file: str, page: int, size: str = "small") -> Future:
+        """
+        make sure the given page thumbnail gets rendered in the background
+
+        Args:
+            pdf_file(str): the PDF file
+            page(int): the 1-based page in the PDF
+            size(str): small, medium or large
+
+        Returns:
+            Future: a future for the path of the PNG file
+        """
+        path = self.get_path(pdf_file, page, size)
+        with self.lock:
+            future = self.pending.get(path)
+            if future is None:
+                if os.path.exists(path):
+                    future = Future()
+                    future.set_result(path)
+                else:
+                    future = self.executor.submit(
+                        self.render, pdf_file, page, size, path
+                    )
+                    self.pending[path] = future
+                    future.add_done_callback(
+                        lambda _future: self.pending.pop(path, None)
+                    )
+        return future
+
+    def get(self, pdf_file: str, page: int, size: str = "small") -> str:
+        """
+        get the given page thumbnail - rendering it if needed
+
+        Args:
+            pdf_file(str): the PDF file
+            page(int): the 1-based page in the PDF
+            size(str): small, medium or large
+
+        Returns:
+            str: the path of the PNG file
+        """
+        path = self.submit(pdf_file, page, size).result()
+        return path
+
+    def close(self):
+        """
+        stop the background pool
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
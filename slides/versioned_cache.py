@@ -0,0 +1,92 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict
+
+
+class VersionedCache:
+    """
+    on disk cache of files derived from source files
+    named by a version key of the source file
+    so that stale entries can be recognized and pruned
+    """
+
+    def __init__(self, cache_dir: str):
+        """
+        constructor
+
+        Args:
+            cache_dir(str): the directory of the cached files
+        """
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.lock = threading.Lock()
+        # last pruned version by path key
+        self.pruned: Dict[str, str] = {}
+
+    @staticmethod
+    def get_key(text: str) -> str:
+        """
+        get a short hash key of the given text
+
+        Args:
+            text(str): the text to hash
+
+        Returns:
+            str: the key
+        """
+        key = hashlib.sha256(text.encode()).hexdigest()[:16]
+        return key
+
+    def get_version(self, source_file: str) -> str:
+        """
+        get a version key of the given source file that changes whenever the file changes
+        - from the file state only so that the file is not read on the request thread
+        - prefixed by a key of the path to find the older versions of the same file
+
+        Args:
+            source_file(str): the source file
+
+        Returns:
+            str: the version key
+        """
+        stat = os.stat(source_file)
+        path_key = VersionedCache.get_key(os.path.abspath(source_file))
+        state_key = VersionedCache.get_key(f"{stat.st_size}|{stat.st_mtime_ns}")
+        version = f"{path_key}-{state_key}"
+        return version
+
+    def prune(self, version: str) -> int:
+        """
+        remove the cached files of older versions of the source file
+        of the given version - once per process and version
+
+        Args:
+            version(str): the current version key
+
+        Returns:
+            int: the number of removed files
+        """
+        path_key = version.split("-")[0]
+        with self.lock:
+            if self.pruned.get(path_key) == version:
+                return 0
+            self.pruned[path_key] = version
+        removed = 0
+        for filename in os.listdir(self.cache_dir):
+            if filename.startswith(f"{path_key}-") and not filename.startswith(
+                f"{version}-"
+            ):
+                try:
+                    os.remove(os.path.join(self.cache_dir, filename))
+                    removed += 1
+                except FileNotFoundError:
+                    # pruned concurrently
+                    pass
+        return removed
@@ -0,0 +1,229 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import bisect
+import contextlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+
+@dataclass
+class PhaseStats:
+    """
+    timing statistics of a processing phase
+    """
+
+    # upper bounds of the histogram buckets in seconds - the last bucket is open
+    bucket_bounds = [0.0001, 0.001, 0.01, 0.1, 1.0, 10.0]
+
+    name: str
+    count: int = 0
+    # exclusive time in seconds - time of nested phases is not included
+    total: float = 0.0
+    max: float = 0.0
+    histogram: List[int] = field(default_factory=lambda: [0] * 7)
+
+    def add(self, elapsed: float):
+        """
+        add the given elapsed time
+        """
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.histogram[bisect.bisect_left(PhaseStats.bucket_bounds, elapsed)] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass
+class DeckStats:
+    """
+    statistics of a single presentation
+    """
+
+    path: str
+    bytes_read: int = 0
+    slides: int = 0
+    shapes: int = 0
+    runs: int = 0
+    # exclusive time in seconds by phase
+    phases: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def elapsed(self) -> float:
+        return sum(self.phases.values())
+
+
+class WalkStats:
+    """
+    low overhead instrumentation of the phases of walking presentations
+    with counters and histograms per phase and per deck
+
+    disabled stats do not record anything and cost
+    little more than a method call per phase
+    """
+
+    phases = ["find", "open", "extract", "slides", "text", "serialize"]
+    _nullcontext = contextlib.nullcontext()
+
+    def __init__(self, enabled: bool = False):
+        """
+        constructor
+
+        Args:
+            enabled(bool): if True record timings and counters
+        """
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """
+        discard all recorded statistics
+        """
+        with self.lock:
+            self.phase_stats: Dict[str, PhaseStats] = {}
+            self.decks: Dict[str, DeckStats] = {}
+
+    def get_deck(self, path: str) -> DeckStats:
+        """
+        get the statistics of the deck with the given path - call with my lock held
+        """
+        deck = self.decks.get(path)
+        if deck is None:
+            deck = DeckStats(path)
+            self.decks[path] = deck
+        return deck
+
+    def phase(self, name: str, path: str = None):
+        """
+        get a context manager timing the given phase
+
+        Args:
+            name(str): the name of the phase
+            path(str): the path of the deck the phase works on if any
+        """
+        if not self.enabled:
+            return WalkStats._nullcontext
+        return self._timed(name, path)
+
+    @contextlib.contextmanager
+    def _timed(self, name: str, path: str):
+        # stack of the child time of the currently open phases of this thread
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            exclusive = elapsed - stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            with self.lock:
+                phase_stats = self.phase_stats.get(name)
+                if phase_stats is None:
+                    phase_stats = PhaseStats(name)
+                    self.phase_stats[name] = phase_stats
+                phase_stats.add(exclusive)
+                if path is not None:
+                    deck = self.get_deck(path)
+                    deck.phases[name] = deck.phases.get(name, 0.0) + exclusive
+
+    def count(self, path: str, **counters: int):
+        """
+        add the given counters e.g. slides=10 to the deck with the given path
+        """
+        if not self.enabled:
+            return
+        with self.lock:
+            deck = self.get_deck(path)
+            for counter, value in counters.items():
+                setattr(deck, counter, getattr(deck, counter) + value)
+
+    def slowest_decks(self, limit: int = 5) -> List[DeckStats]:
+        """
+        get the decks that took the most time
+
+        Args:
+            limit(int): the maximum number of decks
+
+        Returns:
+            List[DeckStats]: the slowest decks first
+        """
+        with self.lock:
+            decks = sorted(self.decks.values(), key=lambda deck: -deck.elapsed)
+        return decks[:limit]
+
+    def asDict(self) -> dict:
+        """
+        get my statistics as a dict
+        """
+        with self.lock:
+            phases = {
+                name: {
+                    "count": stats.count,
+                    "total": stats.total,
+                    "mean": stats.mean,
+                    "max": stats.max,
+                    "histogram": list(stats.histogram),
+                }
+                for name, stats in self.phase_stats.items()
+            }
+            decks = list(self.decks.values())
+        result = {
+            "phases": phases,
+            "decks": len(decks),
+            "bytes_read": sum(deck.bytes_read for deck in decks),
+            "slides": sum(deck.slides for deck in decks),
+            "shapes": sum(deck.shapes for deck in decks),
+            "runs": sum(deck.runs for deck in decks),
+        }
+        return result
+
+    def summary(self, limit: int = 5) -> str:
+        """
+        get a printable summary of my statistics
+
+        Args:
+            limit(int): the number of slowest decks to show
+        """
+        stats = self.asDict()
+        bounds = " ".join(f"≤{bound*1000:g}ms" for bound in PhaseStats.bucket_bounds)
+        lines = [
+            f"{stats['decks']} decks, {stats['bytes_read']} bytes, {stats['slides']} slides, "
+            f"{stats['shapes']} shapes, {stats['runs']} runs",
+            f"{'phase':10} {'count':>7} {'total s':>9} {'mean ms':>9} {'max ms':>9}  histogram {bounds} >",
+        ]
+        for name in WalkStats.phases + sorted(
+            set(stats["phases"]) - set(WalkStats.phases)
+        ):
+            phase = stats["phases"].get(name)
+            if phase:
+                histogram = " ".join(str(count) for count in phase["histogram"])
+                lines.append(
+                    f"{name:10} {phase['count']:7d} {phase['total']:9.3f} "
+                    f"{phase['mean']*1000:9.3f} {phase['max']*1000:9.3f}  {histogram}"
+                )
+        slowest = self.slowest_decks(limit)
+        if slowest:
+            lines.append("slowest decks:")
+            for deck in slowest:
+                phases = ", ".join(
+                    f"{name} {elapsed*1000:.1f}ms"
+                    for name, elapsed in deck.phases.items()
+                )
+                lines.append(
+                    f"  {deck.elapsed:8.3f} s {deck.path} ({deck.slides} slides: {phases})"
+                )
+        return "\n".join(lines)
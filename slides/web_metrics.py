@@ -0,0 +1,238 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import bisect
+import contextlib
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+
+class Histogram:
+    """
+    a cumulative histogram in the style of prometheus
+    """
+
+    def __init__(self, bounds: List[float]):
+        """
+        constructor
+
+        Args:
+            bounds(List[float]): the upper bounds of the buckets
+        """
+        self.bounds = bounds
+        # the last bucket is +Inf
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """
+        observe the given value
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """
+        get the cumulative bucket counts by "le" label
+        """
+        buckets = []
+        total = 0
+        for bound, count in zip(self.bounds + [None], self.counts):
+            total += count
+            le = "+Inf" if bound is None else f"{bound:g}"
+            buckets.append((le, total))
+        return buckets
+
+
+class WebMetrics:
+    """
+    request latency histograms, in flight requests and gauges
+    exposed in the prometheus text format
+    """
+
+    latency_bounds = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+    prefix = "slidebrowser"
+
+    def __init__(self):
+        """
+        constructor
+        """
+        self.lock = threading.Lock()
+        self.latencies: Dict[str, Histogram] = {}
+        self.in_flight: Dict[str, int] = {}
+        # (route, status) -> number of responses
+        self.responses: Dict[Tuple[str, int], int] = {}
+        # name -> (help, function giving a value or a dict of label value -> value, label name)
+        self.gauges: Dict[str, Tuple[str, Callable, str]] = {}
+
+    @staticmethod
+    def get_rss() -> Optional[int]:
+        """
+        get the resident set size of this process in bytes
+
+        Returns:
+            int: the size or None if it is not available e.g. on Windows
+        """
+        try:
+            with open("/proc/self/statm") as statm:
+                pages = int(statm.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            pass
+        try:
+            # unix only
+            import resource
+        except ImportError:
+            return None
+        # peak instead of current RSS - in KiB on linux and bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+    def add_gauge(self, name: str, help_text: str, func: Callable, label: str = "name"):
+        """
+        add a gauge evaluated when the metrics are rendered
+
+        Args:
+            name(str): the metric name without prefix
+            help_text(str): the description of the metric
+            func(Callable): function giving the value or a dict of label value -> value
+            label(str): the label name for dict values
+        """
+        self.gauges[name] = (help_text, func, label)
+
+    @contextlib.contextmanager
+    def track(self, route: str):
+        """
+        track a request to the given route
+        """
+        with self.lock:
+            self.in_flight[route] = self.in_flight.get(route, 0) + 1
+        status = 200
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as ex:
+            # e.g. HTTPException(status_code=404)
+            status = getattr(ex, "status_code", 500)
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.in_flight[route] -= 1
+                histogram = self.latencies.get(route)
+                if histogram is None:
+                    histogram = Histogram(WebMetrics.latency_bounds)
+                    self.latencies[route] = histogram
+                histogram.observe(elapsed)
+                key = (route, status)
+                self.responses[key] = self.responses.get(key, 0) + 1
+
+    def instrument(self, route: str) -> Callable:
+        """
+        get a decorator tracking the requests of the decorated
+        sync or async handler for the given route - the signature of
+        the handler stays visible for FastAPI and nicegui
+
+        Args:
+            route(str): the route pattern to use as label
+        """
+
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def wrapper(*args, **kwargs):
+                    with self.track(route):
+                        return await func(*args, **kwargs)
+
+            else:
+
+                @functools.wraps(func)
+                def wrapper(*args, **kwargs):
+                    with self.track(route):
+                        return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def format_labels(**labels) -> str:
+        """
+        format the given labels
+        """
+        escaped = []
+        for name, value in labels.items():
+            value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+            escaped.append(f'{name}="{value}"'.replace("\n", "\\n"))
+        return "{" + ",".join(escaped) + "}" if escaped else ""
+
+    def render(self) -> str:
+        """
+        render my metrics in the prometheus text exposition format
+        """
+        p = WebMetrics.prefix
+        lines = []
+        with self.lock:
+            latencies = {
+                route: (histogram.cumulative(), histogram.sum, histogram.count)
+                for route, histogram in self.latencies.items()
+            }
+            in_flight = dict(self.in_flight)
+            responses = dict(self.responses)
+        lines.append(f"# HELP {p}_request_duration_seconds request latency by route")
+        lines.append(f"# TYPE {p}_request_duration_seconds histogram")
+        for route, (buckets, total, count) in sorted(latencies.items()):
+            for le, bucket_count in buckets:
+                labels = self.format_labels(route=route, le=le)
+                lines.append(
+                    f"{p}_request_duration_seconds_bucket{labels} {bucket_count}"
+                )
+            labels = self.format_labels(route=route)
+            lines.append(f"{p}_request_duration_seconds_sum{labels} {total:.6f}")
+            lines.append(f"{p}_request_duration_seconds_count{labels} {count}")
+        lines.append(f"# HELP {p}_requests_total responses by route and status")
+        lines.append(f"# TYPE {p}_requests_total counter")
+        for (route, status), count in sorted(responses.items()):
+            labels = self.format_labels(route=route, status=status)
+            lines.append(f"{p}_requests_total{labels} {count}")
+        lines.append(f"# HELP {p}_requests_in_flight requests in progress by route")
+        lines.append(f"# TYPE {p}_requests_in_flight gauge")
+        for route, count in sorted(in_flight.items()):
+            lines.append(
+                f"{p}_requests_in_flight{self.format_labels(route=route)} {count}"
+            )
+        gauges = dict(self.gauges)
+        gauges["process_resident_memory_bytes"] = (
+            "resident set size of the process",
+            WebMetrics.get_rss,
+            None,
+        )
+        for name, (help_text, func, label) in gauges.items():
+            try:
+                value: Union[float, dict] = func()
+            except Exception:
+                # a failing gauge should not break the scrape
+                continue
+            if value is None:
+                # not available on this platform
+                continue
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} gauge")
+            if isinstance(value, dict):
+                for label_value, item in sorted(value.items()):
+                    labels = self.format_labels(**{label: label_value})
+                    lines.append(f"{p}_{name}{labels} {item}")
+            else:
+                lines.append(f"{p}_{name} {value}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,44 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import shutil
+import tempfile
+
+from slides.benchmark import Benchmark
+from tests.basetest import Basetest
+
+
+class TestBenchmark(Basetest):
+    """
+    test the benchmark suite
+    """
+
+    def test_benchmark(self):
+        """
+        test running the benchmarks on a tiny corpus and comparing two runs
+        """
+        corpus_dir = tempfile.mkdtemp(prefix="benchmark")
+        try:
+            benchmark = Benchmark(corpus_dir, sizes=[10], verbose=self.debug)
+            report = benchmark.run()
+            json.dumps(report)
+            names = [result["name"] for result in report["results"]]
+            for name in [
+                "SlideWalker.dumpInfo",
+                "PPTSet.load",
+                "Slide.getText",
+                "KeyValueParser[scanner].getKeyValues",
+                "SimpleKeyValueParser.getKeyValues",
+                "SlidesViewer.to_view_lod",
+            ]:
+                self.assertIn(name, names)
+            self.assertTrue(all(result["slides"] == 10 for result in report["results"]))
+            comparison = Benchmark.compare(report, report)
+            self.assertEqual(len(names), len(comparison))
+            self.assertAlmostEqual(1.0, comparison[0]["speedup"])
+        finally:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
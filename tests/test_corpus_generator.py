@@ -0,0 +1,87 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from slides.corpus_generator import CorpusConfig, CorpusGenerator
+from slides.keyvalue_parser import Keydef, KeyValueParserConfig, KeyValueSplitParser
+from slides.slidewalker import PPT, SlideWalker
+from tests.basetest import Basetest
+
+
+class TestCorpusGenerator(Basetest):
+    """
+    test the synthetic presentation corpus generator
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmp = Path(tempfile.mkdtemp(prefix="corpus"))
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_generate(self):
+        """
+        test generating a small deterministic corpus
+        """
+        config = CorpusConfig(slides=25, slides_per_deck=10)
+        paths = CorpusGenerator(config).generate(str(self.tmp / "a"))
+        self.assertEqual(3, len(paths))
+        other_paths = CorpusGenerator(config).generate(str(self.tmp / "b"))
+        for path, other_path in zip(paths, other_paths):
+            self.assertEqual(Path(path).read_bytes(), Path(other_path).read_bytes())
+        # an existing corpus is reused
+        mtime = Path(paths[0]).stat().st_mtime_ns
+        CorpusGenerator(config).generate(str(self.tmp / "a"))
+        self.assertEqual(mtime, Path(paths[0]).stat().st_mtime_ns)
+        # a smaller corpus replaces the decks
+        smaller = CorpusGenerator(CorpusConfig(slides=5, slides_per_deck=10))
+        self.assertEqual(1, len(smaller.generate(str(self.tmp / "a"))))
+        self.assertEqual(1, len(list((self.tmp / "a").glob("*.pptx"))))
+
+        ppt = PPT(other_paths[0])
+        ppt.open()
+        slides = ppt.getSlides()
+        self.assertEqual(10, len(slides))
+        self.assertEqual(9, len(ppt.getSlides(excludeHiddenSlides=True, force=True)))
+        kvp = KeyValueSplitParser(KeyValueParserConfig(record_delim="\n"))
+        kvp.setKeydefs(
+            [Keydef("Name", "name"), Keydef("Literature", "literature", True)]
+        )
+        key_values = kvp.getKeyValues(slides[0].getNotes())
+        self.assertEqual("deck0_slide1", key_values["name"])
+        self.assertIsInstance(key_values["literature"], list)
+        for slide in slides:
+            text = "".join(slide.getText())
+            self.assertFalse(any("\ue000" <= c <= "\uf8ff" for c in text))
+        info = SlideWalker(str(self.tmp / "b")).dumpInfo(
+            "lod", excludeHiddenSlides=False
+        )
+        self.assertEqual(25, sum(len(deck["slides"]) for deck in info.values()))
+
+    def test_keep_foreign_files(self):
+        """
+        test that only surplus generated decks of a previous corpus are removed
+        """
+        folder = self.tmp / "lectures"
+        folder.mkdir()
+        lecture = folder / "Lecture.pptx"
+        lecture.write_bytes(b"not generated")
+        (folder / "deck00007.pptx").write_bytes(b"not generated")
+        config = CorpusConfig(slides=20, slides_per_deck=10)
+        CorpusGenerator(config).generate(str(folder))
+        # without a manifest nothing is removed
+        self.assertTrue(lecture.exists())
+        self.assertTrue((folder / "deck00007.pptx").exists())
+        smaller = CorpusGenerator(CorpusConfig(slides=5, slides_per_deck=10))
+        smaller.generate(str(folder))
+        self.assertTrue(lecture.exists())
+        self.assertFalse((folder / "deck00001.pptx").exists())
+        self.assertTrue((folder / "deck00000.pptx").exists())
@@ -0,0 +1,211 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from slides.doi import DOI
+from slides.doi_cache import DOICache, DOICacheMiss
+from tests.basetest import Basetest
+
+
+class DOIStandIn:
+    """
+    local HTTP stand-in for doi.org serving a few known DOIs
+    """
+
+    bibtex = """@article{Parnas_1972,
+ title={On the criteria to be used in decomposing systems into modules},
+ journal={Communications of the ACM},
+ author={Parnas, D. L.},
+ year={1972}
+}"""
+
+    def __init__(self, dois: list = None, delay: float = 0.0, keep_alive: bool = False):
+        """
+        constructor
+
+        Args:
+            dois(list): the known DOIs - all others give a 404
+            delay(float): seconds to wait before each response
+            keep_alive(bool): if True keep connections open with HTTP/1.1
+        """
+        if dois is None:
+            dois = ["10.1145/361598.361623"]
+        self.dois = set(dois)
+        self.delay = delay
+        self.requests = []
+        # client addresses of the requests - one per connection
+        self.clients = set()
+        # status codes to return for the next requests e.g. 429
+        self.failures = []
+        # doi -> doi to redirect to
+        self.redirects = {}
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" if keep_alive else "HTTP/1.0"
+
+            def do_GET(self):
+                stand_in.handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        """
+        handle the given request
+        """
+        doi = request.path.lstrip("/")
+        accept = request.headers.get("Accept", "")
+        with self.lock:
+            self.requests.append((doi, accept))
+            self.clients.add(request.client_address)
+            failure = self.failures.pop(0) if self.failures else None
+        if self.delay:
+            threading.Event().wait(self.delay)
+        if failure or doi in self.redirects:
+            request.send_response(failure or 302)
+            if failure == 429:
+                request.send_header("Retry-After", "0")
+            if not failure:
+                request.send_header("Location", f"/{self.redirects[doi]}")
+            request.send_header("Content-Length", "0")
+            request.end_headers()
+            return
+        if doi not in self.dois:
+            request.send_error(404)
+            return
+        if "bibtex" in accept:
+            content = self.bibtex
+        else:
+            content = json.dumps({"DOI": doi, "title": f"Title of {doi}"})
+        body = content.encode("utf-8")
+        request.send_response(200)
+        request.send_header("Content-Type", f"{accept.split(';')[0]}; charset=utf-8")
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestDOICache(Basetest):
+    """
+    test the persistent DOI lookup cache
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.cache_dir = tempfile.mkdtemp(prefix="doi_cache")
+        self.stand_in = DOIStandIn()
+        self.doi_str = "10.1145/361598.361623"
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        self.stand_in.close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def get_doi(self, cache: DOICache, doi_str: str = None) -> DOI:
+        if doi_str is None:
+            doi_str = self.doi_str
+        return DOI(doi_str, cache=cache, base_url=self.stand_in.base_url)
+
+    def test_cached_lookups(self):
+        """
+        test that repeated lookups are served from the cache
+        """
+        cache = DOICache(self.cache_dir)
+        for _ in range(3):
+            meta = self.get_doi(cache).fetchCiteprocMeta()
+            self.assertEqual(self.doi_str, meta["DOI"])
+            btex = self.get_doi(cache).fetchBibTexDict()
+            self.assertEqual("1972", btex["year"])
+        # one request per accept header
+        self.assertEqual(2, len(self.stand_in.requests))
+        self.assertEqual(4, cache.stats.hits)
+        # the cache persists and DOIs are case insensitive
+        cache.close()
+        cache = DOICache(self.cache_dir)
+        meta = self.get_doi(cache, self.doi_str.upper()).fetchCiteprocMeta()
+        self.assertEqual(self.doi_str, meta["DOI"])
+        self.assertEqual(2, len(self.stand_in.requests))
+        if self.debug:
+            print(cache.stats.summary())
+
+    def test_ttl_and_negative_caching(self):
+        """
+        test expiry and the caching of unresolvable DOIs
+        """
+        cache = DOICache(self.cache_dir, ttl=60, negative_ttl=10)
+        unknown = self.get_doi(cache, "10.9999/unknown")
+        for _ in range(2):
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                unknown.fetchCiteprocMeta()
+            self.assertEqual(404, context.exception.code)
+        self.assertEqual(1, len(self.stand_in.requests))
+        self.assertEqual(1, cache.stats.negative_hits)
+        # temporary failures are not cached
+        self.stand_in.failures.append(503)
+        with self.assertRaises(urllib.error.HTTPError):
+            self.get_doi(cache).fetchCiteprocMeta()
+        self.get_doi(cache).fetchCiteprocMeta()
+        self.assertEqual(3, len(self.stand_in.requests))
+        # expire the entries
+        accept = "application/vnd.citationstyles.csl+json; charset=utf-8"
+        for doi in [self.doi_str, "10.9999/unknown"]:
+            response = cache.get(doi, accept)
+            cache.put(
+                doi, accept, response.status, response.content, response.fetched - 30
+            )
+        self.assertIsNotNone(cache.get(self.doi_str, accept))
+        self.assertIsNone(cache.get("10.9999/unknown", accept))
+        cache.ttl = 10
+        self.assertIsNone(cache.get(self.doi_str, accept))
+        self.get_doi(cache).fetchCiteprocMeta()
+        self.assertEqual(4, len(self.stand_in.requests))
+
+    def test_offline_and_import_export(self):
+        """
+        test seeding an offline cache by export and import
+        """
+        cache = DOICache(self.cache_dir)
+        self.get_doi(cache).fetchCiteprocMeta()
+        with self.assertRaises(urllib.error.HTTPError):
+            self.get_doi(cache, "10.9999/unknown").fetchCiteprocMeta()
+        export_path = os.path.join(self.cache_dir, "doi_seed.jsonl")
+        self.assertEqual(2, cache.export_entries(export_path))
+        requests = len(self.stand_in.requests)
+        offline = DOICache(os.path.join(self.cache_dir, "ci"), ttl=0, offline=True)
+        with self.assertRaises(DOICacheMiss):
+            self.get_doi(offline).fetchCiteprocMeta()
+        self.assertEqual(2, offline.import_entries(export_path))
+        # expired entries are still served when offline
+        meta = self.get_doi(offline).fetchCiteprocMeta()
+        self.assertEqual(self.doi_str, meta["DOI"])
+        with self.assertRaises(urllib.error.HTTPError):
+            self.get_doi(offline, "10.9999/unknown").fetchCiteprocMeta()
+        with self.assertRaises(DOICacheMiss):
+            self.get_doi(offline).fetchBibTexDict()
+        self.assertEqual(requests, len(self.stand_in.requests))
+        # older entries do not replace newer ones
+        accept = "application/vnd.citationstyles.csl+json; charset=utf-8"
+        offline.put(self.doi_str, accept, 200, '{"DOI": "newer"}')
+        self.assertEqual(0, offline.import_entries(export_path))
+        self.assertEqual("newer", self.get_doi(offline).fetchCiteprocMeta()["DOI"])
@@ -0,0 +1,135 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import shutil
+import tempfile
+import time
+import urllib.error
+
+from slides.doi import DOI
+from slides.doi_cache import DOICache
+from slides.doi_resolver import DOIResolver, RateLimiter
+from tests.basetest import Basetest
+from tests.test_doi_cache import DOIStandIn
+
+
+class TestDOIResolver(Basetest):
+    """
+    test the concurrent batch resolution of DOIs
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.dois = [f"10.5555/test.{i}" for i in range(16)]
+        self.stand_in = DOIStandIn(self.dois, delay=0.05, keep_alive=True)
+        self.resolvers = []
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        for resolver in self.resolvers:
+            resolver.close()
+        self.stand_in.close()
+
+    def get_resolver(self, **kwargs) -> DOIResolver:
+        kwargs.setdefault("rate", 0)
+        kwargs.setdefault("backoff", 0.01)
+        resolver = DOIResolver(base_url=self.stand_in.base_url, **kwargs)
+        self.resolvers.append(resolver)
+        return resolver
+
+    def test_resolve(self):
+        """
+        test deduplicated concurrent resolution over reused connections
+        """
+        resolver = self.get_resolver(workers=4)
+        dois = self.dois + [doi.upper() for doi in self.dois[:4]] + self.dois[:4]
+        start = time.perf_counter()
+        metas = resolver.resolve(dois, kind="citeproc")
+        elapsed = time.perf_counter() - start
+        self.assertEqual(len(set(dois)), len(metas))
+        self.assertEqual(self.dois[0], metas[self.dois[0].upper()]["DOI"])
+        # each distinct DOI is fetched once over at most one connection per worker
+        self.assertEqual(len(self.dois), len(self.stand_in.requests))
+        self.assertLessEqual(len(self.stand_in.clients), 4)
+        self.assertLess(elapsed, len(self.dois) * self.stand_in.delay / 2)
+        if self.debug:
+            print(f"{elapsed:.3f} s {resolver.stats}")
+
+    def test_same_results_as_doi(self):
+        """
+        the resolver needs to give the results of the DOI class
+        """
+        resolver = self.get_resolver()
+        base_url = self.stand_in.base_url
+        doi = DOI(self.dois[0], base_url=base_url)
+        expected = {
+            "citeproc": doi.fetchCiteprocMeta(),
+            "bibtex": doi.fetchBibTexDict(),
+            "plaintext": doi.fetchPlainTextBibTexDict(),
+        }
+        for kind, meta in expected.items():
+            with self.subTest(kind=kind):
+                self.assertEqual(
+                    meta, resolver.resolve(self.dois[:1], kind)[self.dois[0]]
+                )
+        with self.assertRaises(ValueError):
+            resolver.resolve(self.dois, kind="xml")
+
+    def test_retries_and_errors(self):
+        """
+        test retries of throttled and failed requests, redirects and unresolvable DOIs
+        """
+        resolver = self.get_resolver(workers=1, retries=3)
+        self.stand_in.failures.extend([429, 429, 503])
+        self.stand_in.redirects["10.5555/moved"] = self.dois[1]
+        metas = resolver.resolve([self.dois[0], "10.5555/moved", "10.5555/unknown"])
+        self.assertEqual("1972", metas[self.dois[0]]["year"])
+        self.assertIn("10.5555/moved", metas)
+        self.assertEqual(["10.5555/unknown"], list(resolver.errors))
+        self.assertEqual(404, resolver.errors["10.5555/unknown"].code)
+        self.assertEqual(3, resolver.stats.retries)
+        self.assertEqual(2, resolver.stats.throttled)
+        # give up after the configured retries
+        self.stand_in.failures.extend([429] * 3)
+        resolver.retries = 2
+        metas = resolver.resolve(self.dois[:1])
+        self.assertEqual({}, metas)
+        self.assertEqual(429, resolver.errors[self.dois[0]].code)
+
+    def test_rate_limit(self):
+        """
+        test the per host rate limit
+        """
+        limiter = RateLimiter(rate=50)
+        start = time.monotonic()
+        for _ in range(11):
+            limiter.wait("doi.org")
+        limiter.wait("other.org")
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        self.stand_in.delay = 0
+        resolver = self.get_resolver(rate=100)
+        start = time.monotonic()
+        resolver.resolve(self.dois[:11])
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_cache(self):
+        """
+        test resolving with a persistent cache
+        """
+        cache_dir = tempfile.mkdtemp(prefix="doi_cache")
+        try:
+            cache = DOICache(cache_dir)
+            resolver = self.get_resolver(cache=cache)
+            for _ in range(2):
+                metas = resolver.resolve(self.dois + ["10.5555/unknown"])
+                self.assertEqual(len(self.dois), len(metas))
+                self.assertIsInstance(
+                    resolver.errors["10.5555/unknown"], urllib.error.HTTPError
+                )
+            self.assertEqual(len(self.dois) + 1, len(self.stand_in.requests))
+            self.assertEqual(len(self.dois) + 1, cache.stats.hits)
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
@@ -5,6 +5,12 @@ Created on 2023-02-15
 """
 
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pyparsing as pp
 
 from slides.keyvalue_parser import (
     Keydef,
@@ -14,6 +20,7 @@ from slides.keyvalue_parser import (
     SimpleKeyValueParser,
     Split,
 )
+from slides.slidewalker import SlideWalker
 from tests.basetest import Basetest
 
 
@@ -196,3 +203,86 @@ class TestKeyValueParser(Basetest):
                             )
                 except Exception as ex:
                     self.fail(str(ex))
+
+    def test_grammar_cache_benchmark(self):
+        """
+        benchmark parsing the example notes with compiled grammars
+        against rebuilding the grammars for every split - checking
+        that each grammar is compiled once and then served from the cache
+        """
+        base_path = Path(__file__).parent.parent
+        slidedir = f"{base_path}/examples/semanticslides"
+        info = SlideWalker(slidedir).dumpInfo("lod")
+        notes = [
+            slide["notes"] for pres in info.values() for slide in pres["slides"]
+        ] * 100
+        config = KeyValueParserConfig(record_delim="\n")
+        kvp = KeyValueSplitParser(config=config)
+        kvp.setKeydefs(
+            [Keydef("Name", "name"), Keydef("Literature", "literature", True)]
+        )
+
+        def parse_all():
+            start = time.perf_counter()
+            results = [kvp.getKeyValues(note) for note in notes]
+            return results, time.perf_counter() - start
+
+        with patch.object(Split, "compile", staticmethod(Split.compile.__wrapped__)):
+            uncached_results, uncached_time = parse_all()
+        before = Split.compile.cache_info()
+        cached_results, cached_time = parse_all()
+        after = Split.compile.cache_info()
+        self.assertEqual(uncached_results, cached_results)
+        hits = after.hits - before.hits
+        misses = after.misses - before.misses
+        if self.profile:
+            print(
+                f"{len(notes)} notes: uncached {uncached_time*1000:.1f} ms, "
+                f"cached {cached_time*1000:.1f} ms "
+                f"({uncached_time/cached_time:.1f}x faster) "
+                f"{hits} grammar cache hits, {misses} misses"
+            )
+        # one compilation per distinct split configuration
+        self.assertLessEqual(misses, 3)
+        self.assertEqual(after.currsize - before.currsize, misses)
+        self.assertGreaterEqual(hits, len(notes) - misses)
+
+    def test_thread_safety(self):
+        """
+        test that parsers created and used concurrently in threads
+        give the same results as in a single thread
+        """
+        default_whitespace = pp.ParserElement.DEFAULT_WHITE_CHARS
+        keydefs = [Keydef("Name", "name"), Keydef("Keywords", "keywords", True)]
+        tasks = []
+        for config in self.yieldConfigs():
+            s = config.key_value_delim
+            r = config.record_delim
+            v = config.value_delim
+            texts = [
+                f"Name{s}Test{r}Extra{s} '1,2,3'{r}Keywords{s} A{v}B{v}'D,E'{v}F",
+                f"Name{s}\tTabbed {r}Keywords{s}x{v} y",
+                f"Name{s}Value1{r}",
+                f"Keywords{s}a{r}{r}",
+            ]
+            for parser_class in [KeyValueSplitParser, KeyValueParser]:
+                tasks.append((parser_class, config, texts))
+
+        def parse(task):
+            parser_class, config, texts = task
+            kvp = parser_class(config=config)
+            kvp.setKeydefs(keydefs)
+            results = []
+            for text in texts:
+                try:
+                    results.append(kvp.getKeyValues(text))
+                except Exception as ex:
+                    results.append(type(ex).__name__)
+            return results
+
+        expected = [parse(task) for task in tasks]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(5):
+                results = list(executor.map(parse, tasks * 4))
+                self.assertEqual(expected * 4, results)
+        self.assertEqual(default_whitespace, pp.ParserElement.DEFAULT_WHITE_CHARS)
@@ -0,0 +1,247 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import random
+import time
+
+import pyparsing as pp
+
+from slides.keyvalue_parser import (
+    Keydef,
+    KeyValueParser,
+    KeyValueParserConfig,
+    KeyValueSplitParser,
+    ScanError,
+    Scanner,
+    Split,
+)
+from tests.basetest import Basetest
+from tests.test_keyvalue_parser import TestKeyValueParser
+
+
+class TestKeyValueScanner(Basetest):
+    """
+    differential tests of the scanner backend against the pyparsing backend
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.random = random.Random(4711)
+        self.keydefs = [
+            Keydef("Name", "name"),
+            Keydef("Title", "title"),
+            Keydef("Keywords", "keywords", True),
+        ]
+
+    def random_text(self, alphabet: list, max_len: int = 24) -> str:
+        """
+        get a random text from the given alphabet of snippets
+        """
+        length = self.random.randint(0, max_len)
+        text = "".join(self.random.choice(alphabet) for _ in range(length))
+        return text
+
+    def get_alphabet(self, config: KeyValueParserConfig) -> list:
+        """
+        get snippets likely to hit the corner cases of the grammars
+        """
+        alphabet = [
+            "Name",
+            "Title",
+            "Keywords",
+            "Key",
+            "a",
+            "B",
+            "1",
+            " ",
+            "  ",
+            "\t",
+            "\n",
+            "\r",
+            "'",
+            "'x'",
+            "''",
+            "\\",
+            "\\t",
+            "\\101",
+            "\\x41",
+            "-",
+            "•",
+            "→",
+            "ä",
+            "€",
+            config.record_delim,
+            config.key_value_delim,
+            config.value_delim,
+        ]
+        return alphabet
+
+    def random_note(self, config: KeyValueParserConfig) -> str:
+        """
+        get a random note that mostly follows the key value structure
+        """
+        # without delimiters and broken quotes
+        alphabet = [
+            snippet
+            for snippet in self.get_alphabet(config)[:-3]
+            if snippet not in ["'", "\n", "\r"]
+        ]
+        records = []
+        for _ in range(self.random.randint(1, 4)):
+            key = self.random.choice(["Name", "Title", "Keywords", "Extra"])
+            values = [
+                self.random_text(alphabet, 6) or "v"
+                for _ in range(self.random.randint(1, 3))
+            ]
+            space = self.random.choice(["", " "])
+            records.append(
+                f"{key}{config.key_value_delim}{space}{config.value_delim.join(values)}"
+            )
+        note = config.record_delim.join(records)
+        return note
+
+    def outcome(self, func, text: str):
+        """
+        get the result or the exception class of calling func with the given text
+        """
+        try:
+            return func(text)
+        except ScanError:
+            return ScanError
+        except Exception as ex:
+            return type(ex)
+
+    def assertSameSplit(self, split: Split, scanning: Split, text: str):
+        """
+        check that the scanner alone gives the pyparsing result or fails where pyparsing fails
+        """
+        expected = self.outcome(split.split, text)
+        scanned = self.outcome(scanning.scanner.scan, text)
+        if scanned is ScanError:
+            self.assertTrue(isinstance(expected, type), f"{text!r}: {expected}")
+        else:
+            self.assertEqual(expected, scanned, repr(text))
+        # the backend itself always gives the same outcome
+        self.assertEqual(expected, self.outcome(scanning.split, text), repr(text))
+
+    def test_unescape(self):
+        """
+        test that the scanner unquotes like pp.QuotedString
+        """
+        quoted = pp.QuotedString("'")
+        for content in ["plain", r"tab\there", r"\x41\u00e4\0", "a\\b", r"\101"]:
+            expected = quoted.parse_string(f"'{content}'")[0]
+            self.assertEqual(expected, Scanner.unescape(content), content)
+
+    def test_split_parity(self):
+        """
+        test the split scanner on the known cases and random texts
+        """
+        texts = [
+            "A#B",
+            "First|'Second|More|EvenMore'|Third",
+            "A,B,'C,D',E",
+            "A,,B",
+            "A,",
+            ",A",
+            "'unterminated,A",
+            "A ,B ",
+            "\tA,B\n",
+            "A'x'B'y',C",
+            "'a\\tb\\101\\x41'",
+            "''",
+            "",
+        ]
+        count = 0
+        for delim in ["#", "|", ",", "•", ":"]:
+            for keep_quotes in [True, False]:
+                split = Split(delim=delim, keep_quotes=keep_quotes)
+                scanning = Split(
+                    delim=delim, keep_quotes=keep_quotes, backend="scanner"
+                )
+                alphabet = self.get_alphabet(KeyValueParserConfig()) + [delim]
+                random_texts = [self.random_text(alphabet) for _ in range(300)]
+                for text in texts + random_texts:
+                    with self.subTest(delim=delim, text=text):
+                        self.assertSameSplit(split, scanning, text)
+                        count += 1
+        if self.debug:
+            print(f"{count} split texts compared")
+
+    def yieldParserPairs(self):
+        """
+        generate pairs of pyparsing and scanner parsers for all test configurations
+        """
+        for config in TestKeyValueParser().yieldConfigs():
+            for parserClass in [KeyValueSplitParser, KeyValueParser]:
+                parser = parserClass(config=config)
+                scanner_config = KeyValueParserConfig(**config.__dict__)
+                scanner_config.backend = "scanner"
+                scanner = parserClass(config=scanner_config)
+                for p in parser, scanner:
+                    p.setKeydefs(self.keydefs)
+                yield parser, scanner
+
+    def test_parser_parity(self):
+        """
+        test the scanner backend of the key value parsers on the known
+        test cases and on random notes
+        """
+        for parser, scanning in self.yieldParserPairs():
+            config = parser.config
+            s = config.key_value_delim
+            r = config.record_delim
+            v = config.value_delim
+            texts = [
+                f"Name{s}Test{r}Title{s} Test{r}Extra{s} '1,2,3'{r}Keywords{s} A{v}B{v}C{v}'D,E'{v}F",
+                f"Title{s}Title{r}Keywords{s}test with spaces{r}Label{s}title",
+                f"Key{s}Value1{s}Value2",
+                f"Key{s}Value1{r}",
+                f"Name {s} a {v} b {r} Title{s}'x'y'z'",
+                "",
+                None,
+            ]
+            alphabet = self.get_alphabet(config)
+            texts.extend(self.random_text(alphabet) for _ in range(100))
+            texts.extend(self.random_note(config) for _ in range(100))
+            for text in texts:
+                with self.subTest(
+                    parser=type(parser).__name__, config=config, text=text
+                ):
+                    # the split parser may raise on broken records - with both backends
+                    expected = self.outcome(parser.getKeyValues, text)
+                    self.assertEqual(
+                        expected, self.outcome(scanning.getKeyValues, text)
+                    )
+                    self.assertEqual(len(parser.errors), len(scanning.errors))
+                    if isinstance(parser, KeyValueParser) and text:
+                        expected = self.outcome(
+                            lambda t: parser.g_grammar.parse_string(t).as_list(),
+                            text,
+                        )
+                        scanned = self.outcome(scanning.scanner.scan, text)
+                        if scanned is ScanError:
+                            self.assertTrue(isinstance(expected, type))
+                        else:
+                            self.assertEqual(expected, scanned)
+
+    def test_scanner_speed(self):
+        """
+        compare the speed of both backends
+        """
+        text = "Name:SQL•Title: Nested Queries•Keywords: SQL,'A,B',nested queries"
+        durations = {}
+        for backend in ["pyparsing", "scanner"]:
+            parser = KeyValueSplitParser(KeyValueParserConfig(backend=backend))
+            parser.setKeydefs(self.keydefs)
+            start = time.perf_counter()
+            for _ in range(300):
+                key_values = parser.getKeyValues(text)
+            durations[backend] = time.perf_counter() - start
+            self.assertEqual(["SQL", "A,B", "nested queries"], key_values["keywords"])
+        if self.debug:
+            print(durations)
+        self.assertLess(durations["scanner"], durations["pyparsing"])
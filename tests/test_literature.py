@@ -0,0 +1,141 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from slides.doi_resolver import DOIResolver
+from slides.literature import LiteraturePipeline
+from slides.slidewalker import SlideWalker
+from tests.basetest import Basetest
+from tests.test_doi_cache import DOIStandIn
+
+
+class TestLiteraturePipeline(Basetest):
+    """
+    test collecting and resolving the literature references of the slide notes
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        base_path = Path(__file__).parent.parent
+        self.slidedir = f"{base_path}/examples/semanticslides"
+        self.output_dir = tempfile.mkdtemp(prefix="literature")
+        self.bibtex_path = os.path.join(self.output_dir, "literature.bib")
+        with open(self.bibtex_path, "w", encoding="utf-8") as bibfile:
+            bibfile.write("""@article{Furth2018,
+ title={Semantification of {S}lides by F{\\"u}rth},
+ year={2018}
+}
+@misc{Fair2016,
+ doi={10.5555/fair2016}
+}
+""")
+        self.stand_in = DOIStandIn(["10.5555/fair2016"])
+        self.resolver = DOIResolver(base_url=self.stand_in.base_url, rate=0, retries=0)
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        self.resolver.close()
+        self.stand_in.close()
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def get_pipeline(self) -> LiteraturePipeline:
+        pipeline = LiteraturePipeline(
+            SlideWalker(self.slidedir),
+            self.output_dir,
+            resolver=self.resolver,
+            bibtex_path=self.bibtex_path,
+        )
+        return pipeline
+
+    def test_get_doi(self):
+        """
+        test recognizing DOIs
+        """
+        for text, expected in [
+            ("10.1145/361598.361623", "10.1145/361598.361623"),
+            ("https://doi.org/10.1145/361598.361623", "10.1145/361598.361623"),
+            ("doi:10.1145/361598.361623", "10.1145/361598.361623"),
+            ("Furth2018", None),
+            (None, None),
+        ]:
+            self.assertEqual(expected, LiteraturePipeline.get_doi(text))
+
+    def test_incremental_runs(self):
+        """
+        test that only new or not yet resolved references are resolved
+        """
+        self.stand_in.failures.append(503)
+        summary = self.get_pipeline().run()
+        self.assertEqual(
+            {"slides": 1, "references": 2, "new": 2, "resolved": 1, "failed": 1},
+            summary,
+        )
+        # the failed lookup is retried
+        summary = self.get_pipeline().run()
+        self.assertEqual(1, summary["new"])
+        self.assertEqual(2, summary["resolved"])
+        self.assertEqual(2, len(self.stand_in.requests))
+        # nothing new
+        summary = self.get_pipeline().run()
+        self.assertEqual(0, summary["new"])
+        self.assertEqual(2, len(self.stand_in.requests))
+        references_path = os.path.join(
+            self.output_dir, LiteraturePipeline.references_file
+        )
+        with open(references_path) as json_file:
+            references = {record["key"]: record for record in json.load(json_file)}
+        if self.debug:
+            print(json.dumps(references, indent=2))
+        self.assertEqual(
+            "Semantification of Slides by Fürth",
+            references["Furth2018"]["meta"]["title"],
+        )
+        self.assertEqual("10.5555/fair2016", references["Fair2016"]["doi"])
+        self.assertEqual("1972", references["Fair2016"]["meta"]["year"])
+        map_path = os.path.join(self.output_dir, LiteraturePipeline.slide_map_file)
+        with open(map_path) as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        self.assertEqual(["Furth2018", "Fair2016"], [row["reference"] for row in rows])
+        self.assertEqual("SemanticSlides.pptx", rows[0]["path"])
+        # a reference removed from the table is resolved again
+        del references["Fair2016"]
+        with open(references_path, "w") as json_file:
+            json.dump(list(references.values()), json_file)
+        summary = self.get_pipeline().run()
+        self.assertEqual(1, summary["new"])
+        self.assertEqual(3, len(self.stand_in.requests))
+
+    def test_added_bibtex_entry(self):
+        """
+        test that an unresolved reference is resolved once its bibtex entry exists
+        """
+        with open(self.bibtex_path, encoding="utf-8") as bibfile:
+            bibtex = bibfile.read()
+        with open(self.bibtex_path, "w", encoding="utf-8") as bibfile:
+            bibfile.write(bibtex[bibtex.index("@misc") :])
+        summary = self.get_pipeline().run()
+        self.assertEqual(1, summary["resolved"])
+        with open(self.bibtex_path, "w", encoding="utf-8") as bibfile:
+            bibfile.write(bibtex)
+        summary = self.get_pipeline().run()
+        self.assertEqual(1, summary["new"])
+        self.assertEqual(2, summary["resolved"])
+        self.assertEqual(1, len(self.stand_in.requests))
+
+    def test_unresolvable(self):
+        """
+        test references without bibtex entry and unknown DOIs
+        """
+        pipeline = self.get_pipeline()
+        references = pipeline.resolve(["Unknown2020", "10.5555/unknown"])
+        self.assertEqual(["unresolved", "unresolved"], [r.status for r in references])
+        self.assertIn("404", references[1].error)
@@ -0,0 +1,91 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from slides.pdf_page_cache import PdfPageCache
+from slides.slide_viewer import PDF, PageNavigator
+from tests.basetest import Basetest
+
+
+class TestPdfPageCache(Basetest):
+    """
+    test the single page PDF cache
+    """
+
+    def setUp(self, debug=False, profile=True):
+        """
+        setUp with a fake pdfseparate counting its invocations
+        """
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmp = Path(tempfile.mkdtemp(prefix="pdf_pages"))
+        bin_dir = self.tmp / "bin"
+        bin_dir.mkdir()
+        self.calls = self.tmp / "calls.log"
+        script = bin_dir / "pdfseparate"
+        script.write_text(f"""#!/bin/bash
+echo "$@" >> "{self.calls}"
+[ "$2" -gt 3 ] && exit 99
+printf 'page %s of %s' "$2" "$(cat "$5")" > "$(printf "$6" "$2")"
+""")
+        script.chmod(0o755)
+        self.old_path = os.environ["PATH"]
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{self.old_path}"
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        os.environ["PATH"] = self.old_path
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_page_pdfs(self):
+        """
+        test lazy extraction, reuse and invalidation of single page PDFs
+        """
+        self.assertTrue(PdfPageCache.is_available())
+        cache = PdfPageCache(str(self.tmp / "cache"))
+        pdf_file = str(self.tmp / "deck.pdf")
+        Path(pdf_file).write_text("deck")
+        path = cache.get(pdf_file, 2)
+        self.assertEqual("page 2 of deck", Path(path).read_text())
+        self.assertEqual(path, cache.get(pdf_file, 2))
+        self.assertEqual(1, len(self.calls.read_text().splitlines()))
+        with self.assertRaises(RuntimeError):
+            cache.get(pdf_file, 4)
+        # a regenerated PDF gets new pages
+        time.sleep(0.01)
+        Path(pdf_file).write_text("new deck")
+        new_path = cache.get(pdf_file, 2)
+        self.assertNotEqual(path, new_path)
+        self.assertEqual("page 2 of new deck", Path(new_path).read_text())
+        # the pages of the old version are pruned
+        self.assertFalse(os.path.exists(path))
+
+    def test_page_urls(self):
+        """
+        test the single page urls of PDF and the prefetching of the PageNavigator
+        """
+        pdf_path = self.tmp / "pdf"
+        pdf_path.mkdir()
+        (pdf_path / "deck.pdf").write_text("deck")
+        ppt = SimpleNamespace(basename="deck.pptx", relpath="sub/deck.pptx")
+        solution = SimpleNamespace(pdf_path=str(pdf_path), page_pdfs=None)
+        self.assertEqual("/static/pdf/deck.pdf#page=3", PDF(solution, ppt).get_url(3))
+        solution.page_pdfs = PdfPageCache(str(self.tmp / "cache"))
+        pdf = PDF(solution, ppt)
+        url = pdf.get_url(3)
+        self.assertTrue(url.startswith("/pdf/sub/deck.pptx/3?v="))
+        self.assertEqual("/static/pdf/deck.pdf", pdf.get_url())
+        navigator = PageNavigator(
+            2, 3, lambda page: f"/slide/{page}", lambda page: pdf.get_url(page)
+        )
+        markup = navigator.generate_markup()
+        self.assertIn(f'<link rel="prefetch" href="{pdf.get_url(1)}">', markup)
+        self.assertIn(f'<link rel="prefetch" href="{url}">', markup)
@@ -4,9 +4,17 @@ Created on 2025-05-18
 Test PdfGenerator functionality.
 """
 
+import os
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
 from slides.pdf_generator import PdfGenerator, FileSet
+from slides.soffice_service import SofficeInstance, SofficeService
 
 from tests.basetest import Basetest
 
@@ -46,3 +54,164 @@ class TestPdfGenerator(Basetest):
             out_pdf = self.output_dir / f"{input_path.stem}.pdf"
             self.assertTrue(out_pdf.exists())
 
+
+    def create_fake_soffice(self, bin_dir: Path, env_log: Path):
+        """
+        create a fake soffice that writes an empty pdf, records its
+        profile option, hangs for presentations named hang* and fails for fail*
+        """
+        script = bin_dir / "soffice"
+        script.write_text(f"""#!/bin/bash
+outdir=""
+for arg in "$@"; do
+  case "$arg" in
+    -env:*) echo "$arg" >> "{env_log}";;
+    *.pptx) input="$arg";;
+  esac
+  [ "$prev" = "--outdir" ] && outdir="$arg"
+  prev="$arg"
+done
+name=$(basename "$input" .pptx)
+case "$name" in hang*) sleep 30;; fail*) exit 1;; esac
+sleep 0.2
+mkdir -p "$outdir"
+touch "$outdir/$name.pdf"
+""")
+        script.chmod(0o755)
+
+    @contextmanager
+    def fake_path(self, bin_dir: Path):
+        """
+        put the given bin directory in front of the PATH
+        """
+        old_path = os.environ["PATH"]
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{old_path}"
+        try:
+            yield
+        finally:
+            os.environ["PATH"] = old_path
+
+    def test_generate_pdfs_parallel(self):
+        """
+        test the worker pool with separate profiles and the timeout
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            for folder in ["bin", "pptx", "pdf", "profiles"]:
+                (tmp_path / folder).mkdir()
+            env_log = tmp_path / "env.log"
+            self.create_fake_soffice(tmp_path / "bin", env_log)
+            for name in ["a", "b", "c", "d", "hang"]:
+                (tmp_path / "pptx" / f"{name}.pptx").write_bytes(b"")
+            with self.fake_path(tmp_path / "bin"):
+                pdfgen = PdfGenerator(debug=self.debug)
+                pptx_set = FileSet(str(tmp_path / "pptx"), ext="pptx")
+                start = time.time()
+                procs = pdfgen.generate_pdfs(
+                    pptx_set,
+                    tmp_path / "pdf",
+                    with_stats=True,
+                    max_workers=2,
+                    timeout=2,
+                    profile_dir=str(tmp_path / "profiles"),
+                )
+                elapsed = time.time() - start
+            self.assertLess(elapsed, 10)
+            self.assertEqual(pptx_set.paths, list(procs.keys()))
+            for pptx_path, proc in procs.items():
+                pdf_exists = (tmp_path / "pdf" / f"{pptx_path.stem}.pdf").exists()
+                hung = pptx_path.stem == "hang"
+                self.assertEqual(not hung, pdf_exists)
+                self.assertEqual(hung, "timeout" in proc.stderr)
+            profiles = set(env_log.read_text().split())
+            self.assertEqual(2, len(profiles))
+            # the profiles of a run are separate from other runs and removed
+            self.assertEqual(1, len({Path(profile).parent for profile in profiles}))
+            self.assertEqual([], list((tmp_path / "profiles").iterdir()))
+
+    def test_generate_pdfs_incremental(self):
+        """
+        test that only missing or outdated PDFs are converted
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            for folder in ["bin", "pptx"]:
+                (tmp_path / folder).mkdir()
+            self.create_fake_soffice(tmp_path / "bin", tmp_path / "env.log")
+            for name in ["a", "b", "c", "fail"]:
+                (tmp_path / "pptx" / f"{name}.pptx").write_bytes(name.encode())
+            pdf_path = tmp_path / "pdf"
+            pptx_set = FileSet(str(tmp_path / "pptx"), ext="pptx")
+            a = tmp_path / "pptx" / "a.pptx"
+            with self.fake_path(tmp_path / "bin"):
+                pdfgen = PdfGenerator(debug=self.debug)
+
+                def check(expected, **kwargs):
+                    pdfgen.generate_pdfs(pptx_set, pdf_path, incremental=True, **kwargs)
+                    stats = pdfgen.stats
+                    self.assertEqual(expected, (stats.converted, stats.skipped, stats.failed))
+
+                check((3, 0, 1), use_hash=True)
+                # failed conversions are retried
+                check((0, 3, 1), use_hash=True)
+                # touching keeps the content hash valid
+                os.utime(a, (0, 0))
+                check((0, 3, 1), use_hash=True)
+                # but not the recorded size and modification time
+                check((1, 2, 1))
+                # a changed presentation is converted again
+                a.write_bytes(b"changed a")
+                check((1, 2, 1))
+                # a deleted PDF is regenerated
+                (pdf_path / "b.pdf").unlink()
+                check((1, 2, 1))
+
+    def test_uno_backend_fallback(self):
+        """
+        test the uno backend command line and the fallback to soffice subprocesses
+        """
+        instance = SofficeInstance(2002, "/tmp/profiles/uno0")
+        cmd = instance.get_cmd()
+        self.assertIn("-env:UserInstallation=file:///tmp/profiles/uno0", cmd)
+        self.assertIn("--accept=socket,host=127.0.0.1,port=2002;urp;StarOffice.ComponentContext", cmd)
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            for folder in ["bin", "pptx"]:
+                (tmp_path / folder).mkdir()
+            self.create_fake_soffice(tmp_path / "bin", tmp_path / "env.log")
+            (tmp_path / "pptx" / "a.pptx").write_bytes(b"")
+            with self.fake_path(tmp_path / "bin"):
+                pdfgen = PdfGenerator(debug=self.debug, backend="uno")
+                pptx_set = FileSet(str(tmp_path / "pptx"), ext="pptx")
+                pdfgen.generate_pdfs(pptx_set, tmp_path / "pdf")
+                pdfgen.close()
+            if not SofficeService.is_available():
+                self.assertEqual("subprocess", pdfgen.backend)
+            self.assertEqual(1, pdfgen.stats.converted)
+
+    def test_soffice_instance_kill(self):
+        """
+        test concurrent kills of an instance and picking a free port
+        """
+        instance = SofficeInstance(None, "/tmp/profiles/uno0")
+        for _ in range(3):
+            instance.process = subprocess.Popen(["sleep", "30"], start_new_session=True)
+            errors = []
+
+            def kill():
+                try:
+                    instance.kill()
+                except Exception as ex:
+                    errors.append(ex)
+
+            threads = [threading.Thread(target=kill) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual([], errors)
+            self.assertFalse(instance.is_alive())
+            self.assertIsNone(instance.process)
+        port = SofficeInstance.get_free_port()
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", port))
@@ -0,0 +1,112 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from slides.slide_viewer import SlidesViewer
+from slides.slidewalker import PPT, PageIndex, PPTSet, SlideWalker
+from tests.basetest import Basetest
+
+
+class TestPPTSet(Basetest):
+    """
+    test the presentation set lookups
+    """
+
+    def setUp(self, debug=False, profile=True):
+        """
+        setUp and set the slides directory
+        """
+        Basetest.setUp(self, debug=debug, profile=profile)
+        base_path = Path(__file__).parent.parent
+        self.slidedir = f"{base_path}/examples/semanticslides"
+        self.example = f"{self.slidedir}/SemanticSlides.pptx"
+
+    def create_ppt_set(self, decks: int, slides_per_deck: int) -> PPTSet:
+        """
+        create a presentation set with record backed synthetic decks
+        """
+        ppt_set = PPTSet(SlideWalker(self.slidedir))
+        for d in range(decks):
+            ppt = PPT(self.example)
+            ppt.relpath = f"deck{d:04d}.pptx"
+            ppt.filepath = f"{self.slidedir}/{ppt.relpath}"
+            slide_records = [
+                {
+                    "page": page,
+                    "name": f"slide{page}",
+                    "title": f"Title {page}",
+                    "layout": "Title",
+                    "hidden": page % 10 == 0,
+                    "shapes": [[10.0, [f"text {page}"]]],
+                    "notes": "",
+                }
+                for page in range(1, slides_per_deck + 1)
+            ]
+            ppt.setRecord(
+                {
+                    "error": None,
+                    "title": f"deck {d}",
+                    "author": "wf",
+                    "created": None,
+                    "slides": slide_records,
+                }
+            )
+            ppt_set.ppts_by_path[ppt.filepath] = ppt
+            ppt_set.ppts_by_relpath[ppt.relpath] = ppt
+        return ppt_set
+
+    def test_page_index(self):
+        """
+        test page and pdf page lookups and the invalidation on reload
+        """
+        ppt_set = PPTSet(SlideWalker(self.slidedir))
+        ppt_set.load()
+        relpath = "SemanticSlides.pptx"
+        slide = ppt_set.get_slide(relpath, 2, relative=True)
+        self.assertEqual(2, slide.page)
+        self.assertIs(slide, ppt_set.get_slide_by_pdf_page(relpath, 2, relative=True))
+        self.assertIsNone(ppt_set.get_slide(relpath, 3, relative=True))
+        ppt = ppt_set.get_ppt(relpath, relative=True)
+        ppt.getSlides(force=True)
+        reloaded = ppt_set.get_slide(relpath, 2, relative=True)
+        self.assertIsNot(slide, reloaded)
+        self.assertIs(ppt.slides[1], reloaded)
+
+    def get_view_lod_stats(self, decks: int, slides_per_deck: int) -> tuple:
+        """
+        build the slide view rows for the given set size
+
+        Returns:
+            tuple: the elapsed time and the number of page index builds
+        """
+        ppt_set = self.create_ppt_set(decks, slides_per_deck)
+        solution = SimpleNamespace(debug=False, ppt_set=ppt_set, logger=None)
+        viewer = SlidesViewer(solution, list(ppt_set.ppts_by_path.values()))
+        viewer.load_lod()
+        with patch.object(PageIndex, "of_ppt", wraps=PageIndex.of_ppt) as of_ppt:
+            start = time.perf_counter()
+            viewer.to_view_lod()
+            elapsed = time.perf_counter() - start
+        self.assertEqual(decks * slides_per_deck, len(viewer.view_lod))
+        for ppt in ppt_set.ppts_by_path.values():
+            self.assertEqual(1, ppt.slides_generation)
+        return elapsed, of_ppt.call_count
+
+    def test_view_lod_benchmark(self):
+        """
+        benchmark building the view rows for up to 5000 slides
+        which needs to scale linearly - each page index is built once
+        so that every row is a dict lookup
+        """
+        for slides_per_deck in [100, 500]:
+            elapsed, builds = self.get_view_lod_stats(10, slides_per_deck)
+            if self.profile:
+                print(f"view rows: {10 * slides_per_deck} slides {elapsed*1000:.1f} ms")
+            self.assertEqual(10, builds)
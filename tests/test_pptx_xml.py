@@ -0,0 +1,144 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from pptx import Presentation
+from pptx.util import Mm
+
+from slides.slidewalker import PPT, SlideWalker, YRange
+from tests.basetest import Basetest
+
+
+class TestPptxXmlExtractor(Basetest):
+    """
+    test the parity of the direct XML slide extraction engine
+    with the python-pptx based one
+    """
+
+    def setUp(self, debug=False, profile=True):
+        """
+        setUp and set the slides directory
+        """
+        Basetest.setUp(self, debug=debug, profile=profile)
+        base_path = Path(__file__).parent.parent
+        self.slidedir = f"{base_path}/examples/semanticslides"
+
+    def create_deck(self, filepath: str):
+        """
+        create a deck with hidden slides, icon glyphs, line breaks,
+        inherited placeholder positions, groups and notes
+        """
+        prs = Presentation()
+        for i, layout in enumerate(prs.slide_layouts):
+            slide = prs.slides.add_slide(layout)
+            if slide.shapes.title:
+                slide.shapes.title.text = f"Title {i}\vline two"
+            for ph in slide.placeholders:
+                if ph.placeholder_format.idx != 0 and ph.has_text_frame:
+                    ph.text_frame.text = f"body {i}"
+                    p = ph.text_frame.add_paragraph()
+                    p.add_run().text = "icon \ue001"
+                    p.add_run().text = "after icon"
+            box = slide.shapes.add_textbox(Mm(10), Mm(20 * i), Mm(50), Mm(10))
+            box.text_frame.text = f"box {i}"
+            box.text_frame.paragraphs[0].add_run().text = " second run"
+            group = slide.shapes.add_group_shape()
+            group.shapes.add_textbox(Mm(5), Mm(5), Mm(5), Mm(5)).text = "grouped"
+            if i % 2 == 0:
+                slide.notes_slide.notes_text_frame.text = f"Name: slide{i}\nTitle: T{i}"
+            if i % 3 == 0:
+                slide._element.set("show", "0")
+        prs.save(filepath)
+
+    def assertParity(self, filepath: str):
+        """
+        check that both engines give the same records and slide texts
+        """
+        pptx_records = PPT(filepath).extractSlideRecords(engine="pptx")
+        xml_records = PPT(filepath).extractSlideRecords(engine="xml")
+        self.assertEqual(pptx_records, xml_records)
+        for exclude in [False, True]:
+            pptx_slides = PPT(filepath).getSlides(excludeHiddenSlides=exclude)
+            xml_slides = PPT(filepath).getSlides(
+                excludeHiddenSlides=exclude, engine="xml"
+            )
+            self.assertEqual(len(pptx_slides), len(xml_slides))
+            for pptx_slide, xml_slide in zip(pptx_slides, xml_slides):
+                self.assertEqual(pptx_slide.asDict(), xml_slide.asDict())
+                for y_range in [None, YRange(0, 50)]:
+                    self.assertEqual(
+                        pptx_slide.getText(y_range), xml_slide.getText(y_range)
+                    )
+                self.assertEqual(pptx_slide.getLayoutName(), xml_slide.getLayoutName())
+
+    def test_example_parity(self):
+        """
+        test parity on the bundled examples
+        """
+        self.assertParity(f"{self.slidedir}/SemanticSlides.pptx")
+        json_pptx = SlideWalker(self.slidedir).dumpInfoToString("json")
+        json_xml = SlideWalker(self.slidedir, engine="xml").dumpInfoToString("json")
+        self.assertEqual(json_pptx, json_xml)
+
+    def test_generated_parity(self):
+        """
+        test parity on a generated deck covering the edge cases
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            filepath = os.path.join(tmp, "generated.pptx")
+            self.create_deck(filepath)
+            self.assertParity(filepath)
+
+    def test_metadata_only(self):
+        """
+        test that the metadata only mode gives the same metadata
+        and slide counts without parsing the slides up front
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            self.create_deck(os.path.join(tmp, "generated.pptx"))
+            for folder in [self.slidedir, tmp]:
+                full = SlideWalker(folder)
+                lazy = SlideWalker(folder, metadata_only=True)
+                for ppt, lazy_ppt in zip(
+                    full.yieldPowerPointFiles(), lazy.yieldPowerPointFiles()
+                ):
+                    self.assertIsNone(lazy_ppt.prs)
+                    self.assertEqual(ppt.asDict(), lazy_ppt.asDict())
+                    for exclude in [False, True]:
+                        expected = len(
+                            ppt.getSlides(excludeHiddenSlides=exclude, force=True)
+                        )
+                        self.assertEqual(expected, lazy_ppt.getSlideCount(exclude))
+                    if folder == self.slidedir:
+                        # PowerPoint keeps the app.xml counts consistent
+                        self.assertIsNone(lazy_ppt.prs)
+                    self.assertFalse(lazy_ppt.slides_loaded)
+                    lazy_slides = lazy_ppt.getSlides()
+                    self.assertEqual(len(ppt.getSlides(force=True)), len(lazy_slides))
+
+    def test_xml_engine_open(self):
+        """
+        test that the xml engine reads the metadata and slide counts
+        without building a python-pptx presentation
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            self.create_deck(os.path.join(tmp, "generated.pptx"))
+            for folder in [self.slidedir, tmp]:
+                full = SlideWalker(folder)
+                xml = SlideWalker(folder, engine="xml")
+                for ppt, xml_ppt in zip(
+                    full.yieldPowerPointFiles(), xml.yieldPowerPointFiles()
+                ):
+                    self.assertEqual(ppt.asDict(), xml_ppt.asDict())
+                    for exclude in [False, True]:
+                        self.assertEqual(
+                            ppt.getSlideCount(exclude), xml_ppt.getSlideCount(exclude)
+                        )
+                    xml_ppt.getSlides(excludeHiddenSlides=True)
+                    self.assertIsNone(xml_ppt.prs)
@@ -0,0 +1,102 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from slides.slide_cache import SlideCache
+from slides.slidewalker import PPTSet, SlideWalker
+from tests.basetest import Basetest
+
+
+class TestSlideCache(Basetest):
+    """
+    test the persistent extraction cache
+    """
+
+    def setUp(self, debug=False, profile=True):
+        """
+        setUp and set the slides directory
+        """
+        Basetest.setUp(self, debug=debug, profile=profile)
+        base_path = Path(__file__).parent.parent
+        self.slidedir = f"{base_path}/examples/semanticslides"
+        self.cache_dir = tempfile.mkdtemp(prefix="slides_cache")
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cache_parity(self):
+        """
+        the cached dump needs to be identical to the uncached one
+        """
+        expected = SlideWalker(self.slidedir).dumpInfoToString("json", False)
+        cache = SlideCache(self.cache_dir)
+        for run in range(2):
+            sw = SlideWalker(self.slidedir, cache=cache)
+            json_str = sw.dumpInfoToString("json", False)
+            self.assertEqual(expected, json_str, f"run {run}")
+        self.assertEqual(1, cache.stats.misses)
+        self.assertEqual(1, cache.stats.hits)
+        self.assertTrue(cache.stats.bytes_hit > 0)
+        cache.close()
+
+    def test_cache_invalidation(self):
+        """
+        test that changed files, hashes and rebuilds are handled
+        """
+        deck_dir = tempfile.mkdtemp(prefix="slides_decks")
+        try:
+            shutil.copy(f"{self.slidedir}/SemanticSlides.pptx", deck_dir)
+            deck = os.path.join(deck_dir, "SemanticSlides.pptx")
+            cache = SlideCache(self.cache_dir, use_hash=True)
+            ppt_set = PPTSet(SlideWalker(deck_dir, cache=cache))
+            ppt_set.load()
+            ppt = ppt_set.get_ppt(deck)
+            self.assertEqual("Wolfgang Fahl", ppt.author)
+            # touching the file keeps the content hash valid
+            os.utime(deck, (0, 0))
+            ppt_set.load()
+            self.assertEqual(1, cache.stats.hits)
+            slide = ppt_set.get_slide(deck, 2)
+            self.assertEqual("Titel und Inhalt", slide.getLayoutName())
+            # changing the content invalidates the entry
+            with open(deck, "ab") as f:
+                f.write(b"\0")
+            self.assertIsNone(cache.get_deck(deck))
+            cache.close()
+            cache = SlideCache(self.cache_dir, rebuild=True)
+            self.assertIsNone(cache.get_deck(deck))
+            cache.close()
+        finally:
+            shutil.rmtree(deck_dir, ignore_errors=True)
+
+    def test_cache_relative_paths(self):
+        """
+        the same relative path in different directories
+        must not share a cache entry
+        """
+        deck_dirs = [tempfile.mkdtemp(prefix="slides_decks") for _ in range(2)]
+        cwd = os.getcwd()
+        try:
+            cache = SlideCache(self.cache_dir)
+            for i, deck_dir in enumerate(deck_dirs):
+                shutil.copy(f"{self.slidedir}/SemanticSlides.pptx", deck_dir)
+                os.chdir(deck_dir)
+                deck = "./SemanticSlides.pptx"
+                self.assertIsNone(cache.get_deck(deck))
+                cache.put_deck(deck, {"title": f"deck {i}"}, [])
+                self.assertEqual(f"deck {i}", cache.get_deck(deck)["title"])
+            os.chdir(deck_dirs[0])
+            self.assertEqual("deck 0", cache.get_deck("SemanticSlides.pptx")["title"])
+            cache.close()
+        finally:
+            os.chdir(cwd)
+            for deck_dir in deck_dirs:
+                shutil.rmtree(deck_dir, ignore_errors=True)
@@ -0,0 +1,123 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from slides.slide_cache import SlideCache
+from slides.slide_index import SlideIndex
+from slides.slidewalker import PPTSet, SlideWalker
+from tests.basetest import Basetest
+
+
+class TestSlideIndex(Basetest):
+    """
+    test the full text slide index
+    """
+
+    def setUp(self, debug=False, profile=True):
+        """
+        setUp and set the slides directory
+        """
+        Basetest.setUp(self, debug=debug, profile=profile)
+        base_path = Path(__file__).parent.parent
+        self.slidedir = f"{base_path}/examples/semanticslides"
+
+    def test_search(self):
+        """
+        test tokenizing, prefix matching, ranking and removal
+        """
+        index = SlideIndex()
+        self.assertEqual(
+            ["semantic", "slides", "2026"], index.tokenize("Semantic-Slides 2026!")
+        )
+        index.add_slide("a.pptx", 1, "Semantic Slides", "intro", "")
+        index.add_slide("a.pptx", 2, "Overview", "semantics of slides", "")
+        index.add_slide("b.pptx", 1, "Other", "unrelated", "semantic web")
+        hits = index.search("semantic")
+        # the title match ranks first, the notes match last
+        self.assertEqual(
+            [("a.pptx", 1), ("a.pptx", 2), ("b.pptx", 1)],
+            [(hit.path, hit.page) for hit in hits],
+        )
+        # all terms need to match
+        hits = index.search("sem slid")
+        self.assertEqual(
+            [("a.pptx", 1), ("a.pptx", 2)], [(h.path, h.page) for h in hits]
+        )
+        self.assertEqual(1, len(index.search("semantic", limit=1)))
+        self.assertEqual([], index.search("   "))
+        index.remove_path("a.pptx")
+        self.assertEqual(1, len(index))
+        self.assertEqual([], index.search("slides"))
+        self.assertEqual(1, len(index.search("SEMANTIC")))
+
+    def test_ppt_set_search(self):
+        """
+        test the index built while loading a presentation set
+        """
+        ppt_set = PPTSet(SlideWalker(self.slidedir))
+        ppt_set.load(with_index=True)
+        ppt = ppt_set.get_ppt("SemanticSlides.pptx", relative=True)
+        self.assertEqual(len(ppt.getSlides()), len(ppt_set.slide_index))
+        hits = ppt_set.search("fair")
+        self.assertEqual([2], [hit.page for hit in hits])
+        self.assertIs(ppt_set.get_slide(hits[0].path, 2), ppt.slides[1])
+        # reloading keeps a single entry per slide
+        ppt_set.load(with_index=True)
+        self.assertEqual(len(ppt.getSlides()), len(ppt_set.slide_index))
+
+    def test_lazy_index(self):
+        """
+        test that loading stays metadata only and the first search
+        builds the index from the cached slide records
+        """
+        cache_dir = tempfile.mkdtemp(prefix="slides_cache")
+        try:
+            cache = SlideCache(cache_dir)
+            SlideWalker(self.slidedir, cache=cache).dumpInfo("lod")
+            walker = SlideWalker(self.slidedir, cache=cache, metadata_only=True)
+            ppt_set = PPTSet(walker)
+            ppt_set.load()
+            self.assertEqual(0, len(ppt_set.slide_index))
+            ppt = ppt_set.get_ppt("SemanticSlides.pptx", relative=True)
+            self.assertFalse(ppt.slides_loaded)
+            hits = ppt_set.search("fair")
+            self.assertEqual([2], [hit.page for hit in hits])
+            self.assertIsNone(ppt.prs)
+            self.assertEqual(len(ppt.getSlides()), len(ppt_set.slide_index))
+            # reloading keeps the index up to date
+            ppt_set.load()
+            self.assertEqual(len(ppt.getSlides()), len(ppt_set.slide_index))
+            cache.close()
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def test_search_benchmark(self):
+        """
+        search 20000 slides in milliseconds
+        """
+        index = SlideIndex()
+        for deck in range(200):
+            for page in range(1, 101):
+                index.add_slide(
+                    f"deck{deck}.pptx",
+                    page,
+                    f"Title {deck} {page}",
+                    f"topic{page % 50} lecture{deck} content",
+                    f"Name: slide{page}",
+                )
+        start = time.perf_counter()
+        hits = index.search("topic7 lecture1")
+        elapsed = time.perf_counter() - start
+        if self.profile:
+            print(
+                f"search in {len(index)} slides: {len(hits)} hits in {elapsed*1000:.1f} ms"
+            )
+        self.assertTrue(len(hits) > 0)
+        self.assertLess(elapsed, 1.0)
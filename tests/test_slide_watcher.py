@@ -0,0 +1,120 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from slides.slide_watcher import SlideWatcher
+from slides.slidewalker import PPTSet, SlideWalker
+from tests.basetest import Basetest
+
+
+class TestSlideWatcher(Basetest):
+    """
+    test the incremental refresh of a presentation set
+    """
+
+    def setUp(self, debug=False, profile=True):
+        """
+        setUp and copy the example to a temporary slides directory
+        """
+        Basetest.setUp(self, debug=debug, profile=profile)
+        base_path = Path(__file__).parent.parent
+        self.example = f"{base_path}/examples/semanticslides/SemanticSlides.pptx"
+        self.slidedir = tempfile.mkdtemp(prefix="slides_watch")
+        shutil.copy(self.example, self.slidedir)
+        self.ppt_set = PPTSet(SlideWalker(self.slidedir))
+        self.ppt_set.load(with_index=True)
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        shutil.rmtree(self.slidedir, ignore_errors=True)
+
+    def wait_for(self, condition, timeout: float = 10.0) -> bool:
+        """
+        wait for the given condition to become true
+        """
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if condition():
+                return True
+            time.sleep(0.05)
+        return False
+
+    def test_poll_once(self):
+        """
+        test detecting and applying added, changed and removed presentations
+        """
+        watcher = SlideWatcher(self.ppt_set)
+        self.assertTrue(watcher.poll_once().is_empty())
+        version = self.ppt_set.version
+        os.makedirs(f"{self.slidedir}/sub")
+        added = f"{self.slidedir}/sub/Copy.pptx"
+        shutil.copy(self.example, added)
+        changes = watcher.poll_once()
+        self.assertEqual([added], changes.added)
+        self.assertEqual(version + 1, self.ppt_set.version)
+        self.assertIsNotNone(self.ppt_set.get_ppt("sub/Copy.pptx", relative=True))
+        self.assertEqual(2, len(self.ppt_set.search("fair")))
+        # a partially written file is kept out of the set
+        with open(added, "wb") as f:
+            f.write(b"PK")
+        changes = watcher.poll_once()
+        self.assertEqual([added], changes.changed)
+        self.assertIsNone(self.ppt_set.get_ppt(added))
+        self.assertEqual(1, len(self.ppt_set.search("fair")))
+        shutil.copy(self.example, added)
+        watcher.poll_once()
+        self.assertIsNotNone(self.ppt_set.get_ppt(added))
+        os.remove(added)
+        changes = watcher.poll_once()
+        self.assertEqual([added], changes.removed)
+        self.assertIsNone(self.ppt_set.get_ppt("sub/Copy.pptx", relative=True))
+        self.assertEqual(1, len(self.ppt_set.ppts_by_path))
+        self.assertEqual(1, len(self.ppt_set.search("fair")))
+
+    def test_background_watching(self):
+        """
+        test the background thread with polling and - if available - notifications
+        """
+        for use_polling in [True, False]:
+            watcher = SlideWatcher(self.ppt_set, interval=0.1, use_polling=use_polling)
+            watcher.start()
+            try:
+                name = f"Watched{use_polling}.pptx"
+                shutil.copy(self.example, f"{self.slidedir}/{name}")
+                found = self.wait_for(
+                    lambda: self.ppt_set.get_ppt(name, relative=True) is not None
+                )
+                self.assertTrue(found, f"polling={watcher.use_polling}")
+            finally:
+                watcher.stop()
+
+    def test_snapshot_before_load(self):
+        """
+        test that a deck changed while the set loads is refreshed
+        when the watcher snapshot is taken before the load
+        """
+        slidewalker = SlideWalker(self.slidedir)
+        yield_ppts = slidewalker.yieldPowerPointFiles
+        deck = f"{self.slidedir}/SemanticSlides.pptx"
+
+        def yield_and_save(*args, **kwargs):
+            for ppt in yield_ppts(*args, **kwargs):
+                # saved again right after the load read it
+                with open(deck, "ab") as f:
+                    f.write(b"\0")
+                yield ppt
+
+        slidewalker.yieldPowerPointFiles = yield_and_save
+        ppt_set = PPTSet(slidewalker)
+        watcher = SlideWatcher(ppt_set)
+        ppt_set.load()
+        changes = watcher.poll_once()
+        self.assertEqual([deck], changes.changed)
@@ -1,6 +1,12 @@
+import csv
+import io
 import json
+import os
+import shutil
+import tempfile
 from pathlib import Path
 
+from slides.corpus_generator import CorpusConfig, CorpusGenerator
 from slides.slidewalker import SlideWalker
 from tests.basetest import Basetest
 
@@ -41,3 +47,122 @@ class TestSlideWalker(Basetest):
             for attr in ["page", "pdf_page", "title", "name", "text", "notes"]:
                 self.assertTrue(attr in slide)
         pass
+
+    def test_parallel_extraction(self):
+        """
+        test that a process pool extraction gives the same results
+        as a serial one and reports broken decks
+        """
+        deck_dir = tempfile.mkdtemp(prefix="slidewalker")
+        try:
+            for i in range(3):
+                shutil.copy(
+                    f"{self.slidedir}/SemanticSlides.pptx",
+                    os.path.join(deck_dir, f"SemanticSlides{i}.pptx"),
+                )
+            with open(os.path.join(deck_dir, "broken.pptx"), "wb") as f:
+                f.write(b"no zip file")
+            for output_format in ["json", "csv"]:
+                serial = SlideWalker(deck_dir).dumpInfoToString(output_format)
+                slidewalker = SlideWalker(deck_dir)
+                parallel = slidewalker.dumpInfoToString(output_format, workers=2)
+                self.assertEqual(serial, parallel)
+                self.assertEqual(1, len(slidewalker.failures))
+        finally:
+            shutil.rmtree(deck_dir, ignore_errors=True)
+
+    def test_streaming_json(self):
+        """
+        test that the streamed json output is identical to dumping the
+        complete info and that ndjson has one record per presentation
+        """
+        slidewalker = SlideWalker(self.slidedir)
+        info = slidewalker.dumpInfo("lod")
+        expected = json.dumps(info, indent=2, default=str, ensure_ascii=False) + "\n"
+        self.assertEqual(expected, slidewalker.dumpInfoToString("json", False))
+        ndjson = slidewalker.dumpInfoToString("ndjson", False)
+        lines = ndjson.splitlines()
+        self.assertEqual(len(info), len(lines))
+        for line in lines:
+            record = json.loads(line)
+            basename = record.pop("basename")
+            self.assertEqual(
+                json.loads(json.dumps(info[basename], default=str)), record
+            )
+        for basename, pptSummary in slidewalker.yieldInfo():
+            self.assertEqual(len(info[basename]["slides"]), len(pptSummary["slides"]))
+
+    def test_duplicate_basenames(self):
+        """
+        test that presentations with the same basename give a single json
+        key with the value of the last one as the complete dict does
+        """
+        deck_dir = tempfile.mkdtemp(prefix="slidewalker")
+        try:
+            for folder, slides in [("a", 10), ("c", 20)]:
+                config = CorpusConfig(slides=slides, slides_per_deck=slides)
+                CorpusGenerator(config).generate(os.path.join(deck_dir, folder))
+            shutil.copy(f"{self.slidedir}/SemanticSlides.pptx", deck_dir)
+            slidewalker = SlideWalker(deck_dir)
+            info = {}
+            for ppt in slidewalker.yieldPowerPointFiles():
+                info[ppt.basename] = len(ppt.getSlides())
+            json_str = slidewalker.dumpInfoToString("json", False)
+            pairs = json.loads(json_str, object_pairs_hook=list)
+            slide_counts = [(key, len(dict(value)["slides"])) for key, value in pairs]
+            self.assertEqual(list(info.items()), slide_counts)
+            self.assertEqual(3, len(slidewalker.findFiles(deck_dir, ".pptx")))
+            self.assertEqual(2, len(info))
+            # csv rows of all decks ordered by basename and page
+            expected = [
+                (ppt.basename, slide.page, slide.name)
+                for ppt in slidewalker.yieldPowerPointFiles()
+                for slide in ppt.getSlides()
+            ]
+            expected.sort(key=lambda row: (row[0], row[1]))
+            output = io.StringIO()
+            slidewalker.dumpInfo("csv", output=output)
+            rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+            actual = [(row["basename"], int(row["page"]), row["name"]) for row in rows]
+            self.assertEqual(expected, actual)
+            self.assertEqual(32, len(actual))
+            # the given file list is not reordered
+            pptx_files = slidewalker.findFiles(deck_dir, ".pptx")
+            walk_order = list(pptx_files)
+            list(
+                slidewalker.yieldPowerPointFiles(
+                    sortByBasename=True, pptxFiles=pptx_files
+                )
+            )
+            self.assertEqual(walk_order, pptx_files)
+        finally:
+            shutil.rmtree(deck_dir, ignore_errors=True)
+
+    def test_streaming_csv(self):
+        """
+        test the single pass csv output with the optional text and notes columns
+        """
+        slidewalker = SlideWalker(self.slidedir)
+        info = slidewalker.dumpInfo("lod", excludeHiddenSlides=True)
+        output = io.StringIO()
+        slidewalker.dumpInfo(
+            "csv",
+            excludeHiddenSlides=True,
+            output=output,
+            withText=True,
+            withNotes=True,
+        )
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual(
+            ["basename", "page", "name", "title", "text", "notes"],
+            list(rows[0].keys()),
+        )
+        expected = [
+            (basename, slideRecord["page"], slideRecord["notes"])
+            for basename in sorted(info)
+            for slideRecord in info[basename]["slides"]
+        ]
+        actual = [(row["basename"], int(row["page"]), row["notes"]) for row in rows]
+        self.assertEqual(expected, actual)
+        csvText = slidewalker.dumpInfoToString("csv")
+        self.assertTrue(csvText.startswith('"basename","page","name","title"\r\n'))
@@ -0,0 +1,124 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from slides.corpus_generator import CorpusConfig, CorpusGenerator
+from slides.slidewalker import SlideWalker, main
+from slides.sqlite_export import SqliteExporter
+from tests.basetest import Basetest
+
+
+class TestSqliteExport(Basetest):
+    """
+    test the SQLite export of the slide walker
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmp = tempfile.mkdtemp(prefix="sqlite_export")
+        self.slidedir = os.path.join(self.tmp, "slides")
+        config = CorpusConfig(slides=30, slides_per_deck=10)
+        self.paths = CorpusGenerator(config).generate(self.slidedir)
+        base_path = Path(__file__).parent.parent
+        shutil.copy(
+            f"{base_path}/examples/semanticslides/SemanticSlides.pptx", self.slidedir
+        )
+        self.db_path = os.path.join(self.tmp, "corpus.db")
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def query(self, sql: str, params=()) -> list:
+        with sqlite3.connect(self.db_path) as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def export(self, **kwargs) -> dict:
+        return SlideWalker(self.slidedir).writeSqlite(self.db_path, **kwargs)
+
+    def test_export(self):
+        """
+        test the content of the exported tables
+        """
+        result = self.export()
+        self.assertEqual({"updated": 4, "unchanged": 0, "removed": 0}, result)
+        info = SlideWalker(self.slidedir).dumpInfo("lod")
+        slide_count = sum(len(pres["slides"]) for pres in info.values())
+        self.assertEqual(
+            [(4, slide_count)],
+            self.query("SELECT COUNT(DISTINCT presentation_id),COUNT(*) FROM slide"),
+        )
+        pres = info["SemanticSlides.pptx"]
+        rows = self.query(
+            """SELECT s.title,s.notes FROM slide s JOIN presentation p
+            ON p.id=s.presentation_id WHERE p.path=? ORDER BY s.page""",
+            ("SemanticSlides.pptx",),
+        )
+        self.assertEqual(
+            [(slide["title"], slide["notes"]) for slide in pres["slides"]], rows
+        )
+        # key values of the notes with one row per list element
+        rows = self.query(
+            "SELECT value FROM key_value WHERE key='Name' AND value='deck1_slide3'"
+        )
+        self.assertEqual(1, len(rows))
+        self.assertEqual(
+            [(0, "Furth2018"), (1, "Fair2016")],
+            self.query("""SELECT position,value FROM key_value WHERE key='Literature'
+                AND slide_id IN (SELECT s.id FROM slide s JOIN presentation p
+                ON p.id=s.presentation_id WHERE p.basename='SemanticSlides.pptx')
+                ORDER BY position"""),
+        )
+        exporter = SqliteExporter(self.db_path)
+        hits = exporter.search("notes:deck2_slide5")
+        exporter.close()
+        self.assertEqual(
+            [{"path": "deck00002.pptx", "page": 5}],
+            [{"path": hit["path"], "page": hit["page"]} for hit in hits],
+        )
+
+    def test_incremental_export(self):
+        """
+        test that re-runs only update changed presentations
+        """
+        self.export()
+        ids = self.query("SELECT path,id FROM presentation ORDER BY path")
+        self.assertEqual({"updated": 0, "unchanged": 4, "removed": 0}, self.export())
+        # change, add and remove presentations
+        stat = os.stat(self.paths[0])
+        os.utime(self.paths[0], (stat.st_atime, stat.st_mtime + 10))
+        shutil.copy(self.paths[1], os.path.join(self.slidedir, "copy.pptx"))
+        os.remove(self.paths[2])
+        self.assertEqual({"updated": 2, "unchanged": 2, "removed": 1}, self.export())
+        paths = [path for (path,) in self.query("SELECT path FROM presentation")]
+        self.assertEqual(4, len(paths))
+        self.assertIn("copy.pptx", paths)
+        self.assertNotIn("deck00002.pptx", paths)
+        # the upsert keeps the id of the changed presentation and replaces its slides
+        self.assertIn(ids[0], self.query("SELECT path,id FROM presentation"))
+        expected = self.query("SELECT SUM(slide_count) FROM presentation")[0][0]
+        for table in ["slide", "slide_fts"]:
+            count = self.query(f"SELECT COUNT(*) FROM {table}")[0][0]
+            self.assertEqual(expected, count, table)
+        keys = self.query("SELECT COUNT(*) FROM key_value WHERE key='Name'")[0][0]
+        self.assertLess(keys, expected)
+        # other settings need a complete export
+        result = self.export(excludeHiddenSlides=True)
+        self.assertEqual(4, result["updated"])
+
+    def test_cli(self):
+        """
+        test the sqlite format of the command line
+        """
+        argv = ["slidewalker", "-f", "sqlite", "--no-cache"]
+        self.assertEqual(2, main(argv + ["--rootPath", self.slidedir]))
+        main(argv + ["--rootPath", self.slidedir, "--output", self.db_path])
+        self.assertEqual([(4,)], self.query("SELECT COUNT(*) FROM presentation"))
@@ -0,0 +1,76 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from slides.thumbnail_cache import ThumbnailCache
+from tests.basetest import Basetest
+
+
+class TestThumbnailCache(Basetest):
+    """
+    test the thumbnail cache
+    """
+
+    def setUp(self, debug=False, profile=True):
+        """
+        setUp with a fake pdftoppm counting its invocations
+        """
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.tmp = Path(tempfile.mkdtemp(prefix="thumbnails"))
+        bin_dir = self.tmp / "bin"
+        bin_dir.mkdir()
+        self.calls = self.tmp / "calls.log"
+        script = bin_dir / "pdftoppm"
+        script.write_text(f"""#!/bin/bash
+echo "$@" >> "{self.calls}"
+for prefix; do :; done
+[ "$3" = "99" ] && exit 1
+printf 'png page %s' "$3" > "$prefix.png"
+""")
+        script.chmod(0o755)
+        self.old_path = os.environ["PATH"]
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{self.old_path}"
+
+    def tearDown(self):
+        Basetest.tearDown(self)
+        os.environ["PATH"] = self.old_path
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_thumbnails(self):
+        """
+        test rendering, versioning and reuse of thumbnails
+        """
+        self.assertTrue(ThumbnailCache.is_available())
+        cache = ThumbnailCache(str(self.tmp / "cache"))
+        pdf_a = self.tmp / "a.pdf"
+        pdf_b = self.tmp / "b.pdf"
+        pdf_a.write_bytes(b"%PDF same content")
+        pdf_b.write_bytes(b"%PDF same content")
+        futures = [cache.submit(str(pdf_a), 2) for _ in range(3)]
+        path = cache.get(str(pdf_a), 2)
+        self.assertTrue(all(future.result() == path for future in futures))
+        self.assertEqual("png page 2", Path(path).read_text())
+        self.assertIn("-scale-to-x 160", self.calls.read_text())
+        # thumbnails are keyed by the file - not by its content
+        self.assertNotEqual(path, cache.get(str(pdf_b), 2))
+        self.assertNotEqual(path, cache.get(str(pdf_a), 2, size="large"))
+        self.assertEqual(path, cache.get(str(pdf_a), 2))
+        self.assertEqual(3, len(self.calls.read_text().splitlines()))
+        large_path = cache.get(str(pdf_a), 2, size="large")
+        other_path = cache.get(str(pdf_b), 2)
+        # a changed PDF gets new thumbnails and the old ones are pruned
+        pdf_a.write_bytes(b"%PDF new content")
+        self.assertNotEqual(path, cache.get(str(pdf_a), 2))
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(os.path.exists(large_path))
+        self.assertTrue(os.path.exists(other_path))
+        with self.assertRaises(RuntimeError):
+            cache.get(str(pdf_a), 99)
+        cache.close()
@@ -7,7 +7,12 @@ Created on 2023-01-27
 import json
 from pathlib import Path
 
-from slides.keyvalue_parser import Keydef, KeyValueParserConfig, KeyValueSplitParser
+from slides.keyvalue_parser import (
+    Keydef,
+    KeyValueParser,
+    KeyValueParserConfig,
+    KeyValueSplitParser,
+)
 from slides.slidewalker import SlideWalker
 from tests.basetest import Basetest
 
@@ -69,3 +74,38 @@ class TestCollectKeyValuesFromNotes(Basetest):
                     self.assertEqual(expected, notes_info)
 
                 pass
+
+    def testBulkKeyValues(self):
+        """
+        test the bulk extraction of key values from all slide notes
+        """
+        config = KeyValueParserConfig(record_delim="\n")
+        keydefs = [
+            Keydef("Name", "name"),
+            Keydef("Title", "title"),
+            Keydef("Literature", "literatur", True),
+        ]
+        notes_list = []
+        for pres_dict in self.getPresentations().values():
+            for slide_record in pres_dict["slides"]:
+                notes_list.append(slide_record["notes"])
+        # add a broken note
+        notes_list.append("Name")
+        for parser_class in [KeyValueSplitParser, KeyValueParser]:
+            kvp = parser_class(config=config)
+            kvp.setKeydefs(keydefs)
+            expected = [kvp.getKeyValues(notes) for notes in notes_list[:-1]]
+            table = kvp.getKeyValuesBulk(notes_list)
+            parallel_table = kvp.getKeyValuesBulk(notes_list, workers=2, chunk_size=3)
+            for bulk_table in table, parallel_table:
+                with self.subTest(parser_class=parser_class):
+                    self.assertEqual(len(notes_list), len(bulk_table.rows))
+                    self.assertEqual(expected, bulk_table.rows[:-1])
+                    self.assertEqual(
+                        [len(notes_list) - 1], [e.index for e in bulk_table.errors]
+                    )
+                    self.assertNotIn("Traceback", bulk_table.errors[0].message)
+                    columns = bulk_table.as_columns()
+                    self.assertEqual(["name", "title", "literatur"], list(columns))
+                    self.assertIn(["Furth2018", "Fair2016"], columns["literatur"])
+                    self.assertIn(None, columns["title"])
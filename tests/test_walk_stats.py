@@ -0,0 +1,99 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+import io
+import tempfile
+import time
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from slides.slidewalker import PPTSet, SlideWalker, main
+from slides.walk_stats import WalkStats
+from tests.basetest import Basetest
+
+
+class TestWalkStats(Basetest):
+    """
+    test the per phase instrumentation of the SlideWalker
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        base_path = Path(__file__).parent.parent
+        self.slidedir = f"{base_path}/examples/semanticslides"
+
+    def test_phases(self):
+        """
+        test exclusive timing of nested phases and the deck counters
+        """
+        stats = WalkStats(enabled=True)
+        with stats.phase("open", "a.pptx"):
+            time.sleep(0.02)
+            with stats.phase("extract", "a.pptx"):
+                time.sleep(0.05)
+        stats.count("a.pptx", slides=3, shapes=7)
+        stats.count("b.pptx", slides=1)
+        deck = stats.decks["a.pptx"]
+        self.assertLess(deck.phases["open"], 0.045)
+        self.assertGreaterEqual(deck.phases["extract"], 0.05)
+        self.assertEqual(["a.pptx", "b.pptx"], [d.path for d in stats.slowest_decks()])
+        summary = stats.asDict()
+        self.assertEqual(4, summary["slides"])
+        self.assertEqual(
+            [0, 0, 0, 1, 0, 0, 0], summary["phases"]["extract"]["histogram"]
+        )
+        # disabled stats record nothing and cost next to nothing
+        disabled = WalkStats()
+        start = time.perf_counter()
+        for _ in range(100000):
+            with disabled.phase("text", "a.pptx"):
+                pass
+        elapsed = time.perf_counter() - start
+        disabled.count("a.pptx", slides=1)
+        self.assertEqual({}, disabled.decks)
+        if self.profile:
+            print(f"disabled phase: {elapsed*10:.3f} µs per call")
+        self.assertLess(elapsed, 1.0)
+
+    def test_walk_stats(self):
+        """
+        test the statistics of loading and dumping the example presentations
+        """
+        walker = SlideWalker(self.slidedir, stats=WalkStats(enabled=True))
+        ppt_set = PPTSet(walker)
+        ppt_set.load()
+        for ppt in ppt_set.ppts_by_path.values():
+            for slide in ppt.getSlides():
+                slide.getText()
+        stats = ppt_set.stats.asDict()
+        for phase in ["find", "open", "slides", "text"]:
+            self.assertIn(phase, stats["phases"])
+        self.assertEqual(2, stats["slides"])
+        self.assertGreater(stats["bytes_read"], 0)
+        self.assertGreater(stats["shapes"], 0)
+        with tempfile.NamedTemporaryFile(suffix=".csv") as output:
+            stderr = io.StringIO()
+            with redirect_stderr(stderr):
+                exit_code = main(
+                    [
+                        "slidewalker",
+                        "--rootPath",
+                        self.slidedir,
+                        "--no-cache",
+                        "--stats",
+                        "-f",
+                        "csv",
+                        "-o",
+                        output.name,
+                    ]
+                )
+        self.assertIsNone(exit_code)
+        text = stderr.getvalue()
+        if self.debug:
+            print(text)
+        self.assertIn("serialize", text)
+        self.assertIn("slowest decks:", text)
+        self.assertIn("SemanticSlides.pptx", text)
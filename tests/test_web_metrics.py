@@ -0,0 +1,111 @@
+"""
+Created on 2026-10-17
+
+@author: wf
+"""
+
+from unittest.mock import patch
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from slides.web_metrics import Histogram, WebMetrics
+from tests.basetest import Basetest
+
+
+class TestWebMetrics(Basetest):
+    """
+    test the prometheus style metrics of the slide browser
+    """
+
+    def setUp(self, debug=False, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def test_histogram(self):
+        """
+        test the cumulative buckets
+        """
+        histogram = Histogram([0.1, 1.0])
+        for value in [0.05, 0.1, 0.5, 2.0]:
+            histogram.observe(value)
+        self.assertEqual([("0.1", 2), ("1", 3), ("+Inf", 4)], histogram.cumulative())
+        self.assertEqual(4, histogram.count)
+        self.assertAlmostEqual(2.65, histogram.sum)
+
+    def test_metrics_endpoint(self):
+        """
+        test instrumented sync and async handlers and the rendered metrics
+        """
+        metrics = WebMetrics()
+        app = FastAPI()
+
+        @app.get("/sync/{name}")
+        @metrics.instrument("/sync/{name}")
+        def sync_handler(name: str, q: str = ""):
+            if name == "missing":
+                raise HTTPException(status_code=404)
+            return {"name": name, "q": q}
+
+        @app.get("/async")
+        @metrics.instrument("/async")
+        async def async_handler():
+            raise ValueError("broken")
+
+        @app.get("/metrics")
+        def metrics_endpoint():
+            return PlainTextResponse(metrics.render())
+
+        metrics.add_gauge("decks", "number of decks", lambda: 3)
+        metrics.add_gauge(
+            "lookups", "lookups", lambda: {"hit": 2, "miss": 1}, label="result"
+        )
+        metrics.add_gauge("broken", "failing gauge", lambda: 1 / 0)
+        client = TestClient(app, raise_server_exceptions=False)
+        # the signature of the handler stays visible for FastAPI
+        self.assertEqual(
+            {"name": "a", "q": "x"}, client.get("/sync/a", params={"q": "x"}).json()
+        )
+        self.assertEqual(404, client.get("/sync/missing").status_code)
+        self.assertEqual(500, client.get("/async").status_code)
+        text = client.get("/metrics").text
+        if self.debug:
+            print(text)
+        p = WebMetrics.prefix
+        expected = [
+            f'{p}_request_duration_seconds_bucket{{route="/sync/{{name}}",le="+Inf"}} 2',
+            f'{p}_request_duration_seconds_count{{route="/async"}} 1',
+            f'{p}_requests_total{{route="/sync/{{name}}",status="200"}} 1',
+            f'{p}_requests_total{{route="/sync/{{name}}",status="404"}} 1',
+            f'{p}_requests_total{{route="/async",status="500"}} 1',
+            f'{p}_requests_in_flight{{route="/async"}} 0',
+            f"{p}_decks 3",
+            f'{p}_lookups{{result="hit"}} 2',
+            f"# TYPE {p}_process_resident_memory_bytes gauge",
+        ]
+        for line in expected:
+            self.assertIn(line, text)
+        self.assertNotIn(f"{p}_broken", text)
+        rss_line = [
+            line
+            for line in text.splitlines()
+            if line.startswith(f"{p}_process_resident_memory_bytes ")
+        ][0]
+        self.assertGreater(int(rss_line.split()[1]), 0)
+
+    def test_rss_unavailable(self):
+        """
+        test that a missing resident set size is not reported
+        """
+        metrics = WebMetrics()
+        with patch.object(WebMetrics, "get_rss", return_value=None):
+            text = metrics.render()
+        self.assertNotIn("process_resident_memory_bytes", text)
+
+    def test_format_labels(self):
+        """
+        test the escaping of label values
+        """
+        labels = WebMetrics.format_labels(route='a"b\\c\nd')
+        self.assertEqual('{route="a\\"b\\\\c\\nd"}', labels)
+        self.assertEqual("", WebMetrics.format_labels())